@@ -9,6 +9,7 @@ import google.generativeai as genai
 from Backend.core.events import event_bus, Event
 from Backend.core.logging import get_logger
 from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode
 from Backend.database.models import Issue, IssueEvent, Escalation, Department, Member
 from Backend.orchestration.base import BaseAgent
 
@@ -18,7 +19,7 @@ if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
 
 
-class IssueEscalated(Event):
+class IssueEscalated(Event, kw_only=True):
     from_level: int
     to_level: int
     reason: str
@@ -41,6 +42,9 @@ class EscalationAgent(BaseAgent):
         if not self.model:
             return False, 0, "Gemini API not configured"
         
+        if await degraded_mode.is_active():
+            return self.overdue_escalation(issue)
+        
         now = datetime.utcnow()
         hours_since_creation = (now - issue.created_at).total_seconds() / 3600
         hours_until_deadline = (issue.sla_deadline - now).total_seconds() / 3600
@@ -63,13 +67,24 @@ Return ONLY valid JSON:
 {{"should_escalate": true/false, "new_level": 0-3, "reason": "max 80 chars"}}"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await degraded_mode.generate(self.model, prompt)
             result = json.loads(response.text.replace("```json", "").replace("```", "").strip())
             return result.get("should_escalate", False), result.get("new_level", issue.escalation_level), result.get("reason", "Analysis completed")
         except Exception as e:
             logger.error(f"Gemini escalation analysis failed: {e}")
             return False, issue.escalation_level, "Analysis error"
     
+    def overdue_escalation(self, issue: Issue) -> tuple[bool, int, str]:
+        # One level per half SLA period past the deadline, up to level 3.
+        hours_overdue = (datetime.utcnow() - issue.sla_deadline).total_seconds() / 3600
+        if hours_overdue <= 0:
+            return False, issue.escalation_level, "Degraded mode: SLA deadline not passed"
+        
+        level = min(3, int(hours_overdue // ((issue.sla_hours or 48) / 2)) + 1)
+        if level <= issue.escalation_level:
+            return False, issue.escalation_level, "Degraded mode: already escalated for this delay"
+        return True, level, f"Degraded mode: {hours_overdue:.1f}h past SLA deadline"
+    
     async def get_escalation_targets(self, issue: Issue) -> list[str]:
         targets = []
         
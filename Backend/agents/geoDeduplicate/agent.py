@@ -7,6 +7,7 @@ from sqlalchemy.orm import selectinload
 import google.generativeai as genai
 
 from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode, mark_for_reevaluation
 from Backend.core.events import event_bus, IssueClassified, Event
 from Backend.core.logging import get_logger
 from Backend.database.models import Issue, IssueEvent, Classification
@@ -19,7 +20,7 @@ if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
 
 
-class IssueDeduplicated(Event):
+class IssueDeduplicated(Event, kw_only=True):
     is_duplicate: bool
     parent_issue_id: Optional[UUID] = None
     cluster_id: Optional[str] = None
@@ -58,7 +59,7 @@ Consider:
 Return ONLY a decimal number between 0.0 and 1.0."""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await degraded_mode.generate(self.model, prompt)
             score = float(response.text.strip())
             return max(0.0, min(1.0, score))
         except Exception as e:
@@ -112,7 +113,8 @@ Return ONLY a decimal number between 0.0 and 1.0."""
         latitude: float,
         longitude: float,
         category: Optional[str] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        degraded: bool = False
     ) -> tuple[bool, Optional[UUID], list[tuple[Issue, float]]]:
         nearby = await self.find_nearby_issues(
             latitude, longitude, issue_id, category
@@ -121,6 +123,14 @@ Return ONLY a decimal number between 0.0 and 1.0."""
         if not nearby:
             return False, None, []
         
+        if degraded:
+            # Distance only: the closest same-category report, if it is
+            # within the tighter degraded radius.
+            closest, distance = nearby[0]
+            if distance <= settings.degraded_duplicate_radius_meters:
+                return True, closest.id, nearby
+            return False, None, nearby
+        
         best_match = None
         highest_score = 0.0
         
@@ -157,13 +167,21 @@ Return ONLY a decimal number between 0.0 and 1.0."""
         if issue.classification:
             category = issue.classification.primary_category
         
+        degraded = bool(self.model) and await degraded_mode.is_active()
         is_duplicate, parent_id, nearby = await self.check_duplicate(
             issue.id,
             issue.latitude,
             issue.longitude,
             category,
-            issue.description
+            issue.description,
+            degraded=degraded
         )
+        degraded = degraded and bool(nearby)
+        if degraded:
+            mark_for_reevaluation(
+                self.db, issue_id, self.name,
+                f"Duplicate of {parent_id}" if is_duplicate else "Unique",
+            )
         
         if is_duplicate and parent_id:
             issue.is_duplicate = True
@@ -200,6 +218,7 @@ Return ONLY a decimal number between 0.0 and 1.0."""
                 "parent_issue_id": str(parent_id) if parent_id else None,
                 "nearby_count": len(nearby),
                 "radius_meters": self.radius_meters,
+                "degraded": degraded,
             })
         )
         self.db.add(event_record)
@@ -219,7 +238,42 @@ Return ONLY a decimal number between 0.0 and 1.0."""
             "parent_issue_id": str(parent_id) if parent_id else None,
             "nearby_count": len(nearby),
             "geo_status": issue.geo_status,
+            "degraded": degraded,
         }
     
+    async def reevaluate(self, issue_id: UUID) -> str:
+        # A degraded verdict is not reversed here, since routing and priority
+        # already followed it; a disagreement is recorded for manual review.
+        query = (
+            select(Issue)
+            .options(selectinload(Issue.classification))
+            .where(Issue.id == issue_id)
+        )
+        issue = (await self.db.execute(query)).scalar_one_or_none()
+        if not issue:
+            return "skipped: issue not found"
+        
+        category = issue.classification.primary_category if issue.classification else None
+        is_duplicate, parent_id, nearby = await self.check_duplicate(
+            issue.id, issue.latitude, issue.longitude, category, issue.description
+        )
+        if is_duplicate == issue.is_duplicate and (not is_duplicate or parent_id == issue.parent_issue_id):
+            return "confirmed"
+        
+        self.db.add(IssueEvent(
+            issue_id=issue_id,
+            event_type="geo_reevaluated",
+            agent_name=self.name,
+            event_data=json.dumps({
+                "is_duplicate": is_duplicate,
+                "parent_issue_id": str(parent_id) if parent_id else None,
+                "degraded_is_duplicate": issue.is_duplicate,
+                "degraded_parent_issue_id": str(issue.parent_issue_id) if issue.parent_issue_id else None,
+                "nearby_count": len(nearby),
+            })
+        ))
+        await self.db.flush()
+        return "flagged: " + (f"duplicate of {parent_id}" if is_duplicate else "unique")
+    
     async def handle(self, event: IssueClassified) -> None:
         await self.process_issue(event.issue_id)
@@ -17,7 +17,7 @@ from Backend.services.email import email_service
 logger = get_logger(__name__, agent_name="NotificationAgent")
 
 
-class NotificationSent(Event):
+class NotificationSent(Event, kw_only=True):
     notification_type: str
     recipients: list[str]
     message: str
@@ -7,8 +7,10 @@ from sqlalchemy.orm import selectinload
 import google.generativeai as genai
 
 from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode, mark_for_reevaluation
 from Backend.core.events import event_bus, Event
 from Backend.core.logging import get_logger
+from Backend.core.schemas import CATEGORY_PRIORITY, IssueCategory
 from Backend.database.models import Issue, IssueEvent, Classification
 from Backend.orchestration.base import BaseAgent
 
@@ -18,7 +20,7 @@ if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
 
 
-class IssuePrioritized(Event):
+class IssuePrioritized(Event, kw_only=True):
     priority: int
     reasoning: str
 
@@ -64,13 +66,20 @@ Return ONLY valid JSON:
 {{"priority": 1-4, "reasoning": "max 80 chars"}}"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await degraded_mode.generate(self.model, prompt)
             result = json.loads(response.text.replace("```json", "").replace("```", "").strip())
             return result.get("priority", 3), result.get("reasoning", "Priority assigned")
         except Exception as e:
             logger.error(f"Gemini priority calculation failed: {e}")
             return 3, "Analysis error"
     
+    def table_priority(self, category: Optional[str]) -> tuple[int, str]:
+        try:
+            level = CATEGORY_PRIORITY[IssueCategory(category)]
+        except ValueError:
+            return 3, "Degraded mode: default priority"
+        return int(level), f"Degraded mode: {category} priority table"
+    
     async def process_issue(self, issue_id: UUID) -> dict:
         query = (
             select(Issue)
@@ -101,9 +110,14 @@ Return ONLY valid JSON:
         )
         duplicate_count = dup_count_result.scalar() or 0
         
-        priority, reasoning = await self.calculate_priority(
-            category, confidence, issue.is_duplicate, duplicate_count, issue.description, issue.city
-        )
+        degraded = bool(self.model) and await degraded_mode.is_active()
+        if degraded:
+            priority, reasoning = self.table_priority(category)
+            mark_for_reevaluation(self.db, issue_id, self.name, f"Priority {priority}")
+        else:
+            priority, reasoning = await self.calculate_priority(
+                category, confidence, issue.is_duplicate, duplicate_count, issue.description, issue.city
+            )
         
         issue.priority = priority
         issue.priority_reason = reasoning
@@ -123,6 +137,7 @@ Return ONLY valid JSON:
                 "reasoning": reasoning,
                 "category": category,
                 "confidence": confidence,
+                "degraded": degraded,
             })
         )
         self.db.add(event_record)
@@ -138,6 +153,7 @@ Return ONLY valid JSON:
         return {
             "priority": priority,
             "reasoning": reasoning,
+            "degraded": degraded,
         }
     
     async def handle(self, event) -> None:
@@ -8,8 +8,10 @@ from sqlalchemy.orm import selectinload
 import google.generativeai as genai
 
 from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode, mark_for_reevaluation
 from Backend.core.events import event_bus, Event
 from Backend.core.logging import get_logger
+from Backend.core.schemas import CATEGORY_DEPARTMENT, IssueCategory
 from Backend.database.models import Issue, IssueEvent, Department, Member, Classification
 from Backend.orchestration.base import BaseAgent
 
@@ -26,7 +28,7 @@ PRIORITY_SLA_HOURS = {
 }
 
 
-class IssueAssigned(Event):
+class IssueAssigned(Event, kw_only=True):
     department_code: str
     member_id: Optional[UUID] = None
     member_name: Optional[str] = None
@@ -43,7 +45,12 @@ class RoutingAgent(BaseAgent):
         else:
             self.model = None
     
-    async def find_department(self, category: Optional[str], description: Optional[str] = None) -> Optional[Department]:
+    async def find_department(
+        self,
+        category: Optional[str],
+        description: Optional[str] = None,
+        issue_id: Optional[UUID] = None,
+    ) -> Optional[Department]:
         query = select(Department).where(Department.is_active == True)
         result = await self.db.execute(query)
         departments = result.scalars().all()
@@ -54,6 +61,12 @@ class RoutingAgent(BaseAgent):
         if not self.model or not category:
             return departments[0]
         
+        if await degraded_mode.is_active():
+            department = self.table_department(departments, category)
+            if issue_id:
+                mark_for_reevaluation(self.db, issue_id, self.name, f"Department {department.code}")
+            return department
+        
         dept_info = "\n".join([f"- {d.code}: {d.name} ({d.categories})" for d in departments])
         
         prompt = f"""Route civic issue to correct department:
@@ -67,7 +80,7 @@ Available Departments:
 Return ONLY the department CODE (e.g., PWD, TRAFFIC, SANITATION)"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await degraded_mode.generate(self.model, prompt)
             dept_code = response.text.strip().upper()
             
             for dept in departments:
@@ -78,6 +91,20 @@ Return ONLY the department CODE (e.g., PWD, TRAFFIC, SANITATION)"""
         
         return departments[0]
     
+    def table_department(self, departments: list[Department], category: str) -> Department:
+        # A department listing the category wins over the built-in table.
+        for dept in departments:
+            if dept.categories and category.lower() in dept.categories.lower():
+                return dept
+        try:
+            code = CATEGORY_DEPARTMENT[IssueCategory(category)]
+        except ValueError:
+            return departments[0]
+        for dept in departments:
+            if dept.code == code:
+                return dept
+        return departments[0]
+    
     async def find_available_member(
         self, 
         department_id: UUID, 
@@ -122,7 +149,7 @@ Return ONLY the department CODE (e.g., PWD, TRAFFIC, SANITATION)"""
         deadline = datetime.utcnow() + timedelta(hours=base_hours)
         return base_hours, deadline
     
-    async def process_issue(self, issue_id: UUID) -> dict:
+    async def load_routable_issue(self, issue_id: UUID) -> tuple[Optional[Issue], Optional[dict]]:
         query = (
             select(Issue)
             .options(selectinload(Issue.classification))
@@ -131,7 +158,7 @@ Return ONLY the department CODE (e.g., PWD, TRAFFIC, SANITATION)"""
         result = await self.db.execute(query)
         issue = result.scalar_one_or_none()
         if not issue:
-            return {"error": "Issue not found"}
+            return None, {"error": "Issue not found"}
         
         if issue.is_duplicate:
             self.log_decision(
@@ -139,12 +166,50 @@ Return ONLY the department CODE (e.g., PWD, TRAFFIC, SANITATION)"""
                 decision="Skipped routing",
                 reasoning="Issue is a duplicate"
             )
-            return {"skipped": True, "reason": "duplicate"}
+            return None, {"skipped": True, "reason": "duplicate"}
+        
+        return issue, None
+    
+    async def process_issue(self, issue_id: UUID) -> dict:
+        issue, outcome = await self.load_routable_issue(issue_id)
+        if not issue:
+            return outcome
         
         category = issue.classification.primary_category if issue.classification else None
-        priority = issue.priority or 3
+        department = await self.find_department(category, issue.description)
+        return await self.assign_issue(issue, department)
+    
+    async def reroute(self, issue_id: UUID) -> str:
+        # Re-runs the department choice for an issue routed in degraded mode
+        # and moves it only while nobody has started on it.
+        issue, outcome = await self.load_routable_issue(issue_id)
+        if not issue:
+            return f"skipped: {outcome.get('reason') or outcome.get('error')}"
         
+        category = issue.classification.primary_category if issue.classification else None
         department = await self.find_department(category, issue.description)
+        if not department or department.id == issue.department_id:
+            return "confirmed"
+        if issue.state != "assigned":
+            return f"kept: issue is {issue.state}, suggested {department.code}"
+        
+        if issue.assigned_member_id:
+            member = await self.db.get(Member, issue.assigned_member_id)
+            if member and member.current_workload > 0:
+                member.current_workload -= 1
+        result = await self.assign_issue(issue, department)
+        return f"rerouted to {result['department']}"
+    
+    async def assign(self, issue_id: UUID, department: Optional[Department]) -> dict:
+        issue, outcome = await self.load_routable_issue(issue_id)
+        if not issue:
+            return outcome
+        return await self.assign_issue(issue, department)
+    
+    async def assign_issue(self, issue: Issue, department: Optional[Department]) -> dict:
+        issue_id = issue.id
+        category = issue.classification.primary_category if issue.classification else None
+        priority = issue.priority or 3
         
         member = None
         if department:
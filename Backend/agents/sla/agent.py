@@ -9,6 +9,7 @@ import google.generativeai as genai
 from Backend.core.events import event_bus, Event
 from Backend.core.logging import get_logger
 from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode
 from Backend.database.models import Issue, IssueEvent, Member, Department
 from Backend.orchestration.base import BaseAgent
 
@@ -18,7 +19,7 @@ if settings.gemini_api_key:
     genai.configure(api_key=settings.gemini_api_key)
 
 
-class SLAWarning(Event):
+class SLAWarning(Event, kw_only=True):
     hours_remaining: float
     threshold_hours: float
     warning_level: str  
@@ -42,7 +43,7 @@ class SLAAgent(BaseAgent):
         if not issue.sla_deadline or issue.state in ["resolved", "verified", "closed", "escalated"]:
             return False, "", None
         
-        if not self.model:
+        if not self.model or await degraded_mode.is_active():
             now = datetime.utcnow()
             hours_remaining = (issue.sla_deadline - now).total_seconds() / 3600
             total_sla_hours = issue.sla_hours or 48
@@ -76,7 +77,7 @@ Return ONLY valid JSON:
 {{"warning_level": "none/warning/critical", "reason": "max 60 chars"}}"""
         
         try:
-            response = self.model.generate_content(prompt)
+            response = await degraded_mode.generate(self.model, prompt)
             result = json.loads(response.text.replace("```json", "").replace("```", "").strip())
             level = result.get("warning_level", "none")
             reason = result.get("reason", "SLA assessment completed")
@@ -1,19 +1,20 @@
+import asyncio
 import json
 import time
-import cv2
-import numpy as np
 import google.generativeai as genai
 from pathlib import Path
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import case, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from Backend.core.config import settings
 from Backend.core.events import event_bus, IssueClassified, IssueCreated
 from Backend.core.logging import get_logger
 from Backend.core.schemas import ClassificationResult, DetectionBox, CLASS_ID_TO_CATEGORY, IssueCategory
+from Backend.agents.vision.inference import BatchInferenceEngine, BatchResult, InferenceOutput, analyse_images, decode_image, load_yolo
+from Backend.agents.vision.pool import InferenceProcessPool
 from Backend.database.models import Classification, Issue, IssueImage, IssueEvent
 from Backend.orchestration.base import BaseAgent
 from Backend.utils.fuzzy_match import auto_validate_issue
@@ -27,6 +28,8 @@ if settings.gemini_api_key:
 
 class VisionAgent(BaseAgent):
     _model = None
+    _engine: Optional[BatchInferenceEngine] = None
+    _pool: Optional[InferenceProcessPool] = None
     
     def __init__(self, db: Optional[AsyncSession] = None):
         super().__init__("VisionAgent")
@@ -39,12 +42,8 @@ class VisionAgent(BaseAgent):
     @classmethod
     def load_model(cls):
         if cls._model is None:
-            from ultralytics import YOLO
-            model_path = settings.model_path
-            if not model_path.exists():
-                raise FileNotFoundError(f"Model not found: {model_path}")
-            cls._model = YOLO(str(model_path))
-            logger.info(f"YOLO model loaded from {model_path}")
+            cls._model = load_yolo(settings.model_path, settings.vision_backend)
+            logger.info(f"YOLO model loaded from {settings.model_path} ({settings.vision_backend})")
         return cls._model
     
     @classmethod
@@ -56,36 +55,72 @@ class VisionAgent(BaseAgent):
     async def download_image(self, remote_path: str) -> bytes:
         return await download_from_supabase(remote_path)
     
-    async def save_annotated(self, results, original_path: str, subfolder: str) -> str:
-        im_array = results[0].plot()
-        
+    async def save_annotated(self, image_bytes: bytes, original_path: str, subfolder: str) -> str:
         original_name = Path(original_path).stem
         annotated_filename = f"annotated_{original_name}.jpg"
         
-        _, buffer = cv2.imencode('.jpg', im_array, [cv2.IMWRITE_JPEG_QUALITY, 90])
-        image_bytes = buffer.tobytes()
-        
         remote_path = await save_bytes(image_bytes, annotated_filename, subfolder=subfolder)
         return remote_path
     
-    async def run_inference(self, image_data: bytes) -> tuple[list, float]:
-        model = self.get_model()
-        
-        nparr = np.frombuffer(image_data, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img is None:
-            raise ValueError("Invalid image data")
-        
-        start_time = time.perf_counter()
-        results = model.predict(
-            source=img,
-            conf=settings.model_confidence_threshold,
-            imgsz=settings.model_input_size,
-            verbose=False,
-        )
-        inference_time = (time.perf_counter() - start_time) * 1000
+    @classmethod
+    def engine(cls) -> BatchInferenceEngine:
+        # With VISION_POOL_WORKERS set, decode, predict and annotate run in
+        # that many inference processes; otherwise in one thread here.
+        if cls._engine is None:
+            if settings.vision_pool_workers > 0:
+                cls._pool = InferenceProcessPool(
+                    settings.model_path,
+                    workers=settings.vision_pool_workers,
+                    threads=settings.vision_pool_threads,
+                    conf=settings.model_confidence_threshold,
+                    imgsz=settings.model_input_size,
+                    backend=settings.vision_backend,
+                    reduced_decode=settings.vision_reduced_decode,
+                )
+                analyse, concurrency = cls._pool.analyse, cls._pool.workers
+            else:
+                analyse, concurrency = cls.analyse_in_thread, 1
+            cls._engine = BatchInferenceEngine(
+                analyse,
+                max_batch=settings.vision_batch_max_size,
+                max_wait_ms=settings.vision_batch_max_wait_ms,
+                concurrency=concurrency,
+            )
+        return cls._engine
+    
+    @classmethod
+    async def start_inference(cls) -> None:
+        cls.engine()
+        if cls._pool:
+            await cls._pool.start()
+        else:
+            await asyncio.to_thread(cls.load_model)
+    
+    @classmethod
+    async def stop_inference(cls) -> None:
+        if cls._engine:
+            await cls._engine.stop()
+            logger.info(f"Vision inference batches: {cls._engine.stats.to_dict()}")
+        if cls._pool:
+            await asyncio.to_thread(cls._pool.shutdown)
+    
+    @classmethod
+    async def analyse_in_thread(cls, images: list[bytes]) -> BatchResult:
+        # The engine runs one batch at a time here, so the YOLO predictor's
+        # per-call state is never shared.
+        min_side = settings.model_input_size if settings.vision_reduced_decode else 0
         
-        return results, inference_time
+        def analyse() -> BatchResult:
+            return analyse_images(
+                cls.get_model(),
+                [decode_image(data, min_side) for data in images],
+                settings.model_confidence_threshold,
+                settings.model_input_size,
+            )
+        return await asyncio.to_thread(analyse)
+    
+    async def run_inference(self, image_data: bytes) -> tuple[InferenceOutput, float]:
+        return await self.engine().infer(image_data)
 
     async def gemini_classify_image(
         self,
@@ -107,7 +142,8 @@ class VisionAgent(BaseAgent):
         )
 
         try:
-            response = self.gemini_model.generate_content(
+            response = await asyncio.to_thread(
+                self.gemini_model.generate_content,
                 [
                     {"text": prompt},
                     {
@@ -134,24 +170,19 @@ class VisionAgent(BaseAgent):
             logger.error(f"Gemini vision classification failed: {e}")
             return None, 0.0, None
     
-    def extract_detections(self, results) -> list[DetectionBox]:
+    def extract_detections(self, boxes: list[list[float]]) -> list[DetectionBox]:
+        # Rows are x1, y1, x2, y2, conf, cls, copied from boxes.data at once.
         detections = []
-        for result in results:
-            boxes = result.boxes
-            if boxes is not None:
-                for i in range(len(boxes)):
-                    class_id = int(boxes.cls[i].item())
-                    confidence = float(boxes.conf[i].item())
-                    bbox = tuple(boxes.xyxy[i].tolist())
-                    
-                    category = CLASS_ID_TO_CATEGORY.get(class_id)
-                    if category:
-                        detections.append(DetectionBox(
-                            class_id=class_id,
-                            class_name=category.value,
-                            confidence=confidence,
-                            bbox=bbox,
-                        ))
+        for row in boxes:
+            class_id = int(row[-1])
+            category = CLASS_ID_TO_CATEGORY.get(class_id)
+            if category:
+                detections.append(DetectionBox(
+                    class_id=class_id,
+                    class_name=category.value,
+                    confidence=row[-2],
+                    bbox=tuple(row[:4]),
+                ))
         return detections
     
     async def classify_image(
@@ -161,9 +192,9 @@ class VisionAgent(BaseAgent):
         description: Optional[str] = None
     ) -> tuple[list[DetectionBox], str, Optional[IssueCategory], float, Optional[str]]:
         image_data = await self.download_image(image_path)
-        results, inference_time = await self.run_inference(image_data)
-        annotated_path = await self.save_annotated(results, image_path, subfolder)
-        detections = self.extract_detections(results)
+        output, inference_time = await self.run_inference(image_data)
+        annotated_path = await self.save_annotated(output.annotated, image_path, subfolder)
+        detections = self.extract_detections(output.boxes)
 
         gemini_category = None
         gemini_confidence = 0.0
@@ -183,37 +214,43 @@ class VisionAgent(BaseAgent):
         image_paths: list[str],
         description: Optional[str] = None
     ) -> ClassificationResult:
+        subfolder = str(issue_id)
+        
+        # Each image's download, inference, render and upload overlaps with
+        # the other images'; gather keeps results in image_paths order.
+        limit = asyncio.Semaphore(max(1, settings.vision_image_concurrency))
+        
+        async def classify(path: str):
+            async with limit:
+                return await self.classify_image(path, subfolder=subfolder, description=description)
+        
+        start = time.perf_counter()
+        classified = await asyncio.gather(*(classify(path) for path in image_paths))
+        total_time = (time.perf_counter() - start) * 1000
+        
         all_detections = []
         annotated_paths = []
-        total_time = 0.0
-        subfolder = str(issue_id)
-
         gemini_best_category = None
         gemini_best_confidence = 0.0
         gemini_best_reasoning = None
         
-        for path in image_paths:
-            start = time.perf_counter()
-            detections, annotated_path, gemini_category, gemini_confidence, gemini_reasoning = await self.classify_image(
-                path,
-                subfolder=subfolder,
-                description=description
-            )
-            total_time += (time.perf_counter() - start) * 1000
+        for detections, annotated_path, gemini_category, gemini_confidence, gemini_reasoning in classified:
             all_detections.extend(detections)
             annotated_paths.append(annotated_path)
-
+            
             if gemini_category and gemini_confidence > gemini_best_confidence:
                 gemini_best_category = gemini_category
                 gemini_best_confidence = gemini_confidence
                 gemini_best_reasoning = gemini_reasoning
-            
-            if self.db:
-                query = select(IssueImage).where(IssueImage.file_path == path)
-                result = await self.db.execute(query)
-                image_record = result.scalar_one_or_none()
-                if image_record:
-                    image_record.annotated_path = annotated_path
+        
+        if self.db and image_paths:
+            annotated_by_path = dict(zip(image_paths, annotated_paths))
+            await self.db.execute(
+                update(IssueImage)
+                .where(IssueImage.file_path.in_(annotated_by_path))
+                .values(annotated_path=case(annotated_by_path, value=IssueImage.file_path))
+                .execution_options(synchronize_session="fetch")
+            )
         
         result = ClassificationResult(
             issue_id=issue_id,
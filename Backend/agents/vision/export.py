@@ -0,0 +1,104 @@
+import argparse
+import sys
+from pathlib import Path
+from typing import Any
+
+from Backend.agents.vision.inference import analyse_images, backend_model_path, decode_image, load_yolo
+from Backend.core.config import settings
+
+
+def export_model(model_path: Path, backend: str, imgsz: int) -> Path:
+    # Dynamic axes let the exported graph take the engine's variable batch
+    # sizes; ultralytics writes the artifact next to the .pt.
+    from ultralytics import YOLO
+    model = YOLO(str(model_path))
+    kwargs = {"simplify": True} if backend == "onnx" else {}
+    exported = Path(model.export(format=backend, imgsz=imgsz, dynamic=True, **kwargs))
+    expected = backend_model_path(model_path, backend)
+    if exported.resolve() != expected.resolve():
+        exported.rename(expected)
+    return expected
+
+
+def iou(a: list[float], b: list[float]) -> float:
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def match_boxes(reference: list[list[float]], candidate: list[list[float]], min_iou: float) -> list[tuple[list, list]]:
+    # Greedy, most confident reference box first; a match needs the same
+    # class and at least min_iou overlap.
+    pairs, unused = [], list(candidate)
+    for ref in sorted(reference, key=lambda row: -row[4]):
+        best, best_iou = None, min_iou
+        for box in unused:
+            overlap = iou(ref, box)
+            if int(box[5]) == int(ref[5]) and overlap >= best_iou:
+                best, best_iou = box, overlap
+        if best is not None:
+            unused.remove(best)
+            pairs.append((ref, best))
+    return pairs
+
+
+def compare(model: Any, reference: Any, images: list[bytes], min_iou: float = 0.5) -> dict:
+    # Detection agreement of `model` against `reference` over the same
+    # images: matched boxes over all boxes either side found (an F1 score).
+    decoded = [decode_image(data, settings.model_input_size) for data in images]
+    ours = analyse_images(model, decoded, settings.model_confidence_threshold, settings.model_input_size)
+    theirs = analyse_images(reference, decoded, settings.model_confidence_threshold, settings.model_input_size)
+
+    matched = total = 0
+    conf_deltas: list[float] = []
+    for candidate, expected in zip(ours, theirs):
+        if isinstance(candidate, Exception) or isinstance(expected, Exception):
+            continue
+        pairs = match_boxes(expected.boxes, candidate.boxes, min_iou)
+        matched += len(pairs)
+        total += len(expected.boxes) + len(candidate.boxes)
+        conf_deltas.extend(abs(ref[4] - box[4]) for ref, box in pairs)
+
+    return {
+        "images": len(images),
+        "agreement": 2 * matched / total if total else 1.0,
+        "max_conf_delta": max(conf_deltas, default=0.0),
+    }
+
+
+def check_parity(backend: str, images: list[bytes], min_agreement: float, model_path: Path) -> dict:
+    report = compare(load_yolo(model_path, backend), load_yolo(model_path, "torch"), images)
+    report["backend"] = backend
+    report["passed"] = report["agreement"] >= min_agreement
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export the vision model for CPU backends and check detection parity")
+    parser.add_argument("--backends", nargs="+", choices=["onnx", "openvino"], default=["onnx"])
+    parser.add_argument("--model", type=Path, default=settings.model_path)
+    parser.add_argument("--imgsz", type=int, default=settings.model_input_size)
+    parser.add_argument("--images", type=Path, nargs="*", default=[], help="images for the parity check")
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    args = parser.parse_args()
+
+    images = [path.read_bytes() for path in args.images]
+    failed = False
+    for backend in args.backends:
+        path = export_model(args.model, backend, args.imgsz)
+        print(f"{backend}: exported to {path}")
+        if not images:
+            continue
+        report = check_parity(backend, images, args.min_agreement, args.model)
+        failed = failed or not report["passed"]
+        print(
+            f"{backend}: agreement {report['agreement']:.3f} over {report['images']} images, "
+            f"max confidence delta {report['max_conf_delta']:.3f} - {'ok' if report['passed'] else 'FAILED'}"
+        )
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
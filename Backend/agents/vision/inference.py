@@ -0,0 +1,260 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional, Union
+
+import cv2
+import numpy as np
+
+from Backend.core.logging import get_logger
+
+logger = get_logger(__name__, agent_name="VisionAgent")
+
+
+@dataclass
+class InferenceOutput:
+    # Box rows are x1, y1, x2, y2, conf, cls, as in YOLO's boxes.data.
+    boxes: list[list[float]]
+    annotated: bytes
+
+
+BatchResult = list[Union[InferenceOutput, Exception]]
+
+
+BACKENDS = ("torch", "onnx", "onnx_int8", "openvino")
+
+
+def backend_model_path(model_path: Path, backend: str) -> Path:
+    # Where `python -m Backend.agents.vision.export` (and .quantize for
+    # onnx_int8) puts each format.
+    if backend == "onnx":
+        return model_path.with_suffix(".onnx")
+    if backend == "onnx_int8":
+        return model_path.with_name(f"{model_path.stem}_int8.onnx")
+    if backend == "openvino":
+        return model_path.parent / f"{model_path.stem}_openvino_model"
+    return model_path
+
+
+def load_yolo(model_path: Path, backend: str = "torch") -> Any:
+    # ultralytics runs ONNX Runtime and OpenVINO models behind the same
+    # predict() and Results as PyTorch, so the rest of the pipeline is
+    # backend-agnostic.
+    from ultralytics import YOLO
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown vision backend {backend!r}, expected one of {BACKENDS}")
+    path = backend_model_path(model_path, backend)
+    if not path.exists():
+        raise FileNotFoundError(f"Model not found: {path}")
+    return YOLO(str(path), task="detect")
+
+
+@dataclass
+class DecodedImage:
+    pixels: np.ndarray
+    # Original over decoded size, per axis, for mapping boxes back.
+    scale: tuple[float, float] = (1.0, 1.0)
+
+
+REDUCED_DECODE = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+# SOFn markers carry the frame size; C4 (DHT), C8 (JPG) and CC (DAC) do not.
+SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+def jpeg_size(data: Any) -> Optional[tuple[int, int]]:
+    # Walks the marker segments up to the first SOF and returns (width,
+    # height) without decoding anything; None for anything but a JPEG.
+    data = memoryview(data)
+    if len(data) < 4 or data[0] != 0xFF or data[1] != 0xD8:
+        return None
+    pos = 2
+    while pos + 9 < len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in SOF_MARKERS:
+            height = (data[pos + 5] << 8) | data[pos + 6]
+            width = (data[pos + 7] << 8) | data[pos + 8]
+            return width, height
+        pos += 2 + ((data[pos + 2] << 8) | data[pos + 3])
+    return None
+
+
+def decode_image(buffer: Any, min_side: int = 0) -> Optional[DecodedImage]:
+    # A JPEG much larger than the model input is decoded at 1/2, 1/4 or 1/8
+    # scale by libjpeg's DCT scaling, choosing the smallest scale whose
+    # longest side still reaches min_side, so ultralytics only ever shrinks it.
+    flag, factor = cv2.IMREAD_COLOR, 1
+    size = jpeg_size(buffer) if min_side else None
+    if size:
+        longest = max(size)
+        for candidate, reduced_flag in REDUCED_DECODE:
+            if -(-longest // candidate) >= min_side:
+                flag, factor = reduced_flag, candidate
+                break
+
+    pixels = cv2.imdecode(np.frombuffer(buffer, np.uint8), flag)
+    if pixels is None:
+        return None
+    if factor == 1:
+        return DecodedImage(pixels)
+
+    # EXIF orientation is applied after decoding, so the frame size may be
+    # transposed relative to the decoded image.
+    width, height = size
+    decoded_h, decoded_w = pixels.shape[:2]
+    if abs(width / decoded_w - factor) > abs(height / decoded_w - factor):
+        width, height = height, width
+    return DecodedImage(pixels, (width / decoded_w, height / decoded_h))
+
+
+def analyse_images(model: Any, images: list[Optional[DecodedImage]], conf: float, imgsz: int) -> BatchResult:
+    # One forward pass for every decodable image; each then gets its boxes,
+    # in original-image coordinates, and an annotated JPEG at the decoded
+    # size, and undecodable ones a ValueError in their slot.
+    valid = [img.pixels for img in images if img is not None]
+    results = iter(model.predict(source=valid, conf=conf, imgsz=imgsz, verbose=False) if valid else [])
+
+    outputs: BatchResult = []
+    for img in images:
+        if img is None:
+            outputs.append(ValueError("Invalid image data"))
+            continue
+        result = next(results)
+        boxes = []
+        if result.boxes is not None and len(result.boxes):
+            data = result.boxes.data.cpu().numpy()
+            if img.scale != (1.0, 1.0):
+                # A copy: the tensor's memory is shared and plot() still
+                # draws the boxes on the decoded image.
+                data = data.copy()
+                data[:, [0, 2]] *= img.scale[0]
+                data[:, [1, 3]] *= img.scale[1]
+            boxes = data.tolist()
+        _, buffer = cv2.imencode('.jpg', result.plot(), [cv2.IMWRITE_JPEG_QUALITY, 90])
+        outputs.append(InferenceOutput(boxes=boxes, annotated=buffer.tobytes()))
+    return outputs
+
+
+@dataclass
+class BatchStats:
+    batches: int = 0
+    images: int = 0
+    largest: int = 0
+    predict_ms: float = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "batches": self.batches,
+            "images": self.images,
+            "mean_batch": round(self.images / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest,
+            "mean_predict_ms": round(self.predict_ms / self.batches, 2) if self.batches else 0.0,
+        }
+
+
+# Images from concurrent process_issue calls are gathered into one batch:
+# the first image waits at most max_wait_ms for others to join, and a batch
+# closes early at max_batch. Up to `concurrency` batches run at once, one
+# per inference process (or one in a thread without a pool), and each
+# caller gets back its own result and the batch's analysis time.
+class BatchInferenceEngine:
+    def __init__(
+        self,
+        analyse: Callable[[list[bytes]], Awaitable[BatchResult]],
+        max_batch: int = 8,
+        max_wait_ms: float = 10.0,
+        concurrency: int = 1,
+    ):
+        self.analyse = analyse
+        self.max_batch = max(1, max_batch)
+        self.max_wait_ms = max_wait_ms
+        self.concurrency = max(1, concurrency)
+        self.stats = BatchStats()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._running: set[asyncio.Task] = set()
+
+    async def infer(self, image_data: bytes) -> tuple[InferenceOutput, float]:
+        self._ensure_running()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((image_data, future))
+        return await future
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._task = None
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def _collect(self) -> list[tuple[bytes, asyncio.Future]]:
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            await slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                slots.release()
+                raise
+            batch = [(data, future) for data, future in batch if not future.cancelled()]
+            if not batch:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._analyse(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+    async def _analyse(self, batch: list[tuple[bytes, asyncio.Future]]) -> None:
+        start = time.perf_counter()
+        try:
+            results = await self.analyse([data for data, _ in batch])
+        except Exception as e:
+            logger.error(f"Batched inference of {len(batch)} images failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        self.stats.batches += 1
+        self.stats.images += len(batch)
+        self.stats.largest = max(self.stats.largest, len(batch))
+        self.stats.predict_ms += elapsed_ms
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result((result, elapsed_ms))
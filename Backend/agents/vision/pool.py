@@ -0,0 +1,200 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+from typing import Optional
+
+from Backend.agents.vision.inference import BatchResult, InferenceOutput, analyse_images, decode_image, load_yolo
+from Backend.core.logging import get_logger
+
+logger = get_logger(__name__, agent_name="VisionAgent")
+
+Span = tuple[int, int]
+
+CAN_PIN = hasattr(os, "sched_setaffinity")
+
+# Per-process state of an inference worker.
+_model = None
+_conf = 0.25
+_imgsz = 512
+_min_side = 0
+# The last batch's output block. Windows frees a block once its last handle
+# closes, so it stays open here until the parent has read it; the next batch
+# only starts after that.
+_out: Optional[SharedMemory] = None
+
+
+def _init_worker(
+    model_path: str,
+    backend: str,
+    cores: list[int],
+    threads: int,
+    conf: float,
+    imgsz: int,
+    reduced_decode: bool,
+) -> None:
+    global _model, _conf, _imgsz, _min_side
+    if cores and CAN_PIN:
+        os.sched_setaffinity(0, cores)
+    os.environ["OMP_NUM_THREADS"] = str(threads)
+
+    import torch
+    torch.set_num_threads(threads)
+    _model = load_yolo(Path(model_path), backend)
+    _conf, _imgsz = conf, imgsz
+    _min_side = imgsz if reduced_decode else 0
+
+
+def _ready() -> int:
+    return os.getpid()
+
+
+def _analyse_shared(name: str, spans: list[Span]) -> tuple[Optional[str], list]:
+    # Images are decoded straight out of the caller's shared block, and the
+    # annotated JPEGs go back in a new block; only names, offsets and box
+    # rows cross the pipe.
+    global _out
+    if _out is not None:
+        _out.close()
+        _out = None
+    shm = SharedMemory(name=name)
+    try:
+        images = [decode_image(shm.buf[offset:offset + size], _min_side) for offset, size in spans]
+    finally:
+        shm.close()
+    outputs = analyse_images(_model, images, _conf, _imgsz)
+
+    annotated = [o.annotated for o in outputs if isinstance(o, InferenceOutput)]
+    out = SharedMemory(create=True, size=max(1, sum(len(a) for a in annotated))) if annotated else None
+    items, offset = [], 0
+    for output in outputs:
+        if isinstance(output, Exception):
+            items.append((None, str(output)))
+            continue
+        size = len(output.annotated)
+        out.buf[offset:offset + size] = output.annotated
+        items.append(((offset, size), output.boxes))
+        offset += size
+    if out is None:
+        return None, items
+    _out = out
+    return out.name, items
+
+
+def core_sets(workers: int, available: Optional[list[int]] = None) -> list[list[int]]:
+    # Splits the cores this process may use into one contiguous set per
+    # worker; with more workers than cores, sets are shared round-robin.
+    if available is None:
+        available = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else list(range(os.cpu_count() or 1))
+    if workers >= len(available):
+        return [[available[i % len(available)]] for i in range(workers)]
+    per_worker, extra = divmod(len(available), workers)
+    sets, start = [], 0
+    for i in range(workers):
+        size = per_worker + (1 if i < extra else 0)
+        sets.append(available[start:start + size])
+        start += size
+    return sets
+
+
+# Each inference process is its own single-worker executor, so its core
+# set and torch thread count stay fixed; a batch goes to whichever process
+# is idle.
+class InferenceProcessPool:
+    def __init__(
+        self,
+        model_path: Path,
+        workers: int,
+        threads: int = 0,
+        conf: float = 0.25,
+        imgsz: int = 512,
+        backend: str = "torch",
+        reduced_decode: bool = True,
+    ):
+        self.model_path = model_path
+        self.backend = backend
+        self.reduced_decode = reduced_decode
+        self.threads = threads
+        self.conf = conf
+        self.imgsz = imgsz
+        self.workers = max(1, workers)
+        self.cores = core_sets(self.workers)
+        self._executors = [self._spawn(cores) for cores in self.cores]
+        self._idle: Optional[asyncio.Queue] = None
+        if not CAN_PIN:
+            logger.warning("CPU affinity is not supported on this platform; inference processes run unpinned")
+
+    def _spawn(self, cores: list[int]) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(
+                str(self.model_path), self.backend, cores, self.threads or len(cores),
+                self.conf, self.imgsz, self.reduced_decode,
+            ),
+        )
+
+    def _idle_queue(self) -> asyncio.Queue:
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            for executor in self._executors:
+                self._idle.put_nowait(executor)
+        return self._idle
+
+    async def start(self) -> None:
+        # Spawns every process and loads its model before the first batch.
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(*(loop.run_in_executor(e, _ready) for e in self._executors))
+        for pid, cores in zip(pids, self.cores):
+            logger.info(f"Inference process {pid} ready on cores {cores}" if CAN_PIN else f"Inference process {pid} ready")
+
+    async def analyse(self, images: list[bytes]) -> BatchResult:
+        idle = self._idle_queue()
+        executor = await idle.get()
+        shm = SharedMemory(create=True, size=max(1, sum(len(data) for data in images)))
+        try:
+            spans, offset = [], 0
+            for data in images:
+                shm.buf[offset:offset + len(data)] = data
+                spans.append((offset, len(data)))
+                offset += len(data)
+            out_name, items = await asyncio.get_running_loop().run_in_executor(
+                executor, _analyse_shared, shm.name, spans
+            )
+            # Read before the process is handed on and reuses its output slot.
+            return self._collect(out_name, items)
+        except BrokenProcessPool:
+            # The process died (e.g. out of memory); the next batch gets a
+            # fresh one on the same cores.
+            index = self._executors.index(executor)
+            logger.error(f"Inference process on cores {self.cores[index]} died; restarting it")
+            executor = self._executors[index] = self._spawn(self.cores[index])
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+            idle.put_nowait(executor)
+
+    def _collect(self, out_name: Optional[str], items: list) -> BatchResult:
+        out = SharedMemory(name=out_name) if out_name else None
+        try:
+            outputs: BatchResult = []
+            for span, payload in items:
+                if span is None:
+                    outputs.append(ValueError(payload))
+                    continue
+                offset, size = span
+                outputs.append(InferenceOutput(boxes=payload, annotated=bytes(out.buf[offset:offset + size])))
+            return outputs
+        finally:
+            if out:
+                out.close()
+                out.unlink()
+
+    def shutdown(self) -> None:
+        for executor in self._executors:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,143 @@
+import argparse
+import json
+import random
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from Backend.agents.vision.export import export_model
+from Backend.agents.vision.inference import backend_model_path
+from Backend.core.config import settings
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def dataset_split(data: Path, split: str) -> list[Path]:
+    # Resolved the way ultralytics' own val() resolves the dataset YAML.
+    from ultralytics.data.utils import check_det_dataset
+    entries = check_det_dataset(str(data))[split]
+    images = []
+    for entry in entries if isinstance(entries, list) else [entries]:
+        root = Path(entry)
+        if root.suffix == ".txt":
+            images.extend(Path(line.strip()) for line in root.read_text().splitlines() if line.strip())
+        else:
+            images.extend(p for p in sorted(root.rglob("*")) if p.suffix.lower() in IMAGE_SUFFIXES)
+    return images
+
+
+def preprocess(path: Path, imgsz: int) -> Optional[np.ndarray]:
+    # Same letterbox, channel order and scaling as the ultralytics predictor.
+    from ultralytics.data.augment import LetterBox
+    img = cv2.imread(str(path), cv2.IMREAD_COLOR)
+    if img is None:
+        return None
+    img = LetterBox(new_shape=(imgsz, imgsz), auto=False)(image=img)
+    img = img[..., ::-1].transpose(2, 0, 1)
+    return np.ascontiguousarray(img, dtype=np.float32)[None] / 255.0
+
+
+def head_nodes(onnx_path: Path) -> list[str]:
+    # The Detect head concatenates box coordinates and class scores, whose
+    # ranges differ too much to share INT8 scales; it stays in FP32.
+    import onnx
+
+    def module(name: str) -> int:
+        match = re.match(r"/model\.(\d+)/", name)
+        return int(match.group(1)) if match else -1
+
+    graph = onnx.load(str(onnx_path)).graph
+    last = max((module(node.name) for node in graph.node), default=-1)
+    return [node.name for node in graph.node if module(node.name) == last]
+
+
+def quantize_int8(fp32_onnx: Path, output: Path, calibration: list[Path], imgsz: int, keep_head_fp32: bool) -> None:
+    import onnx
+    from onnxruntime.quantization import CalibrationDataReader, CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    input_name = onnx.load(str(fp32_onnx)).graph.input[0].name
+
+    class CalibrationImages(CalibrationDataReader):
+        def __init__(self):
+            self._batches = (
+                {input_name: batch} for batch in (preprocess(path, imgsz) for path in calibration) if batch is not None
+            )
+
+        def get_next(self):
+            return next(self._batches, None)
+
+    quantize_static(
+        str(fp32_onnx),
+        str(output),
+        CalibrationImages(),
+        quant_format=QuantFormat.QDQ,
+        activation_type=QuantType.QUInt8,
+        weight_type=QuantType.QInt8,
+        per_channel=True,
+        calibrate_method=CalibrationMethod.MinMax,
+        nodes_to_exclude=head_nodes(fp32_onnx) if keep_head_fp32 else [],
+    )
+
+
+def map50(model_path: Path, data: Path, imgsz: int) -> float:
+    from ultralytics import YOLO
+    results = YOLO(str(model_path), task="detect").val(
+        data=str(data),
+        split="test",
+        imgsz=imgsz,
+        batch=16,
+        device="cpu",
+        plots=False,
+        workers=0,
+        verbose=False,
+    )
+    return float(results.box.map50) * 100.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="INT8-quantize the vision model and gate it on test-split mAP50")
+    parser.add_argument("--data", type=Path, required=True, help="merged dataset YAML, as used by Model/test_model_accuracy.py")
+    parser.add_argument("--model", type=Path, default=settings.model_path)
+    parser.add_argument("--imgsz", type=int, default=settings.model_input_size)
+    parser.add_argument("--calibration-images", type=int, default=300)
+    parser.add_argument("--max-map50-drop", type=float, default=settings.vision_int8_max_map50_drop,
+                        help="allowed mAP50 drop in percentage points below the FP32 model")
+    parser.add_argument("--quantize-head", action="store_true", help="quantize the Detect head as well")
+    args = parser.parse_args()
+
+    train = dataset_split(args.data, "train")
+    calibration = random.Random(0).sample(train, min(args.calibration_images, len(train)))
+    fp32_onnx = export_model(args.model, "onnx", args.imgsz)
+    artifact = backend_model_path(args.model, "onnx_int8")
+    candidate = artifact.with_name(f"{artifact.stem}.candidate.onnx")
+
+    print(f"Calibrating on {len(calibration)} of {len(train)} training images")
+    quantize_int8(fp32_onnx, candidate, calibration, args.imgsz, keep_head_fp32=not args.quantize_head)
+
+    baseline = map50(args.model, args.data, args.imgsz)
+    quantized = map50(candidate, args.data, args.imgsz)
+    drop = baseline - quantized
+    passed = drop <= args.max_map50_drop
+    print(f"mAP@0.50 FP32 {baseline:.2f}%, INT8 {quantized:.2f}%, drop {drop:.2f} points "
+          f"(max {args.max_map50_drop:.2f}) - {'accepted' if passed else 'REJECTED'}")
+
+    if not passed:
+        candidate.unlink()
+        sys.exit(1)
+    candidate.replace(artifact)
+    artifact.with_suffix(".json").write_text(json.dumps({
+        "source": str(args.model),
+        "imgsz": args.imgsz,
+        "calibration_images": len(calibration),
+        "map50_fp32": round(baseline, 2),
+        "map50_int8": round(quantized, 2),
+    }, indent=2))
+    print(f"INT8 model written to {artifact}; set VISION_BACKEND=onnx_int8 to serve it")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,13 @@ from fastapi.staticfiles import StaticFiles
 
 from Backend.core.config import settings
 from Backend.core.events import event_bus
+from Backend.core.flow_archive import flow_archive
+from Backend.core.flow_store import flow_store
+from Backend.core.flow_tracker import on_flow_changed
 from Backend.core.logging import setup_logging, get_logger
 from Backend.core.security import SecurityHeadersMiddleware, RateLimitMiddleware, RequestValidationMiddleware
 from Backend.database.connection import init_db, close_db
+from Backend.orchestration.admission import PipelineQueueFull
 from Backend.api.routes import api_router
 
 logger = get_logger(__name__)
@@ -27,13 +31,8 @@ async def lifespan(app: FastAPI):
     await event_bus.start()
     logger.info("Event bus started")
     
-    
-    from Backend.agents.vision import VisionAgent
-    try:
-        VisionAgent.load_model()
-        logger.info("Vision model loaded")
-    except Exception as e:
-        logger.warning(f"Vision model failed to load: {e}. Running in mock mode.")
+    await flow_store.start(on_flow_changed)
+    await flow_archive.start()
     
     
     import asyncio
@@ -64,6 +63,8 @@ async def lifespan(app: FastAPI):
     yield
     
     task.cancel()
+    await flow_archive.stop()
+    await flow_store.stop()
     await event_bus.stop()
     await close_db()
     logger.info("Shutdown complete")
@@ -115,6 +116,14 @@ def create_app() -> FastAPI:
             content={"detail": str(exc)}
         )
     
+    @app.exception_handler(PipelineQueueFull)
+    async def queue_full_handler(request: Request, exc: PipelineQueueFull):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc), "retry_after_s": exc.retry_after_s},
+            headers={"Retry-After": str(exc.retry_after_s)},
+        )
+
     @app.exception_handler(Exception)
     async def general_exception_handler(request: Request, exc: Exception):
         logger.error(f"Unhandled exception: {exc}", exc_info=True)
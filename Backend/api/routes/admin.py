@@ -6,12 +6,15 @@ from pydantic import BaseModel, EmailStr
 from sqlalchemy import select, func, or_, desc, asc
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, aliased
+import json
 import bcrypt
 import jwt
 
 from Backend.database.connection import get_db
-from Backend.database.models import Department, Member, Issue, Escalation, Classification, IssueEvent, IssueImage
+from Backend.database.models import Department, Member, Issue, Escalation, Classification, IssueEvent, IssueImage, EventDeadLetterRecord, EventHandlerStatsRecord
 from Backend.core.config import settings
+from Backend.core.events import Event
+from Backend.core.flow_archive import latency_report
 from Backend.core.logging import get_logger
 from Backend.core.schemas import IssueResponse, IssueState
 from Backend.utils.storage import get_upload_url
@@ -1158,3 +1161,109 @@ async def review_issue(
 
     else:
         raise HTTPException(status_code=400, detail="Invalid status. Use 'approved' or 'rejected'.")
+
+
+# Handler stats and dead letters are reported to shared tables by every
+# process's event bus; redelivery is queued there for any process that has
+# the handler.
+@router.get("/events/handlers")
+async def get_event_handler_stats(
+    current_user: Member = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.event_report_interval_s * 3)
+    result = await db.execute(
+        select(EventHandlerStatsRecord)
+        .where(EventHandlerStatsRecord.updated_at >= cutoff)
+        .order_by(EventHandlerStatsRecord.node, EventHandlerStatsRecord.event_type, EventHandlerStatsRecord.handler)
+    )
+    return {
+        "handlers": [
+            {"node": record.node, **json.loads(record.stats), "reported_at": record.updated_at.isoformat()}
+            for record in result.scalars()
+        ]
+    }
+
+
+def dead_letter_to_dict(record: EventDeadLetterRecord) -> dict:
+    return {
+        "id": str(record.id),
+        "event_type": record.event_type,
+        "issue_id": str(record.issue_id),
+        "handler": record.handler,
+        "node": record.node,
+        "error": record.error,
+        "attempts": record.attempts,
+        "failed_at": record.failed_at.isoformat(),
+        "redeliver_requested_at": record.redeliver_requested_at.isoformat() if record.redeliver_requested_at else None,
+        "event": Event.decode(record.event).to_dict(),
+    }
+
+
+@router.get("/events/dead-letters")
+async def list_dead_letters(
+    limit: int = Query(50, ge=1, le=1000),
+    handler: Optional[str] = None,
+    current_user: Member = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    query = select(EventDeadLetterRecord)
+    count = select(func.count()).select_from(EventDeadLetterRecord)
+    if handler:
+        query = query.where(EventDeadLetterRecord.handler == handler)
+        count = count.where(EventDeadLetterRecord.handler == handler)
+    result = await db.execute(query.order_by(EventDeadLetterRecord.failed_at.desc()).limit(limit))
+    return {
+        "stored": (await db.execute(count)).scalar() or 0,
+        "items": [dead_letter_to_dict(record) for record in result.scalars()],
+    }
+
+
+@router.post("/events/dead-letters/{entry_id}/redeliver", status_code=status.HTTP_202_ACCEPTED)
+async def redeliver_dead_letter(
+    entry_id: UUID,
+    current_user: Member = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    record = await db.get(EventDeadLetterRecord, entry_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    record.redeliver_requested_at = datetime.utcnow()
+    await db.commit()
+    return {"status": "queued", "dead_letter": dead_letter_to_dict(record)}
+
+
+@router.delete("/events/dead-letters/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def discard_dead_letter(
+    entry_id: UUID,
+    current_user: Member = Depends(get_current_admin),
+    db: AsyncSession = Depends(get_db),
+):
+    record = await db.get(EventDeadLetterRecord, entry_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Dead letter not found")
+    await db.delete(record)
+    await db.commit()
+
+
+@router.get("/analytics/latency")
+async def get_agent_latency(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    group_by: list[str] = Query([]),
+    agent: Optional[str] = None,
+    city: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Member = Depends(get_current_admin),
+):
+    unknown = set(group_by) - {"hour", "city"}
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid group_by: {', '.join(sorted(unknown))}. Use 'hour' and/or 'city'.")
+    
+    until = datetime.utcnow()
+    since = (until - timedelta(hours=hours)).replace(minute=0, second=0, microsecond=0)
+    return {
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "group_by": ["agent", *group_by],
+        "latency": await latency_report(db, since, until, group_by, agent, city),
+    }
@@ -3,64 +3,110 @@ import json
 from dataclasses import asdict
 from typing import Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from Backend.core.config import settings
 from Backend.database.connection import get_db
 from Backend.database.models import Issue, IssueEvent
-from Backend.core.flow_tracker import get_flow_tracker, _active_flows
+from Backend.core.flow_tracker import FlowMessage, FlowTracker, FlowWatcher, get_flow_tracker, load_flow_tracker, sse_frame, _active_flows
+from Backend.orchestration.admission import pipeline_admission
 
 router = APIRouter()
 
 
-async def event_generator(issue_id: UUID, timeout: int = 300):
-    tracker = get_flow_tracker(issue_id)
+def snapshot_frame(tracker: FlowTracker) -> bytes:
+    return sse_frame(json.dumps({
+        "type": "connected",
+        "issue_id": str(tracker.flow.issue_id),
+        "message": "Connected to agent flow stream",
+        "current_steps": [asdict(s) for s in tracker.flow.steps]
+    }, default=str))
+
+
+async def event_generator(issue_id: UUID, last_event_id: Optional[int] = None, timeout: int = 300):
+    tracker = await load_flow_tracker(issue_id)
     
     if not tracker:
-        yield f"data: {json.dumps({'type': 'error', 'message': 'No active flow for this issue'})}\n\n"
+        yield sse_frame(json.dumps({'type': 'error', 'message': 'No active flow for this issue'}))
         return
     
     queue = tracker.subscribe()
     
     try:
-        start_msg = {
-            "type": "connected",
-            "issue_id": str(issue_id),
-            "message": "Connected to agent flow stream",
-            "current_steps": [asdict(s) for s in tracker.flow.steps]
-        }
-        yield f"data: {json.dumps(start_msg)}\n\n"
-        
-        
-        
-        
-        
+        missed = tracker.history_since(last_event_id) if last_event_id is not None else None
         
+        sent = last_event_id or 0
+        if missed is None:
+            finished = tracker.finished
+            replay = tracker.history_since(0)
+            sent = 0 if replay else tracker.last_seq
+            yield snapshot_frame(tracker)
+            
+            if finished:
+                final = {'type': 'flow_' + tracker.flow.status, 'data': tracker.flow.to_dict()}
+                yield sse_frame(json.dumps(final, default=str), tracker.last_seq)
+                return
+            missed = replay or []
         
-        
-        if tracker.flow.status in ["completed", "error"]:
-             yield f"data: {json.dumps({'type': 'flow_' + tracker.flow.status, 'data': tracker.flow.to_dict()})}\n\n"
-             return
+        for message in missed:
+            yield message.frame
+            sent = message.seq
+            if message.type in ["flow_completed", "flow_error"]:
+                return
 
+        # Until a worker picks the pipeline up, the stream reports its place
+        # in the queue instead of sitting silent; these frames carry no id.
+        waiting, seen, position, idle = True, False, None, 0.0
         while True:
+            wait_s = settings.pipeline_queue_poll_s if waiting else 30
             try:
-                message = await asyncio.wait_for(queue.get(), timeout=30)
-                yield f"data: {json.dumps(message)}\n\n"
-                
-                if message.get("type") in ["flow_completed", "flow_error"]:
-                    break
+                message = await asyncio.wait_for(queue.get(), timeout=wait_s)
             except asyncio.TimeoutError:
-                yield f"data: {json.dumps({'type': 'heartbeat'})}\n\n"
+                idle += wait_s
+                if waiting:
+                    current = await pipeline_admission.position(issue_id)
+                    if current is not None and current != position:
+                        yield sse_frame(json.dumps({'type': 'queued', **current}))
+                    seen = seen or current is not None
+                    waiting = not (seen and current is None)
+                    position = current
+                if idle >= 30:
+                    idle = 0.0
+                    yield sse_frame(json.dumps({'type': 'heartbeat'}))
+                continue
+            
+            waiting, idle = False, 0.0
+
+            if message.seq <= sent:
+                continue
+            batch = [message]
+            if message.seq > sent + 1:
+                catch_up = tracker.history_since(sent)
+                if catch_up is None:
+                    yield snapshot_frame(tracker)
+                else:
+                    batch = catch_up
+            
+            for message in batch:
+                yield message.frame
+                sent = message.seq
+                if message.type in ["flow_completed", "flow_error"]:
+                    return
     finally:
         tracker.unsubscribe(queue)
 
 
 @router.get("/flow/{issue_id}")
-async def stream_agent_flow(issue_id: UUID):
+async def stream_agent_flow(
+    issue_id: UUID,
+    last_event_id: Optional[int] = Query(None, ge=0),
+    last_event_id_header: Optional[int] = Header(None, alias="Last-Event-ID"),
+):
     return StreamingResponse(
-        event_generator(issue_id),
+        event_generator(issue_id, last_event_id_header if last_event_id_header is not None else last_event_id),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -70,6 +116,127 @@ async def stream_agent_flow(issue_id: UUID):
     )
 
 
+def ws_message(issue_id: UUID, message: FlowMessage) -> str:
+    # The payload is already JSON, so it is spliced in rather than re-encoded.
+    return f'{{"op":"msg","i":"{issue_id}","s":{message.seq},"m":{message.payload}}}'
+
+
+def ws_snapshot(tracker: FlowTracker) -> str:
+    return json.dumps({
+        "op": "snapshot",
+        "i": str(tracker.flow.issue_id),
+        "s": tracker.last_seq,
+        "flow": tracker.flow.to_dict(),
+    }, default=str)
+
+
+async def send_watched(websocket: WebSocket, watcher: FlowWatcher) -> None:
+    while True:
+        try:
+            issue_id, message = await asyncio.wait_for(watcher.queue.get(), timeout=30)
+        except asyncio.TimeoutError:
+            await websocket.send_text('{"op":"ping"}')
+            continue
+        
+        tracker = get_flow_tracker(issue_id)
+        last = watcher.sent.get(issue_id)
+        if message is None or (last is not None and message.seq > last + 1):
+            catch_up = tracker.history_since(last) if tracker and last is not None else None
+            if catch_up is None:
+                if tracker:
+                    await websocket.send_text(ws_snapshot(tracker))
+                    watcher.sent[issue_id] = tracker.last_seq
+                continue
+            batch = catch_up
+        elif last is not None and message.seq <= last:
+            continue
+        else:
+            batch = [message]
+        
+        for message in batch:
+            await websocket.send_text(ws_message(issue_id, message))
+            watcher.sent[issue_id] = message.seq
+
+
+def watch_targets(command: dict) -> tuple[list[str], list[tuple[UUID, Optional[int]]]]:
+    # Cities and (issue id, last seen seq) pairs named by a subscribe or
+    # unsubscribe command; ValueError says what is malformed.
+    cities = command.get("cities", [])
+    issues = command.get("issues", [])
+    last_seq = command.get("last_seq", {})
+    if not isinstance(cities, list) or not all(isinstance(city, str) for city in cities):
+        raise ValueError("cities must be a list of strings")
+    if not isinstance(issues, list) or not all(isinstance(raw_id, str) for raw_id in issues):
+        raise ValueError("issues must be a list of issue ids")
+    if not isinstance(last_seq, dict):
+        raise ValueError("last_seq must map issue ids to sequence numbers")
+    
+    targets = []
+    for raw_id in issues:
+        try:
+            issue_id = UUID(raw_id)
+        except ValueError:
+            raise ValueError(f"Invalid issue id: {raw_id}")
+        seq = last_seq.get(raw_id)
+        if seq is not None and (not isinstance(seq, int) or isinstance(seq, bool)):
+            raise ValueError(f"Invalid last_seq for {raw_id}")
+        targets.append((issue_id, seq))
+    return cities, targets
+
+
+def ws_error(message: str) -> str:
+    return json.dumps({"op": "error", "message": message})
+
+
+@router.websocket("/ws")
+async def watch_flows(websocket: WebSocket):
+    await websocket.accept()
+    watcher = FlowWatcher()
+    sender = asyncio.create_task(send_watched(websocket, watcher))
+    
+    try:
+        while True:
+            try:
+                command = json.loads(await websocket.receive_text())
+            except ValueError:
+                command = None
+            if not isinstance(command, dict):
+                await websocket.send_text(ws_error("Commands must be JSON objects"))
+                continue
+            
+            op = command.get("op")
+            if op in ("subscribe", "unsubscribe"):
+                try:
+                    cities, targets = watch_targets(command)
+                except ValueError as e:
+                    await websocket.send_text(ws_error(str(e)))
+                    continue
+            
+            if op == "subscribe":
+                for city in cities:
+                    watcher.watch_city(city)
+                for issue_id, last_seq in targets:
+                    watcher.watch_issue(issue_id)
+                    tracker = await load_flow_tracker(issue_id)
+                    if tracker:
+                        watcher.resume(tracker, last_seq)
+            elif op == "unsubscribe":
+                for city in cities:
+                    watcher.unwatch_city(city)
+                for issue_id, _ in targets:
+                    watcher.unwatch_issue(issue_id)
+            elif op == "ping":
+                await websocket.send_text('{"op":"pong"}')
+            else:
+                await websocket.send_text(ws_error(f"Unknown op: {op}"))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watcher.close()
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+
+
 @router.get("/flow/active")
 async def list_active_flows():
     return {
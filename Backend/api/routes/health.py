@@ -1,7 +1,14 @@
 from fastapi import APIRouter
 from sqlalchemy import text
 
+from Backend.core.events import event_bus
+from Backend.core.flow_archive import flow_archive
+from Backend.core.flow_store import flow_store
+from Backend.core.flow_tracker import _active_flows
 from Backend.database.connection import async_session_factory
+from Backend.core.degraded import degraded_mode
+from Backend.orchestration.admission import pipeline_admission
+from Backend.orchestration.jobs import queue_stats
 
 router = APIRouter()
 
@@ -19,3 +26,35 @@ async def db_health_check():
         return {"status": "healthy", "database": "connected"}
     except Exception as e:
         return {"status": "unhealthy", "database": "disconnected", "error": str(e)}
+
+
+@router.get("/health/events")
+async def event_bus_health_check():
+    stats = event_bus.stats()
+    saturated = stats["depth"] >= stats["capacity"]
+    return {"status": "saturated" if saturated else "healthy", "event_bus": stats}
+
+
+@router.get("/health/pipelines")
+async def pipeline_health_check():
+    async with async_session_factory() as session:
+        stats = await queue_stats(session)
+    admission = pipeline_admission.stats()
+    saturated = stats.get("queued", 0) >= admission["max_queued"]
+    # This process's view: the backlog is re-read here, but LLM latency is
+    # only observed by the workers that call Gemini.
+    await degraded_mode.is_active()
+    degraded = {**degraded_mode.stats(), "scope": "api_process"}
+    status = "saturated" if saturated else "degraded" if degraded["active"] else "healthy"
+    return {"status": status, "pipelines": stats, "admission": admission, "degraded": degraded}
+
+
+@router.get("/health/flows")
+async def flow_health_check():
+    return {
+        "status": "healthy",
+        "tracked": len(_active_flows),
+        "mirrored": sum(1 for tracker in _active_flows.values() if tracker.remote),
+        "store": flow_store.stats(),
+        "archive": flow_archive.stats(),
+    }
@@ -1,31 +1,38 @@
 from typing import Optional
 from uuid import UUID
 from pydantic import BaseModel
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status, BackgroundTasks
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from Backend.core.schemas import IssueCreate, IssueResponse, IssueListResponse, IssueState
-from Backend.core.flow_tracker import create_flow_tracker, remove_flow_tracker
-from Backend.database.connection import get_db, get_db_context
+from Backend.core.flow_store import flow_store
+from Backend.core.flow_tracker import create_flow_tracker, hand_off_flow_tracker
+from Backend.database.connection import get_db
 from Backend.database.models import Issue, Classification
 from Backend.services.ingestion import IngestionService
-from Backend.agents import (
-    VisionAgent, 
-    GeoDeduplicateAgent, 
-    PriorityAgent, 
-    RoutingAgent,
-    NotificationAgent,
-)
+from Backend.orchestration.admission import pipeline_admission
+from Backend.orchestration.checkpoints import clear_checkpoints
+from Backend.orchestration.jobs import encode_inputs, enqueue_pipeline, latest_job
+from Backend.utils.fuzzy_match import keyword_priority
 from Backend.utils.storage import get_upload_url
 from Backend.core.auth import get_user_id_from_form_token
+from Backend.core.idempotency import run_idempotent
 from Backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 router = APIRouter()
 
+PIPELINE_CACHE_HEADER = "X-Pipeline-Cache"
+
+
+def pipeline_inputs(issue: Issue, image_paths: list[str]) -> dict:
+    # Built from what is stored on the issue, so /process can tell whether
+    # a later run would see the same inputs as the one already queued.
+    return {"image_paths": sorted(image_paths), "description": issue.description}
+
 
 def issue_to_response(issue: Issue) -> IssueResponse:
     image_urls = []
@@ -71,126 +78,9 @@ async def get_issue_with_relations(db: AsyncSession, issue_id: UUID) -> Issue |
     return result.scalar_one_or_none()
 
 
-async def run_agent_pipeline(db: AsyncSession, issue_id: UUID, image_paths: list[str], description: Optional[str]):
-    tracker = create_flow_tracker(issue_id)
-    
-    try:
-        await tracker.start_step("VisionAgent")
-        vision = VisionAgent(db)
-        vision_result = await vision.process_issue(issue_id, image_paths, description)
-        
-        detection_count = len(vision_result.detections)
-        
-        if detection_count == 0:
-            await tracker.complete_step(
-                "VisionAgent",
-                decision="No issues detected",
-                reasoning="0 detections - requires manual confirmation",
-                result={
-                    "detections": 0,
-                    "needs_confirmation": True,
-                    "annotated_urls": vision_result.annotated_urls,
-                }
-            )
-            
-            issue = await db.get(Issue, issue_id)
-            if issue:
-                issue.state = "pending_confirmation"
-                issue.validation_source = "pending_manual"
-                issue.validation_reason = "No issues detected by AI - awaiting user confirmation"
-                await db.flush()
-            
-            final_result = {
-                "issue_id": str(issue_id),
-                "state": "pending_confirmation",
-                "needs_confirmation": True,
-                "detections": 0,
-                "message": "No issues detected. Please confirm if you want to submit for manual review.",
-            }
-            await tracker.complete_flow(final_result)
-            return
-        
-        await tracker.complete_step(
-            "VisionAgent",
-            decision=f"Detected: {vision_result.primary_category.value if vision_result.primary_category else 'Unknown'}",
-            reasoning=f"Confidence: {vision_result.primary_confidence:.2%}, {detection_count} detections",
-            result=vision_result.model_dump(mode='json')
-        )
-        
-        await tracker.start_step("GeoDeduplicateAgent")
-        geo = GeoDeduplicateAgent(db)
-        geo_result = await geo.process_issue(issue_id)
-        await tracker.complete_step(
-            "GeoDeduplicateAgent",
-            decision=f"Status: {geo_result.get('geo_status', 'unknown')}",
-            reasoning=f"Nearby issues: {geo_result.get('nearby_count', 0)}",
-            result=geo_result
-        )
-        
-        if not geo_result.get("is_duplicate"):
-            await tracker.start_step("PriorityAgent")
-            priority = PriorityAgent(db)
-            priority_result = await priority.process_issue(issue_id)
-            await tracker.complete_step(
-                "PriorityAgent",
-                decision=f"Priority: {priority_result.get('priority', 'N/A')}",
-                reasoning=priority_result.get("reasoning", ""),
-                result=priority_result
-            )
-            
-            await tracker.start_step("RoutingAgent")
-            routing = RoutingAgent(db)
-            routing_result = await routing.process_issue(issue_id)
-            await tracker.complete_step(
-                "RoutingAgent",
-                decision=f"Routed to: {routing_result.get('department', 'N/A')}",
-                reasoning=f"Assigned: {routing_result.get('member', 'N/A')}, SLA: {routing_result.get('sla_hours', 0)}h",
-                result=routing_result
-            )
-            
-            await tracker.start_step("NotificationAgent")
-            notification = NotificationAgent(db)
-            await notification.notify_assignment(issue_id)
-            await tracker.complete_step(
-                "NotificationAgent",
-                decision="Notifications queued",
-                reasoning="Assignment notification sent to assigned member",
-                result={"queued": True}
-            )
-        else:
-            await tracker.complete_step(
-                "GeoDeduplicateAgent",
-                decision="Marked as duplicate",
-                reasoning=f"Linked to parent: {geo_result.get('parent_issue_id')}",
-                result=geo_result
-            )
-        
-        issue = await get_issue_with_relations(db, issue_id)
-        final_result = {
-            "issue_id": str(issue_id),
-            "state": issue.state if issue else "unknown",
-            "priority": issue.priority if issue else None,
-            "is_duplicate": issue.is_duplicate if issue else False,
-        }
-        await tracker.complete_flow(final_result)
-        
-    except Exception as e:
-        await tracker.error_flow(str(e))
-        raise
-    finally:
-        remove_flow_tracker(issue_id)
-
-
-
-async def run_agent_pipeline_background(issue_id: UUID, image_paths: list[str], description: Optional[str]):
-    async with get_db_context() as session:
-        await run_agent_pipeline(session, issue_id, image_paths, description)
-
-
 @router.post("", response_model=IssueResponse, status_code=status.HTTP_201_CREATED)
 
 async def create_issue(
-    background_tasks: BackgroundTasks,
     images: list[UploadFile] = File(...),
     description: Optional[str] = Form(None),
     latitude: float = Form(...),
@@ -199,10 +89,31 @@ async def create_issue(
     platform: str = Form(...),
     device_model: Optional[str] = Form(None),
     authorization: Optional[str] = Form(None),
+    idempotency_key_field: Optional[str] = Form(None, alias="idempotency_key"),
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
     user_id = get_user_id_from_form_token(authorization)
     
+    return await run_idempotent(
+        f"POST /issues:{user_id or ''}",
+        idempotency_key or idempotency_key_field,
+        status.HTTP_201_CREATED,
+        lambda: submit_issue(images, description, latitude, longitude, accuracy_meters, platform, device_model, user_id, db),
+    )
+
+
+async def submit_issue(
+    images: list[UploadFile],
+    description: Optional[str],
+    latitude: float,
+    longitude: float,
+    accuracy_meters: Optional[float],
+    platform: str,
+    device_model: Optional[str],
+    user_id: Optional[str],
+    db: AsyncSession,
+) -> IssueResponse:
     data = IssueCreate(
 
         description=description,
@@ -213,11 +124,13 @@ async def create_issue(
         device_model=device_model,
     )
     
+    await pipeline_admission.admit(db)
+    priority = keyword_priority(data.description)
     ingestion = IngestionService(db)
-    issue, image_paths = await ingestion.create_issue(data, images, user_id)
+    issue, image_paths = await ingestion.create_issue(data, images, user_id, priority=priority)
     
     
-    tracker = create_flow_tracker(issue.id)
+    tracker = await create_flow_tracker(issue.id, city=issue.city)
     
     await tracker.start_step("LocationStep")
     await tracker.complete_step(
@@ -236,7 +149,12 @@ async def create_issue(
     )
     
     
-    background_tasks.add_task(run_agent_pipeline_background, issue.id, image_paths, data.description)
+    # The worker numbers its flow messages on from the stored last_seq, so
+    # ours must be stored before it can claim the job.
+    await flow_store.flush()
+    enqueue_pipeline(db, issue.id, "issue", priority, **pipeline_inputs(issue, image_paths))
+    await db.commit()
+    hand_off_flow_tracker(issue.id)
 
     
     issue = await get_issue_with_relations(db, issue.id)
@@ -244,70 +162,6 @@ async def create_issue(
     return issue_to_response(issue)
 
 
-async def run_remaining_pipeline(db: AsyncSession, issue_id: UUID):
-    tracker = create_flow_tracker(issue_id)
-    try:
-        await tracker.start_step("GeoDeduplicateAgent")
-        geo = GeoDeduplicateAgent(db)
-        geo_result = await geo.process_issue(issue_id)
-        await tracker.complete_step(
-            "GeoDeduplicateAgent",
-            decision=f"Status: {geo_result.get('geo_status', 'unknown')}",
-            reasoning=f"Nearby issues: {geo_result.get('nearby_count', 0)}",
-            result=geo_result
-        )
-        
-        if not geo_result.get("is_duplicate"):
-            await tracker.start_step("PriorityAgent")
-            priority = PriorityAgent(db)
-            priority_result = await priority.process_issue(issue_id)
-            await tracker.complete_step(
-                "PriorityAgent",
-                decision=f"Priority: {priority_result.get('priority', 'N/A')}",
-                reasoning=priority_result.get("reasoning", ""),
-                result=priority_result
-            )
-            
-            
-            
-            
-            
-            
-            
-            await tracker.start_step("RoutingAgent")
-            await tracker.complete_step(
-                "RoutingAgent",
-                decision="Manual Review Requested",
-                reasoning="Skipped automatic routing due to 0 detections/manual confirmation. Sent to triage queue.",
-                result={"skipped": True, "queue": "manual_triage"}
-            )
-            
-            
-            
-        else:
-            await tracker.complete_step(
-                "GeoDeduplicateAgent",
-                decision="Marked as duplicate",
-                reasoning=f"Linked to parent: {geo_result.get('parent_issue_id')}",
-                result=geo_result
-            )
-        
-        issue = await get_issue_with_relations(db, issue_id)
-        final_result = {
-            "issue_id": str(issue_id),
-            "state": issue.state if issue else "unknown",
-            "priority": issue.priority if issue else None,
-            "is_duplicate": issue.is_duplicate if issue else False,
-        }
-        await tracker.complete_flow(final_result)
-        
-    except Exception as e:
-        await tracker.error_flow(str(e))
-        raise
-    finally:
-        remove_flow_tracker(issue_id)
-
-
 class ConfirmationBody(BaseModel):
     confirmed: bool
 
@@ -316,7 +170,6 @@ class ConfirmationBody(BaseModel):
 async def confirm_issue(
     issue_id: UUID,
     body: ConfirmationBody,
-    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     issue = await get_issue_with_relations(db, issue_id)
@@ -324,6 +177,7 @@ async def confirm_issue(
         raise HTTPException(status_code=404, detail="Issue not found")
         
     if body.confirmed:
+        await pipeline_admission.admit(db)
         issue.state = IssueState.REPORTED
         issue.validation_reason = "Manual confirmation by user (0 detections)"
         await db.flush()
@@ -331,8 +185,8 @@ async def confirm_issue(
         
         issue = await get_issue_with_relations(db, issue_id)
         
-        
-        background_tasks.add_task(pipeline_wrapper_resume, issue_id)
+        enqueue_pipeline(db, issue_id, "confirmed", keyword_priority(issue.description))
+        await db.commit()
         
         return issue_to_response(issue)
     else:
@@ -347,25 +201,8 @@ async def confirm_issue(
         return issue_to_response(issue)
 
 
-from Backend.database.connection import get_db_context
-
-async def pipeline_wrapper(issue_id: UUID, image_paths: list[str], description: Optional[str]):
-    try:
-        async with get_db_context() as db:
-            await run_agent_pipeline(db, issue_id, image_paths, description)
-    except Exception:
-        pass
-
-async def pipeline_wrapper_resume(issue_id: UUID):
-    try:
-        async with get_db_context() as db:
-            await run_remaining_pipeline(db, issue_id)
-    except Exception:
-        pass
-
 @router.post("/stream", status_code=status.HTTP_201_CREATED)
 async def create_issue_with_stream(
-    background_tasks: BackgroundTasks,
     images: list[UploadFile] = File(...),
     description: Optional[str] = Form(None),
     latitude: float = Form(...),
@@ -374,11 +211,32 @@ async def create_issue_with_stream(
     platform: str = Form(...),
     device_model: Optional[str] = Form(None),
     authorization: Optional[str] = Form(None),
+    idempotency_key_field: Optional[str] = Form(None, alias="idempotency_key"),
+    idempotency_key: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
 ):
     user_id = get_user_id_from_form_token(authorization)
     logger.info(f"[/stream] Creating issue - user_id: {user_id}, authorization_present: {bool(authorization)}")
     
+    return await run_idempotent(
+        f"POST /issues/stream:{user_id or ''}",
+        idempotency_key or idempotency_key_field,
+        status.HTTP_201_CREATED,
+        lambda: submit_issue_with_stream(images, description, latitude, longitude, accuracy_meters, platform, device_model, user_id, db),
+    )
+
+
+async def submit_issue_with_stream(
+    images: list[UploadFile],
+    description: Optional[str],
+    latitude: float,
+    longitude: float,
+    accuracy_meters: Optional[float],
+    platform: str,
+    device_model: Optional[str],
+    user_id: Optional[str],
+    db: AsyncSession,
+) -> dict:
     data = IssueCreate(
         description=description,
         latitude=latitude,
@@ -388,29 +246,34 @@ async def create_issue_with_stream(
         device_model=device_model,
     )
     
+    await pipeline_admission.admit(db)
+    priority = keyword_priority(data.description)
     ingestion = IngestionService(db)
-    issue, image_paths = await ingestion.create_issue(data, images, user_id)
+    issue, image_paths = await ingestion.create_issue(data, images, user_id, priority=priority)
     logger.info(f"[/stream] Issue created: {issue.id} with user_id: {issue.user_id}")
     
     
-    await db.commit()
-    
-    
-    tracker = create_flow_tracker(issue.id)
+    tracker = await create_flow_tracker(issue.id, city=issue.city)
     
     
-    background_tasks.add_task(pipeline_wrapper, issue.id, image_paths, data.description)
+    await flow_store.flush()
+    enqueue_pipeline(db, issue.id, "issue", priority, **pipeline_inputs(issue, image_paths))
+    await db.commit()
+    hand_off_flow_tracker(issue.id)
     
     return {
         "issue_id": str(issue.id),
         "stream_url": f"/flow/flow/{issue.id}",
-        "message": "Issue created. Pipeline started in background.",
+        "message": "Issue created. Pipeline queued.",
+        "pipeline_status": "queued",
     }
 
 
-@router.post("/{issue_id}/process")
+@router.post("/{issue_id}/process", response_model=IssueResponse, status_code=status.HTTP_202_ACCEPTED)
 async def process_issue_pipeline(
     issue_id: UUID,
+    response: Response,
+    fresh: bool = Query(False, description="Discard checkpoints and re-run every step"),
     db: AsyncSession = Depends(get_db),
 ):
     issue = await get_issue_with_relations(db, issue_id)
@@ -418,10 +281,27 @@ async def process_issue_pipeline(
         raise HTTPException(status_code=404, detail="Issue not found")
     
     image_paths = [img.file_path for img in issue.images]
+    inputs = encode_inputs(**pipeline_inputs(issue, image_paths))
+    
+    # Same images and description as the last run: its outcome still stands,
+    # or it is still on its way.
+    previous = await latest_job(db, issue_id, "issue")
+    if previous and previous.inputs == inputs and not fresh:
+        if previous.status == "done":
+            response.status_code = status.HTTP_200_OK
+            response.headers[PIPELINE_CACHE_HEADER] = "hit"
+            return issue_to_response(issue)
+        if previous.status in ("queued", "running"):
+            response.headers[PIPELINE_CACHE_HEADER] = "pending"
+            return issue_to_response(issue)
+    
+    await pipeline_admission.admit(db)
+    if fresh or (previous and previous.inputs != inputs):
+        await clear_checkpoints(db, issue_id)
+    enqueue_pipeline(db, issue_id, "issue", issue.priority or 3, **pipeline_inputs(issue, image_paths))
+    await db.commit()
     
-    await run_agent_pipeline(db, issue_id, image_paths, issue.description)
-    
-    issue = await get_issue_with_relations(db, issue_id)
+    response.headers[PIPELINE_CACHE_HEADER] = "miss"
     return issue_to_response(issue)
 
 
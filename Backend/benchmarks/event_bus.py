@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+import time
+from collections import defaultdict
+from uuid import uuid4
+
+from Backend.core.events import EventBus, IssueClassified
+
+
+async def run(shards: int, issues: int, events_per_issue: int, handler_ms: float) -> tuple[float, bool]:
+    bus = EventBus.create(shards=shards)
+    seen: dict = defaultdict(list)
+    
+    async def slow_handler(event: IssueClassified) -> None:
+        await asyncio.sleep(handler_ms / 1000)
+        seen[event.issue_id].append(event.detections_count)
+    
+    bus.subscribe(IssueClassified, slow_handler)
+    await bus.start()
+    
+    issue_ids = [uuid4() for _ in range(issues)]
+    start = time.perf_counter()
+    for seq in range(events_per_issue):
+        for issue_id in issue_ids:
+            await bus.publish(IssueClassified(
+                issue_id=issue_id,
+                category="Pothole Issues",
+                confidence=0.9,
+                detections_count=seq,
+            ))
+    await bus.join()
+    elapsed = time.perf_counter() - start
+    await bus.stop()
+    
+    ordered = all(seq == list(range(events_per_issue)) for seq in seen.values())
+    return issues * events_per_issue / elapsed, ordered
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="EventBus throughput vs shard count")
+    parser.add_argument("--issues", type=int, default=64)
+    parser.add_argument("--events-per-issue", type=int, default=4)
+    parser.add_argument("--handler-ms", type=float, default=5.0)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+    
+    print(f"{'shards':>6} {'events/s':>10} {'speedup':>8} {'ordered':>8}")
+    baseline = None
+    for shards in args.shards:
+        throughput, ordered = await run(shards, args.issues, args.events_per_issue, args.handler_ms)
+        baseline = baseline or throughput
+        print(f"{shards:>6} {throughput:>10.1f} {throughput / baseline:>7.2f}x {str(ordered):>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
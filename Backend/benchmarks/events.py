@@ -0,0 +1,81 @@
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field
+
+from Backend.core.events import Event, IssueClassified
+
+
+class PydanticEvent(BaseModel):
+    event_id: UUID = Field(default_factory=uuid4)
+    issue_id: UUID
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    metadata: dict[str, Any] = Field(default_factory=dict)
+
+
+class PydanticIssueClassified(PydanticEvent):
+    category: str
+    confidence: float
+    detections_count: int
+
+
+def timed(fn: Callable[[], Any], n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n * 1e6
+
+
+def allocated(fn: Callable[[], Any], n: int) -> float:
+    tracemalloc.start()
+    kept = [fn() for _ in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Event allocation and codec cost, Pydantic vs msgspec Struct")
+    parser.add_argument("-n", type=int, default=50000)
+    args = parser.parse_args()
+    n = args.n
+
+    issue_id = uuid4()
+    fields = {"issue_id": issue_id, "category": "Pothole Issues", "confidence": 0.92, "detections_count": 3}
+
+    legacy = PydanticIssueClassified(**fields)
+    legacy_json = legacy.model_dump_json()
+    event = IssueClassified(**fields)
+    event_json = event.encode()
+    event_bytes = event.to_bytes()
+
+    rows = [
+        ("create", lambda: PydanticIssueClassified(**fields), lambda: IssueClassified(**fields)),
+        ("encode json", legacy.model_dump_json, event.encode),
+        ("decode json", lambda: PydanticIssueClassified.model_validate_json(legacy_json), lambda: Event.decode(event_json)),
+        ("encode binary", None, event.to_bytes),
+        ("decode binary", None, lambda: Event.from_bytes(event_bytes)),
+    ]
+
+    print(f"{'operation':<14} {'pydantic us':>12} {'struct us':>11} {'speedup':>8}")
+    for name, old, new in rows:
+        new_us = timed(new, n)
+        if old is None:
+            print(f"{name:<14} {'-':>12} {new_us:>11.2f} {'-':>8}")
+            continue
+        old_us = timed(old, n)
+        print(f"{name:<14} {old_us:>12.2f} {new_us:>11.2f} {old_us / new_us:>7.2f}x")
+
+    old_bytes = allocated(lambda: PydanticIssueClassified(**fields), n // 10)
+    new_bytes = allocated(lambda: IssueClassified(**fields), n // 10)
+    print(f"{'bytes/event':<14} {old_bytes:>12.0f} {new_bytes:>11.0f} {old_bytes / new_bytes:>7.2f}x")
+    print(f"{'wire size':<14} {len(legacy_json):>12} {len(event_json):>11} json, {len(event_bytes)} binary")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from Backend.agents.vision.inference import decode_image
+from Backend.core.config import settings
+
+
+def synthetic_photo(width: int, height: int) -> bytes:
+    # Smooth gradients plus sensor-like noise compress roughly like a phone
+    # photo, unlike pure noise or flat colour.
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    base = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1)
+    noisy = base + rng.normal(0, 8, base.shape).astype(np.float32)
+    return cv2.imencode('.jpg', np.clip(noisy, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 92])[1].tobytes()
+
+
+def to_model_input(pixels: np.ndarray, imgsz: int) -> np.ndarray:
+    # The resize half of ultralytics' letterbox, which both paths pay.
+    scale = imgsz / max(pixels.shape[:2])
+    return cv2.resize(pixels, (round(pixels.shape[1] * scale), round(pixels.shape[0] * scale)), interpolation=cv2.INTER_LINEAR)
+
+
+def measure(fn: Callable[[], np.ndarray], n: int) -> tuple[float, float, float]:
+    fn()
+    timings = []
+    for _ in range(n):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), max(timings), peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full vs DCT-reduced JPEG decode: latency and peak memory")
+    parser.add_argument("--image", type=Path, help="JPEG to decode; a synthetic photo when omitted")
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--imgsz", type=int, default=settings.model_input_size)
+    parser.add_argument("-n", type=int, default=20)
+    args = parser.parse_args()
+
+    data = args.image.read_bytes() if args.image else synthetic_photo(args.width, args.height)
+    rows = [
+        ("full decode", lambda: to_model_input(decode_image(data).pixels, args.imgsz), lambda: decode_image(data)),
+        ("reduced decode", lambda: to_model_input(decode_image(data, args.imgsz).pixels, args.imgsz),
+         lambda: decode_image(data, args.imgsz)),
+    ]
+
+    print(f"{len(data) / 2**20:.1f} MB JPEG, model input {args.imgsz}px")
+    print(f"{'path':<15} {'decoded':>11} {'p50 ms':>8} {'max ms':>8} {'peak MB':>8} {'speedup':>8}")
+    baseline = None
+    for name, pipeline, decode in rows:
+        p50, worst, peak = measure(pipeline, args.n)
+        decoded = decode()
+        baseline = baseline or p50
+        h, w = decoded.pixels.shape[:2]
+        print(f"{name:<15} {f'{w}x{h}':>11} {p50:>8.1f} {worst:>8.1f} {peak:>8.1f} {baseline / p50:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from Backend.agents.vision.agent import VisionAgent
+from Backend.agents.vision.inference import BatchInferenceEngine, BatchStats
+from Backend.agents.vision.pool import InferenceProcessPool
+from Backend.core.config import settings
+
+
+def load_images(paths: list[Path], count: int, width: int, height: int) -> list[bytes]:
+    if paths:
+        files = [path.read_bytes() for path in paths]
+        return [files[i % len(files)] for i in range(count)]
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(count):
+        noise = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+        images.append(cv2.imencode('.jpg', noise)[1].tobytes())
+    return images
+
+
+async def run(images: list[bytes], max_batch: int, max_wait_ms: float, callers: int, pool: InferenceProcessPool = None) -> dict:
+    if pool:
+        analyse, concurrency = pool.analyse, pool.workers
+    else:
+        analyse, concurrency = VisionAgent.analyse_in_thread, 1
+    engine = BatchInferenceEngine(analyse, max_batch=max_batch, max_wait_ms=max_wait_ms, concurrency=concurrency)
+    await engine.infer(images[0])
+    engine.stats = BatchStats()
+
+    latencies: list[float] = []
+    pending = iter(images)
+
+    async def caller() -> None:
+        for image in pending:
+            start = time.perf_counter()
+            await engine.infer(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(caller() for _ in range(callers)))
+    elapsed = time.perf_counter() - start
+    await engine.stop()
+
+    latencies.sort()
+    return {
+        "images_per_s": len(images) / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        **engine.stats.to_dict(),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="YOLO throughput and latency vs micro-batch size, in a thread or an inference process pool")
+    parser.add_argument("--images", nargs="*", default=[], help="image files; random noise images when omitted")
+    parser.add_argument("--count", type=int, default=128)
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=960)
+    parser.add_argument("--callers", type=int, default=16, help="concurrent process_issue-style callers")
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--pool-workers", type=int, default=0, help="inference processes; 0 runs in a thread")
+    parser.add_argument("--pool-threads", type=int, default=0, help="torch threads per process; 0 = its cores")
+    args = parser.parse_args()
+
+    pool = None
+    if args.pool_workers:
+        pool = InferenceProcessPool(
+            settings.model_path,
+            workers=args.pool_workers,
+            threads=args.pool_threads,
+            conf=settings.model_confidence_threshold,
+            imgsz=settings.model_input_size,
+            backend=settings.vision_backend,
+            reduced_decode=settings.vision_reduced_decode,
+        )
+        await pool.start()
+    else:
+        VisionAgent.load_model()
+    images = load_images([Path(p) for p in args.images], args.count, args.width, args.height)
+
+    print(f"{'batch':>5} {'images/s':>9} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8} {'mean batch':>10} {'predict ms':>10}")
+    baseline = None
+    for max_batch in args.batch_sizes:
+        row = await run(images, max_batch, args.max_wait_ms, args.callers, pool)
+        baseline = baseline or row["images_per_s"]
+        print(
+            f"{max_batch:>5} {row['images_per_s']:>9.1f} {row['images_per_s'] / baseline:>7.2f}x "
+            f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['mean_batch']:>10.2f} {row['mean_predict_ms']:>10.1f}"
+        )
+    if pool:
+        pool.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -27,6 +27,14 @@ class Settings(BaseSettings):
     model_path: Path = Path("Backend/agents/vision/model.pt")
     model_confidence_threshold: float = 0.25
     model_input_size: int = 512
+    vision_backend: str = "torch"
+    vision_int8_max_map50_drop: float = 1.0
+    vision_image_concurrency: int = 3
+    vision_batch_max_size: int = 8
+    vision_batch_max_wait_ms: float = 10.0
+    vision_pool_workers: int = 0
+    vision_pool_threads: int = 0
+    vision_reduced_decode: bool = True
     
     local_temp_dir: Path = Path("static/temp")
     
@@ -44,6 +52,59 @@ class Settings(BaseSettings):
     
     duplicate_radius_meters: float = 50.0
     
+    idempotency_ttl_s: int = 3600
+    
+    priority_lane_weights: list[int] = [8, 4, 2, 1]
+    pipeline_concurrency: int = 8
+    pipeline_worker_poll_s: float = 1.0
+    pipeline_worker_grace_s: float = 30.0
+    pipeline_job_lease_s: int = 300
+    pipeline_job_max_attempts: int = 3
+    pipeline_retry_backoff_s: float = 5.0
+    pipeline_max_in_flight: int = 16
+    pipeline_max_queued: int = 500
+    pipeline_queue_poll_s: float = 2.0
+    pipeline_retry_after_s: int = 30
+    degraded_mode: str = "auto"
+    degraded_backlog_threshold: int = 100
+    degraded_llm_latency_ms: float = 8000.0
+    degraded_recheck_s: float = 60.0
+    degraded_duplicate_radius_meters: float = 20.0
+    degraded_reevaluate_batch: int = 20
+    pipeline_sweep_interval_s: int = 300
+    pipeline_sweep_after_s: int = 600
+    pipeline_sweep_max_resumes: int = 3
+    
+    event_bus_shards: int = 4
+    event_bus_capacity: int = 10000
+    event_bus_overflow: str = "block"
+    event_handler_timeout_s: float = 30.0
+    event_handler_retries: int = 2
+    event_handler_backoff_ms: int = 200
+    event_dead_letter_capacity: int = 1000
+    event_report_interval_s: float = 10.0
+    event_batch_max_size: int = 16
+    event_batch_max_wait_ms: int = 50
+    event_log_dir: Optional[Path] = Path("data/event_log")
+    event_log_fsync: bool = False
+    event_log_sync_ms: int = 50
+    event_transport: str = "local"
+    event_transport_dsn: Optional[str] = None
+    event_broker_path: Path = Path("data/event_broker.sock")
+    event_broker_max_buffer_bytes: int = 4 * 1024 * 1024
+    event_broker_drain_timeout_s: float = 5.0
+    
+    flow_history_max_messages: int = 256
+    flow_history_max_bytes: int = 512 * 1024
+    flow_idle_ttl_s: int = 900
+    flow_subscriber_queue_size: int = 64
+    flow_store: str = "postgres"
+    flow_retention_s: int = 3600
+    flow_store_flush_timeout_s: float = 5.0
+    flow_max_tracked: int = 2000
+    flow_archive_flush_interval_s: float = 30.0
+    flow_archive_max_pending: int = 5000
+    
     debug: bool = False
     
     resend_api_key: Optional[str] = None
@@ -67,6 +128,38 @@ class Settings(BaseSettings):
             raise ValueError("DATABASE_URL must be a PostgreSQL connection string")
         return v
     
+    @field_validator("event_bus_overflow")
+    @classmethod
+    def validate_event_bus_overflow(cls, v: str) -> str:
+        if v not in ("block", "drop", "reject"):
+            raise ValueError("EVENT_BUS_OVERFLOW must be one of: block, drop, reject")
+        return v
+    
+    @field_validator("event_transport")
+    @classmethod
+    def validate_event_transport(cls, v: str) -> str:
+        if v not in ("local", "postgres", "unix"):
+            raise ValueError("EVENT_TRANSPORT must be one of: local, postgres, unix")
+        return v
+    
+    @field_validator("flow_store")
+    @classmethod
+    def validate_flow_store(cls, v: str) -> str:
+        # Pipelines run in Backend.worker, so only a shared store lets the
+        # API stream their progress.
+        if v == "memory":
+            raise ValueError("FLOW_STORE=memory cannot stream progress from the pipeline worker; use postgres")
+        if v != "postgres":
+            raise ValueError("FLOW_STORE must be postgres")
+        return v
+    
+    @field_validator("event_log_dir", mode="before")
+    @classmethod
+    def validate_event_log_dir(cls, v):
+        if v in ("", None):
+            return None
+        return v
+    
     @field_validator("supabase_jwt_secret")
     @classmethod
     def validate_jwt_secret(cls, v: str) -> str:
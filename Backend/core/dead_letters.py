@@ -0,0 +1,76 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from Backend.core.events import Event
+
+
+@dataclass
+class DeadLetter:
+    id: int
+    event: "Event"
+    handler: str
+    error: str
+    attempts: int
+    failed_at: str
+    subscription: Any = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "event_type": self.event.event_type,
+            "issue_id": str(self.event.issue_id),
+            "handler": self.handler,
+            "error": self.error,
+            "attempts": self.attempts,
+            "failed_at": self.failed_at,
+            "event": self.event.to_dict(),
+        }
+
+
+class DeadLetterStore:
+    def __init__(self, capacity: int = 1000, on_add: Optional[Callable[[DeadLetter], None]] = None):
+        self.capacity = max(1, capacity)
+        self.on_add = on_add
+        self._entries: OrderedDict[int, DeadLetter] = OrderedDict()
+        self._next_id = 1
+        self.total = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, event: "Event", handler: str, error: BaseException, attempts: int, subscription: Any = None) -> DeadLetter:
+        entry = DeadLetter(
+            id=self._next_id,
+            event=event,
+            handler=handler,
+            error=f"{type(error).__name__}: {error}",
+            attempts=attempts,
+            failed_at=datetime.utcnow().isoformat(),
+            subscription=subscription,
+        )
+        self._next_id += 1
+        self.total += 1
+        self._entries[entry.id] = entry
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+        if self.on_add:
+            self.on_add(entry)
+        return entry
+
+    def list(self, limit: int = 50, handler: Optional[str] = None) -> list[DeadLetter]:
+        entries = [e for e in reversed(self._entries.values()) if handler is None or e.handler == handler]
+        return entries[:limit]
+
+    def get(self, entry_id: int) -> Optional[DeadLetter]:
+        return self._entries.get(entry_id)
+
+    def pop(self, entry_id: int) -> Optional[DeadLetter]:
+        return self._entries.pop(entry_id, None)
+
+    def stats(self) -> dict:
+        return {"stored": len(self._entries), "total": self.total, "evicted": self.evicted}
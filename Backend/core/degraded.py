@@ -0,0 +1,103 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+
+from Backend.core.config import settings
+from Backend.core.logging import get_logger
+from Backend.database.connection import get_db_context
+from Backend.database.models import DegradedDecision, PipelineJobRecord
+
+logger = get_logger(__name__)
+
+
+# While the pipeline backlog or the smoothed LLM latency is over its
+# threshold, agents use their deterministic fallbacks instead of Gemini.
+# The mode is left only once both are under half their threshold, and a
+# latency reading older than DEGRADED_RECHECK_S is dropped so calls are
+# tried again instead of staying degraded on a stale sample.
+class DegradedMode:
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.llm_latency_ms = 0.0
+        self.backlog = 0
+        self.active = False
+        self.since: Optional[datetime] = None
+        self.entered = 0
+        self._sampled = 0.0
+        self._checked = 0.0
+        self._lock = asyncio.Lock()
+
+    async def generate(self, model: Any, prompt: Any) -> Any:
+        began = time.perf_counter()
+        try:
+            return await asyncio.to_thread(model.generate_content, prompt)
+        finally:
+            self.observe_llm((time.perf_counter() - began) * 1000)
+
+    def observe_llm(self, elapsed_ms: float) -> None:
+        if not self.llm_latency_ms:
+            self.llm_latency_ms = elapsed_ms
+        else:
+            self.llm_latency_ms += self.alpha * (elapsed_ms - self.llm_latency_ms)
+        self._sampled = time.monotonic()
+
+    async def is_active(self) -> bool:
+        if settings.degraded_mode == "on":
+            return True
+        if settings.degraded_mode == "off":
+            return False
+
+        async with self._lock:
+            now = time.monotonic()
+            if now - self._checked >= settings.pipeline_queue_poll_s:
+                self._checked = now
+                try:
+                    async with get_db_context() as db:
+                        self.backlog = (await db.execute(
+                            select(func.count()).select_from(PipelineJobRecord)
+                            .where(PipelineJobRecord.status == "queued")
+                        )).scalar() or 0
+                except Exception as e:
+                    logger.error(f"Failed to read pipeline backlog: {e}")
+            if self.llm_latency_ms and now - self._sampled >= settings.degraded_recheck_s:
+                self.llm_latency_ms = 0.0
+            self._update()
+        return self.active
+
+    def _update(self) -> None:
+        backlog = self.backlog / max(1, settings.degraded_backlog_threshold)
+        latency = self.llm_latency_ms / max(1.0, settings.degraded_llm_latency_ms)
+        load = max(backlog, latency)
+        if not self.active and load >= 1.0:
+            self.active = True
+            self.since = datetime.utcnow()
+            self.entered += 1
+            logger.warning(
+                f"Entering degraded mode: backlog {self.backlog}, LLM latency {self.llm_latency_ms:.0f}ms"
+            )
+        elif self.active and load < 0.5:
+            self.active = False
+            self.since = None
+            logger.info("Leaving degraded mode")
+
+    def stats(self) -> dict:
+        return {
+            "mode": settings.degraded_mode,
+            "active": self.active,
+            "since": self.since.isoformat() if self.since else None,
+            "backlog": self.backlog,
+            "llm_latency_ms": round(self.llm_latency_ms, 1),
+            "entered": self.entered,
+        }
+
+
+def mark_for_reevaluation(db: Any, issue_id: UUID, agent_name: str, decision: str) -> None:
+    # Recorded in the caller's session so the mark commits with the decision.
+    db.add(DegradedDecision(issue_id=issue_id, agent_name=agent_name, decision=decision))
+
+
+degraded_mode = DegradedMode()
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import os
+import struct
+from collections import deque
+from pathlib import Path
+from typing import Optional, TYPE_CHECKING
+
+from Backend.core.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+if TYPE_CHECKING:
+    from Backend.core.events import Event
+
+logger = get_logger(__name__)
+
+SEGMENT_SUFFIX = ".seg"
+RECORD_HEADER = struct.Struct("!QI")
+OFFSETS_FILE = "offsets.json"
+LOCK_FILE = "LOCK"
+
+
+# Each process locks its own slot-N directory under the log root, so several
+# uvicorn workers can share one root without interleaving segments. Appends
+# and acks only touch memory and the segment's write buffer; sync() moves
+# the flush, fsync and committed-offset write off the event loop.
+class EventLog:
+    def __init__(self, root: Path, segment_bytes: int = 8 * 1024 * 1024, fsync: bool = False):
+        self.root = Path(root)
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.directory: Optional[Path] = None
+        self._lock_fd: Optional[int] = None
+        self._segment = None
+        self._segment_size = 0
+        self._next_offset = 0
+        self._committed = -1
+        self._in_flight: deque[int] = deque()
+        self._acked: set[int] = set()
+        self._unflushed = False
+        self._written_committed = -1
+
+    @property
+    def committed(self) -> int:
+        return self._committed
+
+    @property
+    def pending(self) -> int:
+        return len(self._in_flight)
+
+    def open(self) -> list[tuple[int, "Event"]]:
+        self.directory = self._claim_slot()
+        self._committed = self._written_committed = self._read_committed()
+
+        pending = []
+        for segment in self._segments():
+            for offset, event in self._read_segment(segment):
+                self._next_offset = max(self._next_offset, offset + 1)
+                if offset > self._committed:
+                    pending.append((offset, event))
+
+        self._next_offset = max(self._next_offset, self._committed + 1)
+        if not pending:
+            self._committed = self._next_offset - 1
+        self._in_flight = deque(offset for offset, _ in pending)
+        self._roll()
+        return pending
+
+    def append(self, event: "Event") -> int:
+        offset = self._next_offset
+        self._next_offset += 1
+        payload = event.to_bytes()
+        record = RECORD_HEADER.pack(offset, len(payload)) + payload
+
+        if self._segment_size + len(record) > self.segment_bytes:
+            self._roll()
+        self._segment.write(record)
+        self._segment_size += len(record)
+        self._unflushed = True
+
+        self._in_flight.append(offset)
+        return offset
+
+    def ack(self, offset: int) -> None:
+        self._acked.add(offset)
+        while self._in_flight and self._in_flight[0] in self._acked:
+            self._committed = self._in_flight.popleft()
+            self._acked.discard(self._committed)
+
+    async def sync(self) -> None:
+        # Called every EVENT_LOG_SYNC_MS by the bus, so a crash loses at most
+        # that long of appends and replays at most that long of acked events.
+        if self._segment is None or (not self._unflushed and self._committed == self._written_committed):
+            return
+        segment = self._segment if self._unflushed else None
+        self._unflushed = False
+        await asyncio.to_thread(self._sync, segment, self._committed)
+
+    def _sync(self, segment, committed: int) -> None:
+        if segment is not None:
+            try:
+                self._flush(segment)
+            except ValueError:
+                # Rolled and closed meanwhile; closing flushed it.
+                pass
+        if committed != self._written_committed:
+            self._write_committed(committed)
+
+    def close(self) -> None:
+        if self._segment:
+            self._flush(self._segment)
+            self._segment.close()
+            self._segment = None
+        if self.directory:
+            self._write_committed()
+            self._compact()
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    def _claim_slot(self) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        slot = 0
+        while True:
+            directory = self.root / f"slot-{slot}"
+            directory.mkdir(exist_ok=True)
+            if fcntl is None:
+                return directory
+            fd = os.open(directory / LOCK_FILE, os.O_RDWR | os.O_CREAT)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                slot += 1
+                continue
+            self._lock_fd = fd
+            return directory
+
+    def _segments(self) -> list[Path]:
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def _read_segment(self, segment: Path):
+        from Backend.core.events import Event
+
+        with open(segment, "rb") as f:
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                offset, length = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    logger.warning(f"Truncated event log record {offset} in {segment.name}")
+                    return
+                try:
+                    yield offset, Event.from_bytes(payload)
+                except Exception as e:
+                    logger.warning(f"Skipping unreadable event log record {offset} in {segment.name}: {e}")
+
+    def _roll(self) -> None:
+        if self._segment:
+            self._flush(self._segment)
+            self._segment.close()
+        path = self.directory / f"{self._next_offset:020d}{SEGMENT_SUFFIX}"
+        self._segment = open(path, "ab")
+        self._segment_size = path.stat().st_size
+        self._compact()
+
+    def _compact(self) -> None:
+        segments = self._segments()
+        for segment, following in zip(segments, segments[1:]):
+            if int(following.stem) - 1 <= self._committed:
+                segment.unlink(missing_ok=True)
+
+    def _read_committed(self) -> int:
+        try:
+            return int(json.loads((self.directory / OFFSETS_FILE).read_text())["committed"])
+        except (FileNotFoundError, KeyError, ValueError):
+            return -1
+
+    def _flush(self, segment) -> None:
+        segment.flush()
+        if self.fsync:
+            os.fsync(segment.fileno())
+
+    def _write_committed(self, committed: Optional[int] = None) -> None:
+        committed = self._committed if committed is None else committed
+        path = self.directory / OFFSETS_FILE
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"committed": committed}))
+        os.replace(tmp, path)
+        self._written_committed = committed
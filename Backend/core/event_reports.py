@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Optional
+
+from Backend.core.dead_letters import DeadLetter
+from Backend.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from Backend.core.events import EventBus
+
+logger = get_logger(__name__)
+
+
+def default_node() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+# Handlers run in whichever process subscribed them, mostly the pipeline
+# worker, so their stats and dead letters are written to shared tables for
+# the API's admin endpoints. Each report also picks up the redeliveries
+# requested there for handlers this bus has.
+class EventBusReporter:
+    def __init__(self, interval_s: float, max_pending: int, node: Optional[str] = None):
+        self.interval_s = interval_s
+        self.max_pending = max_pending
+        self.node = node or default_node()
+        self._dead_letters: list[DeadLetter] = []
+        self._task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def dead_lettered(self, entry: DeadLetter) -> None:
+        if len(self._dead_letters) >= self.max_pending:
+            self.dropped += 1
+            return
+        self._dead_letters.append(entry)
+
+    async def start(self, bus: "EventBus") -> None:
+        self._task = asyncio.create_task(self._report_loop(bus))
+
+    async def stop(self, bus: "EventBus") -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self._write(bus)
+        except Exception as e:
+            logger.error(f"Failed to report event handler stats: {e}")
+
+    async def report(self, bus: "EventBus") -> None:
+        await self._write(bus)
+        await self._redeliver(bus)
+
+    async def _write(self, bus: "EventBus") -> None:
+        from sqlalchemy import delete
+        from sqlalchemy.dialects.postgresql import insert
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import EventDeadLetterRecord, EventHandlerStatsRecord
+
+        stats = bus.handler_stats()
+        entries, self._dead_letters = self._dead_letters, []
+        now = datetime.utcnow()
+        try:
+            async with get_db_context() as db:
+                if stats:
+                    upsert = insert(EventHandlerStatsRecord).values([
+                        {
+                            "node": self.node,
+                            "event_type": row["event_type"],
+                            "handler": row["handler"],
+                            "stats": json.dumps(row),
+                            "updated_at": now,
+                        }
+                        for row in stats
+                    ])
+                    await db.execute(upsert.on_conflict_do_update(
+                        index_elements=["node", "event_type", "handler"],
+                        set_={"stats": upsert.excluded.stats, "updated_at": upsert.excluded.updated_at},
+                    ))
+                if entries:
+                    await db.execute(insert(EventDeadLetterRecord).values([
+                        {
+                            "node": self.node,
+                            "event_type": entry.event.event_type,
+                            "issue_id": entry.event.issue_id,
+                            "handler": entry.handler,
+                            "error": entry.error,
+                            "attempts": entry.attempts,
+                            "event": entry.event.encode(),
+                            "failed_at": datetime.fromisoformat(entry.failed_at),
+                        }
+                        for entry in entries
+                    ]))
+                # Rows of processes that stopped reporting.
+                await db.execute(
+                    delete(EventHandlerStatsRecord)
+                    .where(EventHandlerStatsRecord.updated_at < now - timedelta(seconds=self.interval_s * 10))
+                )
+        except Exception:
+            self._dead_letters = (entries + self._dead_letters)[-self.max_pending:]
+            raise
+
+    async def _redeliver(self, bus: "EventBus") -> None:
+        from sqlalchemy import delete, select, tuple_
+        from Backend.core.events import Event
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import EventDeadLetterRecord
+
+        handlers = bus.subscription_keys()
+        if not handlers:
+            return
+        # Claimed by deleting the row; a redelivery that fails again is
+        # dead-lettered anew.
+        async with get_db_context() as db:
+            claimable = (
+                select(EventDeadLetterRecord.id)
+                .where(
+                    EventDeadLetterRecord.redeliver_requested_at.is_not(None),
+                    tuple_(EventDeadLetterRecord.event_type, EventDeadLetterRecord.handler).in_(handlers),
+                )
+                .with_for_update(skip_locked=True)
+            )
+            result = await db.execute(
+                delete(EventDeadLetterRecord)
+                .where(EventDeadLetterRecord.id.in_(claimable))
+                .returning(EventDeadLetterRecord.handler, EventDeadLetterRecord.event, EventDeadLetterRecord.attempts)
+            )
+            claimed = result.all()
+
+        for handler, data, attempts in claimed:
+            event = Event.decode(data)
+            failed = await bus.redeliver_to(event.event_type, handler, event, attempts)
+            outcome = "failed again" if failed else "delivered"
+            logger.info(f"Redelivered {event.event_type} for issue {event.issue_id} to {handler}: {outcome}")
+
+    async def _report_loop(self, bus: "EventBus") -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                await self.report(bus)
+            except Exception as e:
+                logger.error(f"Failed to report event handler stats: {e}")
+
+    def stats(self) -> dict:
+        return {"node": self.node, "pending_dead_letters": len(self._dead_letters), "dropped": self.dropped}
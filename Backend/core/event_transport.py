@@ -0,0 +1,331 @@
+import asyncio
+import os
+import struct
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Callable, Coroutine, Optional
+
+from Backend.core.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = get_logger(__name__)
+
+Deliver = Callable[[str], Coroutine[Any, Any, None]]
+
+FRAME_HEADER = struct.Struct("!I")
+PG_NOTIFY_MAX_BYTES = 7999
+
+
+class EventTransport(ABC):
+    def __init__(self, outbox_size: int = 10000):
+        self._outbox: asyncio.Queue[str] = asyncio.Queue(maxsize=outbox_size)
+        self._deliver: Optional[Deliver] = None
+        self._tasks: list[asyncio.Task] = []
+        self.sent = 0
+        self.received = 0
+        self.dropped = 0
+
+    def send(self, message: str) -> None:
+        try:
+            self._outbox.put_nowait(message)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def start(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+        self._tasks = [asyncio.create_task(self._send_loop()), asyncio.create_task(self._receive_loop())]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._close()
+
+    def stats(self) -> dict:
+        return {
+            "transport": type(self).__name__,
+            "outbox": self._outbox.qsize(),
+            "sent": self.sent,
+            "received": self.received,
+            "dropped": self.dropped,
+        }
+
+    async def _received(self, message: str) -> None:
+        self.received += 1
+        try:
+            await self._deliver(message)
+        except Exception as e:
+            logger.error(f"Failed to deliver remote event: {e}")
+
+    async def _send_loop(self) -> None:
+        while True:
+            message = await self._outbox.get()
+            try:
+                if await self._send(message):
+                    self.sent += 1
+                else:
+                    self.dropped += 1
+            except Exception as e:
+                self.dropped += 1
+                logger.warning(f"{type(self).__name__} failed to send event: {e}")
+
+    @abstractmethod
+    async def _send(self, message: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def _receive_loop(self) -> None:
+        pass
+
+    async def _close(self) -> None:
+        pass
+
+
+class PostgresTransport(EventTransport):
+    def __init__(self, dsn: str, channel: str = "urbanlens_events"):
+        super().__init__()
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://")
+        self.channel = channel
+        self._listen_conn = None
+        self._notify_conn = None
+        self._inbox: asyncio.Queue[str] = asyncio.Queue()
+        self._connected = asyncio.Event()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        self._listen_conn = await asyncpg.connect(self.dsn, statement_cache_size=0)
+        self._listen_conn.add_termination_listener(self._on_terminated)
+        await self._listen_conn.add_listener(self.channel, self._on_notify)
+        self._notify_conn = await asyncpg.connect(self.dsn, statement_cache_size=0)
+        self._connected.set()
+        logger.info(f"Listening for events on Postgres channel '{self.channel}'")
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        self._inbox.put_nowait(payload)
+
+    def _on_terminated(self, connection) -> None:
+        self._connected.clear()
+
+    async def _send(self, message: str) -> bool:
+        if len(message.encode()) > PG_NOTIFY_MAX_BYTES:
+            logger.warning(f"Event too large for NOTIFY ({len(message)} chars), delivered locally only")
+            return False
+        await self._connected.wait()
+        await self._notify_conn.execute("SELECT pg_notify($1, $2)", self.channel, message)
+        return True
+
+    async def _receive_loop(self) -> None:
+        backoff = 0.5
+        while True:
+            if not self._connected.is_set():
+                try:
+                    await self._close()
+                    await self._connect()
+                    backoff = 0.5
+                except Exception as e:
+                    logger.warning(f"Postgres event transport unavailable: {e}")
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 30)
+                    continue
+            try:
+                message = await asyncio.wait_for(self._inbox.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            await self._received(message)
+
+    async def _close(self) -> None:
+        self._connected.clear()
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+        self._listen_conn = None
+        self._notify_conn = None
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> str:
+    header = await reader.readexactly(FRAME_HEADER.size)
+    (length,) = FRAME_HEADER.unpack(header)
+    return (await reader.readexactly(length)).decode()
+
+
+def _frame(message: str) -> bytes:
+    data = message.encode()
+    return FRAME_HEADER.pack(len(data)) + data
+
+
+# Frames are written to every other client without waiting on it. A client
+# that stops reading is disconnected once its unsent frames pass
+# max_buffer_bytes or it cannot drain within drain_timeout_s; it reconnects
+# and misses only what was sent meanwhile.
+class EventBroker:
+    def __init__(self, path: Path, max_buffer_bytes: Optional[int] = None, drain_timeout_s: Optional[float] = None):
+        from Backend.core.config import settings
+
+        self.path = Path(path)
+        self.max_buffer_bytes = max_buffer_bytes or settings.event_broker_max_buffer_bytes
+        self.drain_timeout_s = drain_timeout_s or settings.event_broker_drain_timeout_s
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._draining: dict[asyncio.StreamWriter, asyncio.Task] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self.disconnected = 0
+
+    async def start(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self.path))
+        logger.info(f"Event broker listening on {self.path}")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in list(self._draining.values()):
+            task.cancel()
+        for writer in list(self._clients):
+            writer.close()
+        self.path.unlink(missing_ok=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        try:
+            while True:
+                frame = _frame(await _read_frame(reader))
+                for client in list(self._clients):
+                    if client is not writer:
+                        self._forward(client, frame)
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    def _forward(self, client: asyncio.StreamWriter, frame: bytes) -> None:
+        client.write(frame)
+        buffered = client.transport.get_write_buffer_size()
+        if buffered > self.max_buffer_bytes:
+            self._disconnect(client, f"{buffered} bytes unsent")
+        elif buffered and client not in self._draining:
+            self._draining[client] = asyncio.create_task(self._drain(client))
+
+    async def _drain(self, client: asyncio.StreamWriter) -> None:
+        try:
+            await asyncio.wait_for(client.drain(), timeout=self.drain_timeout_s)
+        except asyncio.TimeoutError:
+            self._disconnect(client, f"not drained within {self.drain_timeout_s}s")
+        except ConnectionError:
+            pass
+        finally:
+            self._draining.pop(client, None)
+
+    def _disconnect(self, client: asyncio.StreamWriter, reason: str) -> None:
+        if client not in self._clients:
+            return
+        self._clients.discard(client)
+        task = self._draining.pop(client, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+        # abort() drops the unsent buffer instead of flushing it first.
+        client.transport.abort()
+        self.disconnected += 1
+        logger.warning(f"Disconnected slow event broker client: {reason}")
+
+
+class UnixSocketTransport(EventTransport):
+    # The first process to take the lock file hosts the broker; the others
+    # connect as clients and take over hosting if that process goes away.
+    def __init__(self, path: Path, host_broker: bool = True):
+        super().__init__()
+        self.path = Path(path)
+        self.host_broker = host_broker and fcntl is not None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._broker: Optional[EventBroker] = None
+        self._lock_fd: Optional[int] = None
+
+    async def _send(self, message: str) -> bool:
+        if self._writer is None:
+            return False
+        self._writer.write(_frame(message))
+        await self._writer.drain()
+        return True
+
+    async def _receive_loop(self) -> None:
+        backoff = 0.1
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(self.path))
+            except (FileNotFoundError, ConnectionRefusedError):
+                if not await self._try_host_broker():
+                    await asyncio.sleep(backoff)
+                    backoff = min(backoff * 2, 5)
+                continue
+
+            backoff = 0.1
+            self._writer = writer
+            try:
+                while True:
+                    await self._received(await _read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError):
+                logger.warning(f"Lost connection to event broker at {self.path}, reconnecting")
+            finally:
+                self._writer = None
+                writer.close()
+
+    async def _try_host_broker(self) -> bool:
+        if not self.host_broker or self._broker is not None:
+            return False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path.with_suffix(".lock"), os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        self._lock_fd = fd
+        self._broker = EventBroker(self.path)
+        await self._broker.start()
+        return True
+
+    async def _close(self) -> None:
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        if self._broker:
+            await self._broker.stop()
+            self._broker = None
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+
+def create_transport(kind: str) -> Optional[EventTransport]:
+    from Backend.core.config import settings
+
+    if kind == "local":
+        return None
+    if kind == "postgres":
+        return PostgresTransport(settings.event_transport_dsn or settings.database_url)
+    if kind == "unix":
+        return UnixSocketTransport(settings.event_broker_path)
+    raise ValueError(f"Unknown event transport: {kind}")
+
+
+async def run_broker(path: Path) -> None:
+    broker = EventBroker(path)
+    await broker.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await broker.stop()
+
+
+if __name__ == "__main__":
+    from Backend.core.config import settings
+
+    asyncio.run(run_broker(Path(sys.argv[1]) if len(sys.argv) > 1 else settings.event_broker_path))
@@ -1,106 +1,723 @@
 import asyncio
-from collections import defaultdict
+import importlib
+import time
+from collections import defaultdict, deque
 from datetime import datetime
 from typing import Any, Callable, Coroutine, Optional, TypeVar
 from uuid import UUID, uuid4
-from pydantic import BaseModel, Field
 
+import msgspec
 
-class Event(BaseModel):
-    event_id: UUID = Field(default_factory=uuid4)
+from Backend.core.config import settings
+from Backend.core.dead_letters import DeadLetter, DeadLetterStore
+from Backend.core.event_log import EventLog
+from Backend.core.event_reports import EventBusReporter
+from Backend.core.event_transport import EventTransport, create_transport
+from Backend.core.lanes import WeightedLanes, lane_for
+from Backend.core.logging import get_logger
+from Backend.core.schemas import PriorityLevel
+
+logger = get_logger(__name__)
+
+_EVENT_TYPES: dict[str, type["Event"]] = {}
+_JSON_ENCODER = msgspec.json.Encoder()
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder()
+_DECODERS: dict[type, tuple[msgspec.json.Decoder, msgspec.msgpack.Decoder]] = {}
+
+# Set in the metadata of events that arrived from another node's bus.
+REMOTE_ORIGIN = "remote_origin"
+
+
+class Event(msgspec.Struct, kw_only=True):
     issue_id: UUID
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
-    metadata: dict[str, Any] = Field(default_factory=dict)
+    event_id: UUID = msgspec.field(default_factory=uuid4)
+    timestamp: datetime = msgspec.field(default_factory=datetime.utcnow)
+    metadata: dict[str, Any] = msgspec.field(default_factory=dict)
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        _EVENT_TYPES[cls.type_key()] = cls
+    
+    @classmethod
+    def type_key(cls) -> str:
+        return f"{cls.__module__}.{cls.__qualname__}"
+    
+    @staticmethod
+    def resolve(type_key: str) -> type["Event"]:
+        if type_key not in _EVENT_TYPES:
+            importlib.import_module(type_key.rsplit(".", 1)[0])
+        return _EVENT_TYPES[type_key]
+    
+    @classmethod
+    def _decoders(cls) -> tuple[msgspec.json.Decoder, msgspec.msgpack.Decoder]:
+        decoders = _DECODERS.get(cls)
+        if decoders is None:
+            decoders = _DECODERS[cls] = (msgspec.json.Decoder(cls), msgspec.msgpack.Decoder(cls))
+        return decoders
+    
+    @staticmethod
+    def decode(data: str) -> "Event":
+        type_key, payload = data.split("\t", 1)
+        return Event.resolve(type_key)._decoders()[0].decode(payload)
+    
+    def encode(self) -> str:
+        return f"{self.type_key()}\t{_JSON_ENCODER.encode(self).decode()}"
+    
+    @staticmethod
+    def from_bytes(data: bytes) -> "Event":
+        type_key, _, payload = data.partition(b"\0")
+        return Event.resolve(type_key.decode())._decoders()[1].decode(payload)
+    
+    def to_bytes(self) -> bytes:
+        return self.type_key().encode() + b"\0" + _MSGPACK_ENCODER.encode(self)
+    
+    def to_dict(self) -> dict[str, Any]:
+        return msgspec.to_builtins(self)
     
     @property
     def event_type(self) -> str:
         return self.__class__.__name__
+    
+    @property
+    def urgency(self) -> int:
+        return int(self.metadata.get("priority", getattr(self, "priority", PriorityLevel.MEDIUM)))
 
 
-class IssueCreated(Event):
+class IssueCreated(Event, kw_only=True):
     image_paths: list[str]
     latitude: float
     longitude: float
     description: Optional[str] = None
 
 
-class IssueClassified(Event):
+class IssueClassified(Event, kw_only=True):
     category: str
     confidence: float
     detections_count: int
 
 
-class IssuePrioritized(Event):
+class IssuePrioritized(Event, kw_only=True):
     priority: int
     reasoning: str
 
 
-class IssueAssigned(Event):
+class IssueAssigned(Event, kw_only=True):
     department: str
     ward: str
     sla_deadline: datetime
 
 
-class IssueEscalated(Event):
+class IssueEscalated(Event, kw_only=True):
     from_level: int
     to_level: int
     reason: str
 
 
-class IssueResolved(Event):
+class IssueResolved(Event, kw_only=True):
     resolved_by: str
     resolution_notes: str
 
 
 E = TypeVar("E", bound=Event)
 Handler = Callable[[E], Coroutine[Any, Any, None]]
+BatchHandler = Callable[[list[E]], Coroutine[Any, Any, None]]
+
+
+class EventBusFull(Exception):
+    def __init__(self, event: Event, capacity: int):
+        super().__init__(f"Event bus is full ({capacity} pending), rejected {event.event_type} for issue {event.issue_id}")
+        self.event = event
+        self.capacity = capacity
+
+
+class _Shard:
+    __slots__ = ("events", "pinned", "retrying", "held", "resumed", "ready", "idle", "unfinished")
+    
+    def __init__(self, weights: list[int]):
+        self.events: WeightedLanes[tuple[Event, Optional[int], int]] = WeightedLanes(weights)
+        self.pinned: dict[UUID, list[int]] = {}
+        self.retrying: dict[UUID, int] = {}
+        self.held: dict[UUID, deque[tuple[Event, Optional[int], int]]] = {}
+        self.resumed: deque[tuple[Event, Optional[int], int]] = deque()
+        self.ready = asyncio.Event()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.unfinished = 0
+    
+    def lane_of(self, event: Event) -> int:
+        # An issue stays in the lane of its oldest pending event so that a
+        # later, more urgent event cannot overtake it.
+        pinned = self.pinned.get(event.issue_id)
+        return pinned[0] if pinned else lane_for(event.urgency, self.events.lane_count)
+    
+    def push(self, event: Event, offset: Optional[int]) -> int:
+        lane = self.lane_of(event)
+        pinned = self.pinned.setdefault(event.issue_id, [lane, 0])
+        pinned[1] += 1
+        self.events.push(lane, (event, offset, lane))
+        return lane
+    
+    def pop(self) -> tuple[Event, Optional[int], int]:
+        return self._unpin(self.events.pop())
+    
+    def pop_lowest(self) -> tuple[Event, Optional[int], int]:
+        return self._unpin(self.events.pop_lowest()[1])
+    
+    def _unpin(self, entry: tuple[Event, Optional[int], int]) -> tuple[Event, Optional[int], int]:
+        pinned = self.pinned[entry[0].issue_id]
+        pinned[1] -= 1
+        if not pinned[1]:
+            del self.pinned[entry[0].issue_id]
+        return entry
+    
+    # While one of an issue's events waits for a handler retry, its later
+    # events are held back, then resumed in order ahead of the lanes.
+    def hold(self, entry: tuple[Event, Optional[int], int]) -> bool:
+        issue_id = entry[0].issue_id
+        if issue_id not in self.retrying:
+            return False
+        self.held.setdefault(issue_id, deque()).append(entry)
+        return True
+    
+    def block(self, issue_id: UUID) -> None:
+        self.retrying[issue_id] = self.retrying.get(issue_id, 0) + 1
+    
+    def unblock(self, issue_id: UUID) -> None:
+        self.retrying[issue_id] -= 1
+        if self.retrying[issue_id]:
+            return
+        del self.retrying[issue_id]
+        held = self.held.pop(issue_id, None)
+        if held:
+            self.resumed.extend(held)
+            self.ready.set()
+
+
+class _Subscription:
+    def __init__(
+        self,
+        handler: Callable[[Any], Coroutine[Any, Any, None]],
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_ms: Optional[float] = None,
+        broadcast: bool = False,
+    ):
+        self.handler = handler
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.timeout = timeout if timeout is not None else settings.event_handler_timeout_s
+        self.retries = max(0, retries if retries is not None else settings.event_handler_retries)
+        self.backoff = (backoff_ms if backoff_ms is not None else settings.event_handler_backoff_ms) / 1000
+        self.max_concurrency = max_concurrency
+        self.broadcast = broadcast
+        self._slots = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retried = 0
+        self.dead_lettered = 0
+        self.in_flight = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    async def invoke(self, payload: Any) -> tuple[Optional[BaseException], int]:
+        return await self.retry(payload, await self._attempt(payload))
+    
+    async def retry(self, payload: Any, error: Optional[BaseException], attempt: int = 1) -> tuple[Optional[BaseException], int]:
+        # Continues after `attempt` attempts that ended in `error`.
+        while error is not None and attempt <= self.retries:
+            self.retried += 1
+            await asyncio.sleep(self.backoff * 2 ** (attempt - 1))
+            attempt += 1
+            error = await self._attempt(payload)
+        return error, attempt
+    
+    async def _attempt(self, payload: Any) -> Optional[BaseException]:
+        if self._slots:
+            await self._slots.acquire()
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.handler(payload), timeout=self.timeout or None)
+            return None
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            self.failures += 1
+            return TimeoutError(f"{self.name} timed out after {self.timeout}s")
+        except Exception as e:
+            self.failures += 1
+            return e
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.calls += 1
+            self.total_ms += elapsed
+            self.max_ms = max(self.max_ms, elapsed)
+            self.in_flight -= 1
+            if self._slots:
+                self._slots.release()
+    
+    def stats(self) -> dict:
+        return {
+            "handler": self.name,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retried,
+            "dead_lettered": self.dead_lettered,
+            "in_flight": self.in_flight,
+            "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+            "max_ms": round(self.max_ms, 2),
+            "timeout_s": self.timeout,
+            "max_concurrency": self.max_concurrency,
+            "broadcast": self.broadcast,
+        }
+
+
+class _BatchSubscription:
+    def __init__(self, policy: _Subscription, max_size: int, max_wait: float, dead_letters: DeadLetterStore):
+        self.policy = policy
+        self.dead_letters = dead_letters
+        self.max_size = max(1, max_size)
+        self.max_wait = max_wait
+        self.pending: list[tuple[Event, asyncio.Future]] = []
+        self.in_flight: list[tuple[Event, asyncio.Future]] = []
+        self.has_items = asyncio.Event()
+        self.full = asyncio.Event()
+    
+    def offer(self, event: Event) -> asyncio.Future:
+        done = asyncio.get_running_loop().create_future()
+        self.pending.append((event, done))
+        self.has_items.set()
+        if len(self.pending) >= self.max_size:
+            self.full.set()
+        return done
+    
+    async def drain(self) -> None:
+        while self.pending or self.in_flight:
+            await asyncio.gather(*(done for _, done in self.in_flight + self.pending), return_exceptions=True)
+    
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.has_items.wait()
+            deadline = loop.time() + self.max_wait
+            while len(self.pending) < self.max_size:
+                self.full.clear()
+                try:
+                    await asyncio.wait_for(self.full.wait(), timeout=max(0.0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+            
+            batch, self.pending = self.pending[:self.max_size], self.pending[self.max_size:]
+            if not self.pending:
+                self.has_items.clear()
+            events = [event for event, _ in batch]
+            self.in_flight = batch
+            try:
+                error, attempts = await self.policy.invoke(events)
+                if error is not None:
+                    logger.error(f"Batch handler {self.policy.name} failed after {attempts} attempts: {error}")
+                    for event in events:
+                        self.dead_letters.add(event, self.policy.name, error, attempts, subscription=self.policy)
+                        self.policy.dead_lettered += 1
+            except asyncio.CancelledError:
+                # Cancelled events are left unacked so the log replays them.
+                for _, done in batch:
+                    done.cancel()
+                raise
+            finally:
+                self.in_flight = []
+                for _, done in batch:
+                    if not done.done():
+                        done.set_result(None)
 
 
 class EventBus:
     _instance: Optional["EventBus"] = None
-    _lock: asyncio.Lock = asyncio.Lock()
     
     def __new__(cls) -> "EventBus":
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._handlers = defaultdict(list)
-            cls._instance._queue = asyncio.Queue()
-            cls._instance._running = False
+            log = EventLog(settings.event_log_dir, fsync=settings.event_log_fsync) if settings.event_log_dir else None
+            reporter = EventBusReporter(settings.event_report_interval_s, settings.event_dead_letter_capacity)
+            cls._instance = cls.create(log=log, transport=create_transport(settings.event_transport), reporter=reporter)
         return cls._instance
     
-    def subscribe(self, event_type: type[E], handler: Handler[E]) -> None:
-        self._handlers[event_type.__name__].append(handler)
+    @classmethod
+    def create(
+        cls,
+        shards: Optional[int] = None,
+        capacity: Optional[int] = None,
+        overflow: Optional[str] = None,
+        log: Optional[EventLog] = None,
+        transport: Optional[EventTransport] = None,
+        lane_weights: Optional[list[int]] = None,
+        reporter: Optional[EventBusReporter] = None,
+    ) -> "EventBus":
+        bus = super().__new__(cls)
+        bus._handlers = defaultdict(list)
+        bus._batch_handlers = defaultdict(list)
+        weights = list(lane_weights or settings.priority_lane_weights)
+        bus._shards = [_Shard(weights) for _ in range(max(1, shards or settings.event_bus_shards))]
+        bus._tasks = []
+        bus._running = False
+        bus._capacity = max(1, capacity or settings.event_bus_capacity)
+        bus._overflow = overflow or settings.event_bus_overflow
+        bus._depth = 0
+        bus._high_water = 0
+        bus._lane_counts = [0] * len(weights)
+        bus._dropped = 0
+        bus._rejected = 0
+        bus._space_waiters = deque()
+        bus._log = log
+        bus._log_sync: Optional[asyncio.Task] = None
+        bus._retrying: set[asyncio.Task] = set()
+        bus._transport = transport
+        bus._node_id = uuid4().hex
+        bus._reporter = reporter
+        bus.dead_letters = DeadLetterStore(
+            settings.event_dead_letter_capacity,
+            on_add=reporter.dead_lettered if reporter else None,
+        )
+        return bus
+    
+    @property
+    def shard_count(self) -> int:
+        return len(self._shards)
+    
+    @property
+    def depth(self) -> int:
+        return self._depth
+    
+    @property
+    def high_water(self) -> int:
+        return self._high_water
+    
+    def shard_for(self, issue_id: UUID) -> int:
+        return issue_id.int % len(self._shards)
+    
+    def subscribe(
+        self,
+        event_type: type[E],
+        handler: Handler[E],
+        timeout: Optional[float] = None,
+        max_concurrency: Optional[int] = None,
+        retries: Optional[int] = None,
+        backoff_ms: Optional[float] = None,
+        broadcast: bool = False,
+    ) -> None:
+        self._handlers[event_type.__name__].append(
+            _Subscription(handler, timeout, max_concurrency, retries, backoff_ms, broadcast)
+        )
+    
+    def subscribe_batch(
+        self,
+        event_type: type[E],
+        handler: BatchHandler[E],
+        max_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff_ms: Optional[float] = None,
+        broadcast: bool = False,
+    ) -> None:
+        subscription = _BatchSubscription(
+            _Subscription(handler, timeout, None, retries, backoff_ms, broadcast),
+            max_size or settings.event_batch_max_size,
+            (max_wait_ms if max_wait_ms is not None else settings.event_batch_max_wait_ms) / 1000,
+            self.dead_letters,
+        )
+        self._batch_handlers[event_type.__name__].append(subscription)
+        if self._running:
+            self._tasks.append(asyncio.create_task(subscription.run()))
+    
+    def subscription_keys(self) -> list[tuple[str, str]]:
+        keys = [(event_type, sub.name) for event_type, subs in self._handlers.items() for sub in subs]
+        keys.extend((event_type, sub.policy.name) for event_type, subs in self._batch_handlers.items() for sub in subs)
+        return keys
+    
+    def has_subscribers(self, event_type: str) -> bool:
+        return bool(self._handlers.get(event_type) or self._batch_handlers.get(event_type))
+    
+    def _subscriptions(self, event: Event) -> tuple[list[_Subscription], list[_BatchSubscription]]:
+        # The transport broadcasts every event to every node, and each node
+        # registers the same handlers. Remote events therefore reach only
+        # subscriptions made with broadcast=True; the rest run once, on the
+        # node that published the event.
+        handlers = self._handlers.get(event.event_type, [])
+        batches = self._batch_handlers.get(event.event_type, [])
+        if REMOTE_ORIGIN in event.metadata:
+            handlers = [sub for sub in handlers if sub.broadcast]
+            batches = [sub for sub in batches if sub.policy.broadcast]
+        return handlers, batches
     
     async def publish(self, event: Event) -> None:
-        await self._queue.put(event)
+        await self._publish_local(event)
+        if self._transport:
+            self._transport.send(f"{self._node_id}\t{event.encode()}")
     
     def publish_sync(self, event: Event) -> None:
-        asyncio.create_task(self._queue.put(event))
+        if not self._offer(event):
+            self._rejected += 1
+            raise EventBusFull(event, self._capacity)
+        if self._transport:
+            self._transport.send(f"{self._node_id}\t{event.encode()}")
+    
+    async def _publish_local(self, event: Event) -> None:
+        while not self._offer(event):
+            await self._wait_for_space()
+    
+    async def _receive(self, message: str) -> None:
+        origin, data = message.split("\t", 1)
+        if origin == self._node_id:
+            return
+        event = Event.decode(data)
+        event.metadata[REMOTE_ORIGIN] = origin
+        if any(self._subscriptions(event)):
+            await self._publish_local(event)
+    
+    def stats(self) -> dict:
+        return {
+            "shards": len(self._shards),
+            "capacity": self._capacity,
+            "overflow": self._overflow,
+            "depth": self._depth,
+            "high_water": self._high_water,
+            "shard_depths": [len(shard.events) for shard in self._shards],
+            "lane_depths": list(self._lane_counts),
+            "dropped": self._dropped,
+            "rejected": self._rejected,
+            "retrying": len(self._retrying),
+            "log": {
+                "directory": str(self._log.directory),
+                "committed_offset": self._log.committed,
+                "unacked": self._log.pending,
+            } if self._log and self._log.directory else None,
+            "transport": self._transport.stats() if self._transport else None,
+            "handlers": self.handler_stats(),
+            "dead_letters": self.dead_letters.stats(),
+            "reporter": self._reporter.stats() if self._reporter else None,
+        }
+    
+    def handler_stats(self) -> list[dict]:
+        stats = []
+        for event_type, subscriptions in self._handlers.items():
+            stats.extend({"event_type": event_type, **sub.stats()} for sub in subscriptions)
+        for event_type, subscriptions in self._batch_handlers.items():
+            stats.extend({"event_type": event_type, "batch": True, **sub.policy.stats()} for sub in subscriptions)
+        return stats
+    
+    async def redeliver(self, dead_letter_id: int) -> Optional[DeadLetter]:
+        entry = self.dead_letters.pop(dead_letter_id)
+        if entry is None or entry.subscription is None:
+            return entry
+        return await self._redeliver(entry.subscription, entry.event, entry.attempts)
+    
+    async def redeliver_to(self, event_type: str, handler: str, event: Event, attempts: int) -> Optional[DeadLetter]:
+        # For dead letters read back from the shared table, which name their
+        # handler instead of holding its subscription.
+        subscriptions = self._handlers.get(event_type, []) + [
+            sub.policy for sub in self._batch_handlers.get(event_type, [])
+        ]
+        for subscription in subscriptions:
+            if subscription.name == handler:
+                return await self._redeliver(subscription, event, attempts)
+        raise LookupError(f"No handler {handler} subscribed to {event_type}")
+    
+    async def _redeliver(self, subscription: _Subscription, event: Event, attempts: int) -> Optional[DeadLetter]:
+        payload = [event] if any(
+            sub.policy is subscription
+            for subs in self._batch_handlers.values()
+            for sub in subs
+        ) else event
+        error, tried = await subscription.invoke(payload)
+        if error is not None:
+            subscription.dead_lettered += 1
+            return self.dead_letters.add(event, subscription.name, error, attempts + tried, subscription)
+        return None
+    
+    def _offer(self, event: Event) -> bool:
+        if self._depth < self._capacity:
+            self._enqueue(event, self._append(event))
+            return True
+        if self._overflow == "drop":
+            self._drop_for(event)
+            return True
+        if self._overflow == "reject":
+            self._rejected += 1
+            raise EventBusFull(event, self._capacity)
+        return False
+    
+    def _append(self, event: Event) -> Optional[int]:
+        if self._log is None or not any(self._subscriptions(event)):
+            return None
+        return self._log.append(event)
+    
+    def _enqueue(self, event: Event, offset: Optional[int]) -> None:
+        shard = self._shards[self.shard_for(event.issue_id)]
+        lane = shard.push(event, offset)
+        shard.unfinished += 1
+        shard.idle.clear()
+        shard.ready.set()
+        self._depth += 1
+        self._lane_counts[lane] += 1
+        if self._depth > self._high_water:
+            self._high_water = self._depth
+    
+    def _drop_for(self, event: Event) -> None:
+        lowest = max(lane for lane, count in enumerate(self._lane_counts) if count)
+        self._dropped += 1
+        if self._shards[self.shard_for(event.issue_id)].lane_of(event) >= lowest:
+            return
+        for shard in self._shards:
+            if shard.events.lowest_lane() == lowest:
+                _, offset, lane = shard.pop_lowest()
+                self._release(shard, lane, offset)
+                self._enqueue(event, self._append(event))
+                return
+    
+    def _release(self, shard: _Shard, lane: int, offset: Optional[int]) -> None:
+        self._depth -= 1
+        self._lane_counts[lane] -= 1
+        shard.unfinished -= 1
+        if shard.unfinished == 0:
+            shard.idle.set()
+        if offset is not None:
+            self._log.ack(offset)
+    
+    async def _wait_for_space(self) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._space_waiters.append(waiter)
+        try:
+            await waiter
+        finally:
+            if waiter in self._space_waiters:
+                self._space_waiters.remove(waiter)
+    
+    def _wake_publisher(self) -> None:
+        while self._space_waiters:
+            waiter = self._space_waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
     
     async def start(self) -> None:
         if self._running:
             return
         self._running = True
-        asyncio.create_task(self._process_events())
+        if self._log:
+            pending = self._log.open()
+            for offset, event in pending:
+                self._enqueue(event, offset)
+            if pending:
+                logger.info(f"Replaying {len(pending)} unacknowledged events from {self._log.directory}")
+            self._log_sync = asyncio.create_task(self._sync_log())
+        if self._transport:
+            await self._transport.start(self._receive)
+        self._tasks = [
+            asyncio.create_task(self._process_events(shard))
+            for shard in self._shards
+        ]
+        self._tasks.extend(
+            asyncio.create_task(subscription.run())
+            for subscriptions in self._batch_handlers.values()
+            for subscription in subscriptions
+        )
+        if self._reporter:
+            await self._reporter.start(self)
     
     async def stop(self) -> None:
         self._running = False
+        for task in self._tasks:
+            task.cancel()
+        for task in self._retrying:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._retrying, return_exceptions=True)
+        self._tasks = []
+        if self._reporter:
+            await self._reporter.stop(self)
+        if self._transport:
+            await self._transport.stop()
+        if self._log_sync:
+            # Not cancelled: a sync already in its thread must finish before
+            # close() writes the final offsets.
+            await self._log_sync
+            self._log_sync = None
+        if self._log:
+            self._log.close()
+    
+    async def join(self) -> None:
+        await asyncio.gather(*(shard.idle.wait() for shard in self._shards))
+        for subscriptions in self._batch_handlers.values():
+            for subscription in subscriptions:
+                await subscription.drain()
+        while self._retrying:
+            await asyncio.gather(*self._retrying, return_exceptions=True)
     
-    async def _process_events(self) -> None:
+    async def _sync_log(self) -> None:
         while self._running:
+            await asyncio.sleep(settings.event_log_sync_ms / 1000)
             try:
-                event = await asyncio.wait_for(self._queue.get(), timeout=1.0)
-                handlers = self._handlers.get(event.event_type, [])
-                if handlers:
-                    await asyncio.gather(
-                        *[handler(event) for handler in handlers],
-                        return_exceptions=True
-                    )
-                self._queue.task_done()
-            except asyncio.TimeoutError:
+                await self._log.sync()
+            except Exception as e:
+                logger.error(f"Failed to sync event log: {e}")
+    
+    def _schedule_retry(self, shard: _Shard, sub: _Subscription, event: Event, error: BaseException) -> asyncio.Task:
+        # Retries back off outside the shard consumer so one failing handler
+        # does not hold up every other issue on the shard; the issue's own
+        # later events wait on the shard until the retry settles.
+        shard.block(event.issue_id)
+        task = asyncio.create_task(self._retry(sub, event, error))
+        self._retrying.add(task)
+        task.add_done_callback(self._retrying.discard)
+        task.add_done_callback(lambda _: shard.unblock(event.issue_id))
+        return task
+    
+    async def _retry(self, sub: _Subscription, event: Event, error: BaseException) -> None:
+        error, attempts = await sub.retry(event, error)
+        if error is not None:
+            logger.error(f"Handler {sub.name} failed on {event.event_type} for issue {event.issue_id}: {error}")
+            sub.dead_lettered += 1
+            self.dead_letters.add(event, sub.name, error, attempts, subscription=sub)
+    
+    async def _process_events(self, shard: _Shard) -> None:
+        while self._running:
+            if shard.resumed:
+                entry = shard.resumed.popleft()
+            elif shard.events:
+                entry = shard.pop()
+                self._depth -= 1
+                self._lane_counts[entry[2]] -= 1
+                self._wake_publisher()
+            else:
+                shard.ready.clear()
+                await shard.ready.wait()
                 continue
-            except Exception:
+            if shard.hold(entry):
                 continue
+            event, offset, _ = entry
+            subscriptions, batch_subscriptions = self._subscriptions(event)
+            batches = [subscription.offer(event) for subscription in batch_subscriptions]
+            retries = []
+            try:
+                if subscriptions:
+                    errors = await asyncio.gather(*[sub._attempt(event) for sub in subscriptions])
+                    retries = [
+                        self._schedule_retry(shard, sub, event, error)
+                        for sub, error in zip(subscriptions, errors)
+                        if error is not None
+                    ]
+            finally:
+                shard.unfinished -= 1
+                if shard.unfinished == 0:
+                    shard.idle.set()
+            if batches or retries:
+                waiter = asyncio.gather(*batches, *retries, return_exceptions=True)
+                if offset is not None:
+                    waiter.add_done_callback(
+                        lambda done, offset=offset: done.cancelled() or any(done.result()) or self._log.ack(offset)
+                    )
+            elif offset is not None:
+                self._log.ack(offset)
 
 
 event_bus = EventBus()
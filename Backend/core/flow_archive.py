@@ -0,0 +1,174 @@
+import asyncio
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Optional
+
+from Backend.core.config import settings
+from Backend.core.logging import get_logger
+from Backend.utils.histogram import LatencyHistogram
+
+logger = get_logger(__name__)
+
+PIPELINE_AGENT = "Pipeline"
+HistogramKey = tuple[str, datetime, str]
+
+
+def _hour(timestamp: str) -> datetime:
+    return datetime.fromisoformat(timestamp).replace(minute=0, second=0, microsecond=0)
+
+
+# Finished flows are reduced to one compact archive row plus per-(agent, hour,
+# city) histogram increments. Both are buffered in memory and flushed in one
+# transaction, merging into the stored histograms, so latency percentiles are
+# read from a handful of histogram rows instead of scanning the archive.
+class FlowArchiveService:
+    def __init__(self, flush_interval_s: float = 30.0, max_pending: int = 5000):
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self._rows: list[dict] = []
+        self._histograms: dict[HistogramKey, LatencyHistogram] = defaultdict(LatencyHistogram)
+        self._task: Optional[asyncio.Task] = None
+        self.archived = 0
+        self.dropped = 0
+
+    def record(self, flow: Any) -> None:
+        if len(self._rows) >= self.max_pending:
+            self.dropped += 1
+            return
+
+        city = flow.city or ""
+        steps = []
+        for step in flow.steps:
+            steps.append([step.agent_name, step.status, step.duration_ms])
+            if step.duration_ms is not None:
+                self._histograms[(step.agent_name, _hour(step.started_at), city)].record(step.duration_ms)
+        if flow.total_duration_ms is not None:
+            self._histograms[(PIPELINE_AGENT, _hour(flow.started_at), city)].record(flow.total_duration_ms)
+
+        self._rows.append({
+            "issue_id": flow.issue_id,
+            "city": flow.city,
+            "status": flow.status,
+            "started_at": datetime.fromisoformat(flow.started_at),
+            "total_duration_ms": flow.total_duration_ms,
+            "steps": json.dumps(steps, separators=(",", ":")),
+        })
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        if not self._rows and not self._histograms:
+            return
+        rows, self._rows = self._rows, []
+        histograms, self._histograms = self._histograms, defaultdict(LatencyHistogram)
+        try:
+            await self._write(rows, histograms)
+            self.archived += len(rows)
+        except Exception as e:
+            self.dropped += len(rows)
+            logger.error(f"Failed to archive {len(rows)} flows: {e}")
+
+    async def _write(self, rows: list[dict], histograms: dict[HistogramKey, LatencyHistogram]) -> None:
+        from sqlalchemy import select, tuple_
+        from sqlalchemy.dialects.postgresql import insert
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import FlowArchive, LatencyHistogramRecord
+
+        async with get_db_context() as db:
+            if rows:
+                await db.execute(insert(FlowArchive).values(rows))
+            if not histograms:
+                return
+
+            keys = list(histograms)
+            await db.execute(
+                insert(LatencyHistogramRecord)
+                .values([
+                    {"agent_name": agent, "hour": hour, "city": city, "histogram": "{}"}
+                    for agent, hour, city in keys
+                ])
+                .on_conflict_do_nothing()
+            )
+            result = await db.execute(
+                select(LatencyHistogramRecord)
+                .where(tuple_(
+                    LatencyHistogramRecord.agent_name,
+                    LatencyHistogramRecord.hour,
+                    LatencyHistogramRecord.city,
+                ).in_(keys))
+                .with_for_update()
+            )
+            for record in result.scalars():
+                stored = LatencyHistogram.from_dict(json.loads(record.histogram))
+                stored.merge(histograms[(record.agent_name, record.hour, record.city)])
+                record.histogram = json.dumps(stored.to_dict(), separators=(",", ":"))
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending_flows": len(self._rows),
+            "pending_histograms": len(self._histograms),
+            "archived": self.archived,
+            "dropped": self.dropped,
+        }
+
+
+async def latency_report(
+    db,
+    since: datetime,
+    until: datetime,
+    group_by: list[str],
+    agent: Optional[str] = None,
+    city: Optional[str] = None,
+) -> list[dict]:
+    from sqlalchemy import select
+    from Backend.database.models import LatencyHistogramRecord
+
+    query = select(LatencyHistogramRecord).where(
+        LatencyHistogramRecord.hour >= since,
+        LatencyHistogramRecord.hour <= until,
+    )
+    if agent:
+        query = query.where(LatencyHistogramRecord.agent_name == agent)
+    if city:
+        query = query.where(LatencyHistogramRecord.city == city)
+    result = await db.execute(query)
+
+    groups: dict[tuple, LatencyHistogram] = defaultdict(LatencyHistogram)
+    for record in result.scalars():
+        key = [record.agent_name]
+        if "hour" in group_by:
+            key.append(record.hour.isoformat())
+        if "city" in group_by:
+            key.append(record.city or None)
+        groups[tuple(key)].merge(LatencyHistogram.from_dict(json.loads(record.histogram)))
+
+    report = []
+    for key, histogram in sorted(groups.items(), key=lambda item: tuple(str(k) for k in item[0])):
+        entry = {"agent_name": key[0]}
+        rest = list(key[1:])
+        if "hour" in group_by:
+            entry["hour"] = rest.pop(0)
+        if "city" in group_by:
+            entry["city"] = rest.pop(0)
+        report.append({**entry, **histogram.summary()})
+    return report
+
+
+flow_archive = FlowArchiveService(
+    flush_interval_s=settings.flow_archive_flush_interval_s,
+    max_pending=settings.flow_archive_max_pending,
+)
@@ -0,0 +1,224 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from typing import Any, Callable, Coroutine, Optional, Union
+from uuid import UUID
+
+from Backend.core.config import settings
+from Backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+OnChange = Callable[[UUID], Coroutine[Any, Any, None]]
+StoredMessage = tuple[int, str, str]
+
+
+class FlowStore(ABC):
+    async def start(self, on_change: OnChange) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    @abstractmethod
+    def record(self, issue_id: UUID, flow: Any, seq: int, message_type: str, payload: str) -> None:
+        pass
+
+    @abstractmethod
+    async def load(self, issue_id: UUID, after_seq: int = 0) -> Optional[tuple[dict, list[StoredMessage]]]:
+        pass
+
+    async def last_seq(self, issue_id: UUID) -> int:
+        return 0
+
+    async def flush(self) -> None:
+        # Returns once everything recorded so far is readable by load() and
+        # last_seq() in other workers.
+        pass
+
+    def stats(self) -> dict:
+        return {"store": type(self).__name__}
+
+
+class MemoryFlowStore(FlowStore):
+    # Flows live only in the process that runs the pipeline, so this suits
+    # only tests and tools that run pipelines in the API's own process;
+    # FLOW_STORE does not accept it.
+    def record(self, issue_id: UUID, flow: Any, seq: int, message_type: str, payload: str) -> None:
+        pass
+
+    async def load(self, issue_id: UUID, after_seq: int = 0) -> Optional[tuple[dict, list[StoredMessage]]]:
+        return None
+
+
+class PostgresFlowStore(FlowStore):
+    # Messages are written behind the pipeline by a single writer task, one
+    # transaction per batch, and each touched issue is announced over
+    # LISTEN/NOTIFY so mirrors in other workers can pull the new messages.
+    def __init__(self, dsn: str, channel: str = "urbanlens_flows", batch_size: int = 200):
+        from Backend.core.event_transport import PostgresTransport
+
+        self.batch_size = batch_size
+        self._notifier = PostgresTransport(dsn, channel=channel)
+        self._outbox: asyncio.Queue[Union[tuple[UUID, Any, int, str, str], asyncio.Future]] = asyncio.Queue(maxsize=10000)
+        self._on_change: Optional[OnChange] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._last_purge = 0.0
+        self.written = 0
+        self.dropped = 0
+
+    async def start(self, on_change: OnChange) -> None:
+        self._on_change = on_change
+        await self._notifier.start(self._notified)
+        self._writer = asyncio.create_task(self._write_loop())
+
+    async def stop(self) -> None:
+        if self._writer:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self._notifier.stop()
+
+    def record(self, issue_id: UUID, flow: Any, seq: int, message_type: str, payload: str) -> None:
+        try:
+            self._outbox.put_nowait((issue_id, flow, seq, message_type, payload))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def flush(self) -> None:
+        # A marker behind the pending messages; the writer resolves it once
+        # the batch before it is written (or failed).
+        if self._writer is None or self._writer.done():
+            return
+        written = asyncio.get_running_loop().create_future()
+        await self._outbox.put(written)
+        try:
+            await asyncio.wait_for(asyncio.shield(written), timeout=settings.flow_store_flush_timeout_s)
+        except asyncio.TimeoutError:
+            logger.warning(f"Flow store flush timed out with {self._outbox.qsize()} messages pending")
+
+    async def load(self, issue_id: UUID, after_seq: int = 0) -> Optional[tuple[dict, list[StoredMessage]]]:
+        from sqlalchemy import select
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import FlowMessageRecord, FlowState
+
+        async with get_db_context() as db:
+            state = await db.get(FlowState, issue_id)
+            if state is None:
+                return None
+            result = await db.execute(
+                select(FlowMessageRecord.seq, FlowMessageRecord.message_type, FlowMessageRecord.payload)
+                .where(FlowMessageRecord.issue_id == issue_id, FlowMessageRecord.seq > after_seq)
+                .order_by(FlowMessageRecord.seq.desc())
+                .limit(settings.flow_history_max_messages)
+            )
+            return json.loads(state.snapshot), [tuple(row) for row in reversed(result.all())]
+
+    async def last_seq(self, issue_id: UUID) -> int:
+        from sqlalchemy import select
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import FlowState
+
+        async with get_db_context() as db:
+            result = await db.execute(select(FlowState.last_seq).where(FlowState.issue_id == issue_id))
+            return result.scalar_one_or_none() or 0
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "pending": self._outbox.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "notifier": self._notifier.stats(),
+        }
+
+    async def _notified(self, message: str) -> None:
+        if self._on_change:
+            await self._on_change(UUID(message))
+
+    async def _write_loop(self) -> None:
+        while True:
+            batch, flushed = [], []
+            item = await self._outbox.get()
+            while True:
+                if isinstance(item, asyncio.Future):
+                    flushed.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size or self._outbox.empty():
+                    break
+                item = self._outbox.get_nowait()
+            try:
+                if batch:
+                    await self._write(batch)
+                    self.written += len(batch)
+            except Exception as e:
+                self.dropped += len(batch)
+                logger.error(f"Failed to persist {len(batch)} flow messages: {e}")
+            for written in flushed:
+                if not written.done():
+                    written.set_result(None)
+            await self._maybe_purge()
+
+    async def _write(self, batch: list[tuple[UUID, Any, int, str, str]]) -> None:
+        from sqlalchemy.dialects.postgresql import insert
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import FlowMessageRecord, FlowState
+
+        latest: dict[UUID, tuple[Any, int]] = {}
+        for issue_id, flow, seq, _, _ in batch:
+            latest[issue_id] = (flow, seq)
+
+        async with get_db_context() as db:
+            for issue_id, (flow, seq) in latest.items():
+                values = {
+                    "issue_id": issue_id,
+                    "status": flow.status,
+                    "last_seq": seq,
+                    "snapshot": json.dumps(flow.to_dict(), default=str),
+                    "updated_at": datetime.utcnow(),
+                }
+                await db.execute(
+                    insert(FlowState).values(**values).on_conflict_do_update(
+                        index_elements=[FlowState.issue_id],
+                        set_={k: v for k, v in values.items() if k != "issue_id"},
+                    )
+                )
+            await db.execute(
+                insert(FlowMessageRecord).values([
+                    {"issue_id": issue_id, "seq": seq, "message_type": message_type, "payload": payload}
+                    for issue_id, _, seq, message_type, payload in batch
+                ]).on_conflict_do_nothing()
+            )
+
+        for issue_id in latest:
+            self._notifier.send(str(issue_id))
+
+    async def _maybe_purge(self) -> None:
+        now = asyncio.get_running_loop().time()
+        if now - self._last_purge < 60:
+            return
+        self._last_purge = now
+
+        from sqlalchemy import delete
+        from Backend.database.connection import get_db_context
+        from Backend.database.models import FlowState
+
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.flow_retention_s)
+        try:
+            async with get_db_context() as db:
+                await db.execute(delete(FlowState).where(FlowState.updated_at < cutoff))
+        except Exception as e:
+            logger.warning(f"Failed to purge expired flows: {e}")
+
+
+def create_flow_store(kind: str) -> FlowStore:
+    if kind == "memory":
+        return MemoryFlowStore()
+    if kind == "postgres":
+        return PostgresFlowStore(settings.event_transport_dsn or settings.database_url)
+    raise ValueError(f"Unknown flow store: {kind}")
+
+
+flow_store = create_flow_store(settings.flow_store)
@@ -1,16 +1,21 @@
 import asyncio
 import json
+import time
+from collections import deque
 from datetime import datetime
 from typing import Optional, Callable, Any
 from uuid import UUID
 from dataclasses import dataclass, field, asdict
 
+from Backend.core.config import settings
+from Backend.core.flow_archive import flow_archive
+from Backend.core.flow_store import flow_store
 from Backend.core.logging import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentStep:
     agent_name: str
     status: str
@@ -23,10 +28,11 @@ class AgentStep:
     error: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineFlow:
     issue_id: UUID
     started_at: str
+    city: Optional[str] = None
     status: str = "running"
     completed_at: Optional[str] = None
     total_duration_ms: Optional[float] = None
@@ -37,68 +43,144 @@ class PipelineFlow:
         return {
             "issue_id": str(self.issue_id),
             "started_at": self.started_at,
+            "city": self.city,
             "status": self.status,
             "completed_at": self.completed_at,
             "total_duration_ms": self.total_duration_ms,
             "steps": [asdict(s) for s in self.steps],
             "final_result": self.final_result,
         }
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "PipelineFlow":
+        return cls(
+            issue_id=UUID(data["issue_id"]),
+            started_at=data["started_at"],
+            city=data.get("city"),
+            status=data["status"],
+            completed_at=data.get("completed_at"),
+            total_duration_ms=data.get("total_duration_ms"),
+            steps=[AgentStep(**step) for step in data.get("steps", [])],
+            final_result=data.get("final_result"),
+        )
+
+
+def sse_frame(payload: str, seq: Optional[int] = None) -> bytes:
+    if seq is None:
+        return f"data: {payload}\n\n".encode()
+    return f"id: {seq}\ndata: {payload}\n\n".encode()
+
+
+@dataclass(slots=True)
+class FlowMessage:
+    seq: int
+    type: str
+    payload: str
+    frame: bytes
+    
+    @classmethod
+    def build(cls, seq: int, message_type: str, payload: str) -> "FlowMessage":
+        return cls(seq=seq, type=message_type, payload=payload, frame=sse_frame(payload, seq))
+    
+    @property
+    def size(self) -> int:
+        return len(self.payload) + len(self.frame)
 
 
 class FlowTracker:
-    def __init__(self, issue_id: UUID):
+    def __init__(self, issue_id: UUID, seq: int = 0, remote: bool = False, city: Optional[str] = None):
         self.flow = PipelineFlow(
             issue_id=issue_id,
             started_at=datetime.utcnow().isoformat(),
+            city=city,
         )
         self._start_time = datetime.utcnow()
         self._subscribers: list[asyncio.Queue] = []
+        self.dropped = 0
+        self._history: deque[FlowMessage] = deque()
+        self._history_bytes = 0
+        self._seq = seq
+        self.remote = remote
+        self.last_activity = time.monotonic()
+    
+    @classmethod
+    def mirror(cls, snapshot: dict, messages: list[tuple[int, str, str]]) -> "FlowTracker":
+        # A read-only copy of a flow running in another worker, kept current
+        # from the flow store's change notifications.
+        tracker = cls(UUID(snapshot["issue_id"]), remote=True)
+        tracker.apply(snapshot, messages)
+        return tracker
+    
+    def apply(self, snapshot: dict, messages: list[tuple[int, str, str]]) -> None:
+        self.flow = PipelineFlow.from_dict(snapshot)
+        for seq, message_type, payload in messages:
+            if seq > self._seq:
+                self._seq = seq
+                self._deliver(FlowMessage.build(seq, message_type, payload))
+    
+    @property
+    def finished(self) -> bool:
+        return self.flow.status in ("completed", "error")
+    
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+    
+    def history_since(self, last_seq: int) -> Optional[list[FlowMessage]]:
+        # None means the client fell behind the ring buffer and must resync.
+        if last_seq > self._seq:
+            return None
+        if self._history and last_seq < self._history[0].seq - 1:
+            return None
+        if not self._history and last_seq < self._seq:
+            return None
+        return [message for message in self._history if message.seq > last_seq]
     
     def subscribe(self) -> asyncio.Queue:
-        queue = asyncio.Queue()
-        
-        
-        for step in self.flow.steps:
-            if step.started_at:
-                queue.put_nowait({
-                    "type": "step_started",
-                    "timestamp": step.started_at,
-                    "data": {
-                        "agent_name": step.agent_name, 
-                        "step_index": self.flow.steps.index(step)
-                    }
-                })
-            
-            
-            if step.status in ("completed", "error"):
-                 queue.put_nowait({
-                    "type": "step_completed" if step.status == "completed" else "step_error",
-                    "timestamp": step.completed_at,
-                    "data": {
-                        "agent_name": step.agent_name,
-                        "status": step.status,
-                        "decision": step.decision,
-                        "reasoning": step.reasoning,
-                        "result": step.result,
-                        "error": step.error
-                    }
-                })
-
+        queue = asyncio.Queue(maxsize=settings.flow_subscriber_queue_size)
         self._subscribers.append(queue)
+        self.last_activity = time.monotonic()
         return queue
     
     def unsubscribe(self, queue: asyncio.Queue):
         if queue in self._subscribers:
             self._subscribers.remove(queue)
+        self.last_activity = time.monotonic()
     
     async def _broadcast(self, event_type: str, data: dict):
-        message = {
+        self._seq += 1
+        payload = json.dumps({
             "type": event_type,
             "timestamp": datetime.utcnow().isoformat(),
             "data": data,
-        }
+        }, default=str)
+        message = FlowMessage.build(self._seq, event_type, payload)
+        self._deliver(message)
+        flow_store.record(self.flow.issue_id, self.flow, message.seq, message.type, message.payload)
+    
+    def _deliver(self, message: FlowMessage) -> None:
+        self._remember(message)
+        
+        # A slow client never blocks the pipeline: its oldest frame is dropped
+        # and the stream fills the gap from the ring buffer on its next read.
         for queue in self._subscribers:
-            await queue.put(message)
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+        
+        for watcher in _watchers_for(self.flow.issue_id, self.flow.city):
+            watcher.offer(self.flow.issue_id, message)
+    
+    def _remember(self, message: FlowMessage) -> None:
+        self._history.append(message)
+        self._history_bytes += message.size
+        while len(self._history) > 1 and (
+            len(self._history) > settings.flow_history_max_messages
+            or self._history_bytes > settings.flow_history_max_bytes
+        ):
+            self._history_bytes -= self._history.popleft().size
+        self.last_activity = time.monotonic()
     
     async def start_step(self, agent_name: str):
         step = AgentStep(
@@ -154,6 +236,7 @@ class FlowTracker:
         self.flow.final_result = final_result
         
         await self._broadcast("flow_completed", self.flow.to_dict())
+        flow_archive.record(self.flow)
     
     async def error_flow(self, error: str):
         now = datetime.utcnow()
@@ -165,24 +248,173 @@ class FlowTracker:
             "error": error,
             "flow": self.flow.to_dict(),
         })
+        flow_archive.record(self.flow)
 
 
 _active_flows: dict[UUID, FlowTracker] = {}
+_issue_watchers: dict[UUID, set["FlowWatcher"]] = {}
+_city_watchers: dict[str, set["FlowWatcher"]] = {}
+
+
+class FlowWatcher:
+    # One multiplexed subscription over many flows, selected by issue id or
+    # by city. Items are (issue_id, message); a None message asks the sender
+    # for a fresh snapshot of that flow.
+    def __init__(self, maxsize: Optional[int] = None):
+        self.queue: asyncio.Queue[tuple[UUID, Optional[FlowMessage]]] = asyncio.Queue(
+            maxsize=maxsize or settings.flow_subscriber_queue_size * 4
+        )
+        self.issues: set[UUID] = set()
+        self.cities: set[str] = set()
+        self.sent: dict[UUID, int] = {}
+        self.dropped = 0
+    
+    def offer(self, issue_id: UUID, message: Optional[FlowMessage]) -> None:
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((issue_id, message))
+    
+    def watch_issue(self, issue_id: UUID) -> None:
+        self.issues.add(issue_id)
+        _issue_watchers.setdefault(issue_id, set()).add(self)
+    
+    def watch_city(self, city: str) -> None:
+        city = city.lower()
+        self.cities.add(city)
+        _city_watchers.setdefault(city, set()).add(self)
+    
+    def unwatch_issue(self, issue_id: UUID) -> None:
+        self.issues.discard(issue_id)
+        self.sent.pop(issue_id, None)
+        _discard(_issue_watchers, issue_id, self)
+    
+    def unwatch_city(self, city: str) -> None:
+        city = city.lower()
+        self.cities.discard(city)
+        _discard(_city_watchers, city, self)
+    
+    def close(self) -> None:
+        for issue_id in list(self.issues):
+            self.unwatch_issue(issue_id)
+        for city in list(self.cities):
+            self.unwatch_city(city)
+    
+    def resume(self, tracker: FlowTracker, last_seq: Optional[int] = None) -> None:
+        issue_id = tracker.flow.issue_id
+        missed = tracker.history_since(last_seq) if last_seq is not None else None
+        if missed is None:
+            self.sent.pop(issue_id, None)
+            self.offer(issue_id, None)
+            return
+        self.sent[issue_id] = last_seq
+        for message in missed:
+            self.offer(issue_id, message)
+
+
+def _discard(index: dict, key: Any, watcher: FlowWatcher) -> None:
+    watchers = index.get(key)
+    if watchers:
+        watchers.discard(watcher)
+        if not watchers:
+            del index[key]
+
+
+def _watchers_for(issue_id: UUID, city: Optional[str]) -> set[FlowWatcher]:
+    watchers = _issue_watchers.get(issue_id, set())
+    if city and _city_watchers:
+        by_city = _city_watchers.get(city.lower())
+        if by_city:
+            watchers = watchers | by_city
+    return watchers
+
+
+def evict_idle_flows() -> int:
+    now = time.monotonic()
+    idle = [
+        issue_id for issue_id, tracker in _active_flows.items()
+        if not tracker._subscribers and now - tracker.last_activity > settings.flow_idle_ttl_s
+    ]
+    for issue_id in idle:
+        del _active_flows[issue_id]
+    
+    overflow = len(_active_flows) - settings.flow_max_tracked
+    if overflow > 0:
+        finished = sorted(
+            (tracker.last_activity, issue_id)
+            for issue_id, tracker in _active_flows.items()
+            if tracker.finished and not tracker._subscribers
+        )
+        for _, issue_id in finished[:overflow]:
+            del _active_flows[issue_id]
+            idle.append(issue_id)
+    return len(idle)
 
 
 def get_flow_tracker(issue_id: UUID) -> Optional[FlowTracker]:
     return _active_flows.get(issue_id)
 
 
-def create_flow_tracker(issue_id: UUID) -> FlowTracker:
-    if issue_id in _active_flows:
-        return _active_flows[issue_id]
+async def load_flow_tracker(issue_id: UUID) -> Optional[FlowTracker]:
+    tracker = _active_flows.get(issue_id)
+    if tracker:
+        return tracker
+    
+    stored = await flow_store.load(issue_id)
+    if stored is None:
+        return None
+    evict_idle_flows()
+    return _active_flows.setdefault(issue_id, FlowTracker.mirror(*stored))
+
+
+async def on_flow_changed(issue_id: UUID) -> None:
+    tracker = _active_flows.get(issue_id)
+    if tracker is None:
+        # Mirror unseen flows only when someone here watches a whole city.
+        if _city_watchers:
+            stored = await flow_store.load(issue_id)
+            if stored and (stored[0].get("city") or "").lower() in _city_watchers:
+                tracker = _active_flows.setdefault(issue_id, FlowTracker.mirror(*stored))
+                for watcher in _watchers_for(issue_id, tracker.flow.city):
+                    watcher.resume(tracker)
+        return
+    if not tracker.remote:
+        return
+    stored = await flow_store.load(issue_id, after_seq=tracker.last_seq)
+    if stored:
+        tracker.apply(*stored)
+
+
+async def create_flow_tracker(issue_id: UUID, city: Optional[str] = None) -> FlowTracker:
+    previous = _active_flows.get(issue_id)
+    if previous and not previous.finished and not previous.remote:
+        if city and not previous.flow.city:
+            previous.flow.city = city
+        return previous
     
-    tracker = FlowTracker(issue_id)
+    seq = await flow_store.last_seq(issue_id)
+    if previous:
+        seq = max(seq, previous.last_seq)
+        city = city or previous.flow.city
+    evict_idle_flows()
+    tracker = FlowTracker(issue_id, seq=seq, city=city)
     _active_flows[issue_id] = tracker
+    for watcher in _watchers_for(issue_id, city):
+        watcher.resume(tracker)
     return tracker
 
 
+def hand_off_flow_tracker(issue_id: UUID) -> None:
+    # Once the pipeline is queued a worker writes the flow, so the tracker
+    # here follows the store like any other mirror.
+    tracker = _active_flows.get(issue_id)
+    if tracker and not tracker.finished:
+        tracker.remote = True
+
+
 def remove_flow_tracker(issue_id: UUID):
-    if issue_id in _active_flows:
+    # Finished flows stay readable so reconnecting clients can catch up; they
+    # are dropped once idle for flow_idle_ttl_s or when over flow_max_tracked.
+    tracker = _active_flows.get(issue_id)
+    if tracker and not tracker.finished:
         del _active_flows[issue_id]
@@ -0,0 +1,94 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from Backend.core.config import settings
+from Backend.core.logging import get_logger
+from Backend.database.connection import get_db_context
+from Backend.database.models import IdempotencyRecord
+
+logger = get_logger(__name__)
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+# Keys are stored behind their scope in a String(300) column.
+MAX_KEY_LENGTH = 200
+
+
+async def claim_idempotency_key(key: str) -> Optional[JSONResponse]:
+    # The key is claimed in its own committed transaction, so a concurrent
+    # retry sees it at once. Returns the stored response for a replay, or
+    # None when this request now owns the key.
+    now = datetime.utcnow()
+    async with get_db_context() as db:
+        await db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.expires_at < now))
+        result = await db.execute(
+            insert(IdempotencyRecord)
+            .values(key=key, expires_at=now + timedelta(seconds=settings.idempotency_ttl_s))
+            .on_conflict_do_nothing()
+            .returning(IdempotencyRecord.key)
+        )
+        if result.scalar_one_or_none():
+            return None
+        record = (await db.execute(select(IdempotencyRecord).where(IdempotencyRecord.key == key))).scalar_one_or_none()
+
+    if record is None or record.response is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still being processed",
+        )
+    return JSONResponse(
+        content=json.loads(record.response),
+        status_code=record.status_code,
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def save_idempotent_response(key: str, status_code: int, content: Any) -> None:
+    async with get_db_context() as db:
+        record = await db.get(IdempotencyRecord, key)
+        if record:
+            record.status_code = status_code
+            record.response = json.dumps(content)
+
+
+async def release_idempotency_key(key: str) -> None:
+    async with get_db_context() as db:
+        await db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key == key))
+
+
+async def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    status_code: int,
+    handler: Callable[[], Awaitable[Any]],
+) -> Any:
+    # Runs the handler once per (scope, key) within IDEMPOTENCY_TTL_S; retries
+    # get the first response back. A handler that fails frees the key again.
+    if not key:
+        return await handler()
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters",
+        )
+
+    scoped_key = f"{scope}:{key}"
+    replay = await claim_idempotency_key(scoped_key)
+    if replay is not None:
+        logger.info(f"Replaying response for idempotency key {scoped_key}")
+        return replay
+
+    try:
+        response = await handler()
+    except BaseException:
+        await release_idempotency_key(scoped_key)
+        raise
+
+    await save_idempotent_response(scoped_key, status_code, jsonable_encoder(response))
+    return response
@@ -0,0 +1,74 @@
+from collections import deque
+from typing import Generic, Sequence, TypeVar
+
+from Backend.core.config import settings
+
+T = TypeVar("T")
+
+
+def lane_for(urgency: int, lanes: int) -> int:
+    return min(max(int(urgency), 1), lanes) - 1
+
+
+class WeightedLanes(Generic[T]):
+    # Smooth weighted round-robin over the non-empty lanes: with weights
+    # 8/4/2/1 a saturated lane 0 gets 8 of every 15 pops, yet lane 3 is never
+    # starved. Lane 0 is the most urgent.
+    def __init__(self, weights: Sequence[int] = ()):
+        weights = list(weights or settings.priority_lane_weights)
+        self._weights = [max(1, w) for w in weights]
+        self._lanes: list[deque[T]] = [deque() for _ in weights]
+        self._current = [0] * len(weights)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __bool__(self) -> bool:
+        return self._size > 0
+
+    @property
+    def lane_count(self) -> int:
+        return len(self._lanes)
+
+    def sizes(self) -> list[int]:
+        return [len(lane) for lane in self._lanes]
+
+    def push(self, lane: int, item: T) -> None:
+        self._lanes[lane].append(item)
+        self._size += 1
+
+    def pop(self) -> T:
+        if not self._size:
+            raise IndexError("pop from empty WeightedLanes")
+        best = self.pick([bool(lane) for lane in self._lanes])
+        self._size -= 1
+        return self._lanes[best].popleft()
+
+    def pick(self, ready: Sequence[bool]) -> int:
+        # Advances the round-robin over the lanes marked ready and returns the
+        # one whose turn it is, for callers whose items live elsewhere.
+        best = -1
+        total = 0
+        for index, is_ready in enumerate(ready):
+            if not is_ready:
+                continue
+            self._current[index] += self._weights[index]
+            total += self._weights[index]
+            if best < 0 or self._current[index] > self._current[best]:
+                best = index
+        self._current[best] -= total
+        return best
+
+    def pop_lowest(self) -> tuple[int, T]:
+        for index in range(len(self._lanes) - 1, -1, -1):
+            if self._lanes[index]:
+                self._size -= 1
+                return index, self._lanes[index].pop()
+        raise IndexError("pop from empty WeightedLanes")
+
+    def lowest_lane(self) -> int:
+        for index in range(len(self._lanes) - 1, -1, -1):
+            if self._lanes[index]:
+                return index
+        return -1
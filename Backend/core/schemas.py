@@ -53,6 +53,33 @@ CLASS_ID_TO_CATEGORY = {
 }
 
 
+CATEGORY_PRIORITY = {
+    IssueCategory.DAMAGED_ELECTRIC: PriorityLevel.CRITICAL,
+    IssueCategory.POTHOLE: PriorityLevel.HIGH,
+    IssueCategory.DAMAGED_ROAD: PriorityLevel.HIGH,
+    IssueCategory.FALLEN_TREE: PriorityLevel.HIGH,
+    IssueCategory.GARBAGE: PriorityLevel.MEDIUM,
+    IssueCategory.BROKEN_SIGN: PriorityLevel.MEDIUM,
+    IssueCategory.DAMAGED_CONCRETE: PriorityLevel.MEDIUM,
+    IssueCategory.DEAD_ANIMAL: PriorityLevel.MEDIUM,
+    IssueCategory.ILLEGAL_PARKING: PriorityLevel.LOW,
+    IssueCategory.VANDALISM: PriorityLevel.LOW,
+}
+
+CATEGORY_DEPARTMENT = {
+    IssueCategory.DAMAGED_ROAD: "PWD",
+    IssueCategory.POTHOLE: "PWD",
+    IssueCategory.FALLEN_TREE: "PWD",
+    IssueCategory.DAMAGED_CONCRETE: "PWD",
+    IssueCategory.DAMAGED_ELECTRIC: "PWD",
+    IssueCategory.VANDALISM: "PWD",
+    IssueCategory.GARBAGE: "SANITATION",
+    IssueCategory.DEAD_ANIMAL: "SANITATION",
+    IssueCategory.BROKEN_SIGN: "TRAFFIC",
+    IssueCategory.ILLEGAL_PARKING: "TRAFFIC",
+}
+
+
 class Coordinates(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text, func
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, func
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -172,3 +172,135 @@ class Escalation(Base):
     notified_emails: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+
+class FlowState(Base):
+    __tablename__ = "flow_states"
+    
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    last_seq: Mapped[int] = mapped_column(Integer, default=0)
+    snapshot: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now(), index=True)
+
+
+class FlowMessageRecord(Base):
+    __tablename__ = "flow_messages"
+    
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("flow_states.issue_id", ondelete="CASCADE"), primary_key=True)
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)
+    message_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class FlowArchive(Base):
+    __tablename__ = "flow_archive"
+    
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), index=True)
+    city: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False)
+    
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    total_duration_ms: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    steps: Mapped[str] = mapped_column(Text, nullable=False)
+
+
+class LatencyHistogramRecord(Base):
+    __tablename__ = "latency_histograms"
+    
+    agent_name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+    city: Mapped[str] = mapped_column(String(100), primary_key=True, default="")
+    histogram: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+
+
+class PipelineJobRecord(Base):
+    __tablename__ = "pipeline_jobs"
+    __table_args__ = (
+        Index("ix_pipeline_jobs_claim", "status", "lane", "created_at"),
+    )
+    
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), index=True)
+    pipeline: Mapped[str] = mapped_column(String(30), nullable=False)
+    inputs: Mapped[str] = mapped_column(Text, nullable=False, default="{}")
+    lane: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    resumes: Mapped[int] = mapped_column(Integer, default=0)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    locked_until: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class PipelineCheckpoint(Base):
+    __tablename__ = "pipeline_checkpoints"
+    
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), primary_key=True)
+    pipeline: Mapped[str] = mapped_column(String(30), primary_key=True)
+    step: Mapped[str] = mapped_column(String(50), primary_key=True)
+    output: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+
+
+class DegradedDecision(Base):
+    __tablename__ = "degraded_decisions"
+    __table_args__ = (Index("ix_degraded_decisions_pending", "reevaluated_at", "created_at"),)
+    
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), ForeignKey("issues.id", ondelete="CASCADE"), index=True)
+    agent_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    decision: Mapped[str] = mapped_column(Text, nullable=False)
+    outcome: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    reevaluated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class EventHandlerStatsRecord(Base):
+    __tablename__ = "event_handler_stats"
+    
+    node: Mapped[str] = mapped_column(String(100), primary_key=True)
+    event_type: Mapped[str] = mapped_column(String(100), primary_key=True)
+    handler: Mapped[str] = mapped_column(String(200), primary_key=True)
+    stats: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=func.now(), index=True)
+
+
+class EventDeadLetterRecord(Base):
+    __tablename__ = "event_dead_letters"
+    
+    id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
+    node: Mapped[str] = mapped_column(String(100), nullable=False)
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    issue_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), index=True)
+    handler: Mapped[str] = mapped_column(String(200), nullable=False, index=True)
+    error: Mapped[str] = mapped_column(Text, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    event: Mapped[str] = mapped_column(Text, nullable=False)
+    
+    failed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    redeliver_requested_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)
+
+
+class IdempotencyRecord(Base):
+    __tablename__ = "idempotency_keys"
+    
+    key: Mapped[str] = mapped_column(String(300), primary_key=True)
+    status_code: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    response: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
@@ -0,0 +1,82 @@
+import math
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from Backend.core.config import settings
+from Backend.database.connection import get_db_context
+from Backend.database.models import PipelineJobRecord
+
+
+class PipelineQueueFull(Exception):
+    def __init__(self, queued: int, retry_after_s: int):
+        super().__init__(f"Pipeline queue is full ({queued} waiting)")
+        self.queued = queued
+        self.retry_after_s = retry_after_s
+
+
+# Workers cap how many pipelines run at once (see PipelineJobQueue.claim);
+# this caps how many may wait, and tells waiting flows where they stand.
+class PipelineAdmission:
+    def __init__(self, max_queued: Optional[int] = None, refresh_s: Optional[float] = None):
+        self.max_queued = max_queued or settings.pipeline_max_queued
+        self.refresh_s = refresh_s or settings.pipeline_queue_poll_s
+        self._positions: dict[UUID, int] = {}
+        self._waiting = 0
+        self._refreshed = 0.0
+        self.rejected = 0
+
+    async def admit(self, db: AsyncSession) -> None:
+        queued = (await db.execute(
+            select(func.count()).select_from(PipelineJobRecord).where(PipelineJobRecord.status == "queued")
+        )).scalar() or 0
+        if queued >= self.max_queued:
+            self.rejected += 1
+            raise PipelineQueueFull(queued, await self._retry_after(db, queued - self.max_queued + 1))
+
+    async def position(self, issue_id: UUID) -> Optional[dict]:
+        # One ranking query per refresh interval serves every waiting stream
+        # in this process.
+        if time.monotonic() - self._refreshed >= self.refresh_s:
+            await self._refresh()
+        position = self._positions.get(issue_id)
+        if position is None:
+            return None
+        return {"position": position, "waiting": self._waiting}
+
+    def stats(self) -> dict:
+        return {
+            "max_in_flight": settings.pipeline_max_in_flight,
+            "max_queued": self.max_queued,
+            "waiting": self._waiting,
+            "rejected": self.rejected,
+        }
+
+    async def _refresh(self) -> None:
+        rank = func.row_number().over(order_by=(PipelineJobRecord.lane, PipelineJobRecord.created_at))
+        async with get_db_context() as db:
+            result = await db.execute(
+                select(PipelineJobRecord.issue_id, rank).where(PipelineJobRecord.status == "queued")
+            )
+            self._positions = {issue_id: position for issue_id, position in result.all()}
+        self._waiting = len(self._positions)
+        self._refreshed = time.monotonic()
+
+    async def _retry_after(self, db: AsyncSession, excess: int) -> int:
+        # Time for the pipelines ahead to drain at the recent average runtime.
+        since = datetime.utcnow() - timedelta(hours=1)
+        mean_s = (await db.execute(
+            select(func.avg(func.extract("epoch", PipelineJobRecord.finished_at - PipelineJobRecord.started_at)))
+            .where(PipelineJobRecord.status == "done", PipelineJobRecord.finished_at >= since)
+        )).scalar()
+        if not mean_s:
+            return settings.pipeline_retry_after_s
+        estimate = math.ceil(excess * float(mean_s) / max(1, settings.pipeline_max_in_flight))
+        return min(max(estimate, 1), 600)
+
+
+pipeline_admission = PipelineAdmission()
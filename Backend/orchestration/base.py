@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar
+from typing import Any, Optional, TypeVar
 from uuid import UUID
 
 from Backend.core.events import Event, EventBus, event_bus
@@ -14,12 +14,19 @@ class BaseAgent(ABC):
         self.logger: AgentLogger = get_logger(f"agent.{name}", agent_name=name)
         self._event_bus = event_bus
     
-    def subscribe(self, event_type: type[E]) -> None:
-        self._event_bus.subscribe(event_type, self.handle)
+    def subscribe(self, event_type: type[E], **options: Any) -> None:
+        self._event_bus.subscribe(event_type, self.handle, **options)
+    
+    def subscribe_batch(self, event_type: type[E], max_size: Optional[int] = None, max_wait_ms: Optional[float] = None, **options: Any) -> None:
+        self._event_bus.subscribe_batch(event_type, self.handle_batch, max_size, max_wait_ms, **options)
     
     @abstractmethod
     async def handle(self, event: E) -> None:
         pass
     
+    async def handle_batch(self, events: list[E]) -> None:
+        for event in events:
+            await self.handle(event)
+    
     def log_decision(self, issue_id: UUID, decision: str, reasoning: str) -> None:
         self.logger.log_decision(issue_id, decision, reasoning)
@@ -0,0 +1,40 @@
+import json
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import delete, select
+
+from Backend.database.models import PipelineCheckpoint
+
+
+class PipelineCheckpoints:
+    # Each step's output is added to the pipeline's own session. Concurrent
+    # steps share that session, so the graph commits only at join points,
+    # when no step is running; a checkpoint is then never committed without
+    # its step's writes, nor a step's writes without its checkpoint.
+    def __init__(self, db: Any, issue_id: UUID, pipeline: str):
+        self.db = db
+        self.issue_id = issue_id
+        self.pipeline = pipeline
+
+    async def load(self) -> dict[str, Any]:
+        result = await self.db.execute(
+            select(PipelineCheckpoint.step, PipelineCheckpoint.output)
+            .where(PipelineCheckpoint.issue_id == self.issue_id, PipelineCheckpoint.pipeline == self.pipeline)
+        )
+        return {step: json.loads(output) for step, output in result.all()}
+
+    async def save(self, step: str, output: Any) -> None:
+        self.db.add(PipelineCheckpoint(
+            issue_id=self.issue_id,
+            pipeline=self.pipeline,
+            step=step,
+            output=json.dumps(output),
+        ))
+    
+    async def commit(self) -> None:
+        await self.db.commit()
+
+
+async def clear_checkpoints(db: Any, issue_id: UUID) -> None:
+    await db.execute(delete(PipelineCheckpoint).where(PipelineCheckpoint.issue_id == issue_id))
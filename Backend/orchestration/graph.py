@@ -0,0 +1,235 @@
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID
+
+from Backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class SharedSession:
+    # Concurrent steps share the pipeline's AsyncSession, which allows only one
+    # operation in flight; awaited calls take turns on a lock while the steps'
+    # LLM and network work overlaps.
+    _SERIALIZED = frozenset({
+        "execute", "scalar", "scalars", "get", "flush", "commit",
+        "rollback", "refresh", "delete", "merge",
+    })
+
+    def __init__(self, session: Any):
+        self.session = session
+        self._lock = asyncio.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.session, name)
+        if name not in self._SERIALIZED:
+            return attr
+
+        async def serialized(*args, **kwargs):
+            async with self._lock:
+                return await attr(*args, **kwargs)
+        return serialized
+
+
+@dataclass
+class PipelineContext:
+    issue_id: UUID
+    db: SharedSession
+    tracker: Any = None
+    checkpoints: Any = None
+
+
+@dataclass
+class StepReport:
+    decision: str
+    reasoning: str
+    result: Optional[dict] = None
+
+
+@dataclass(frozen=True)
+class Step:
+    # `run` is called with the context and the outputs named in `needs` as
+    # keyword arguments; its return value becomes this step's output. A step
+    # is skipped when any of its needs was skipped or `when` says no, and
+    # `after` only orders it behind other steps. Steps sharing an `agent`
+    # form one tracker step, completed by the one that has a `report`.
+    # With checkpoints on the context, `encode` turns the output into JSON
+    # and `decode` rebuilds it when a resumed run skips the step.
+    name: str
+    run: Callable[..., Awaitable[Any]]
+    needs: tuple[str, ...] = ()
+    after: tuple[str, ...] = ()
+    when: Optional[Callable[..., bool]] = None
+    agent: Optional[str] = None
+    report: Optional[Callable[[Any], StepReport]] = None
+    encode: Callable[[Any], Any] = lambda output: output
+    decode: Optional[Callable[[PipelineContext, Any], Awaitable[Any]]] = None
+
+
+@dataclass
+class StepTiming:
+    start_ms: float
+    end_ms: float
+
+    @property
+    def duration_ms(self) -> float:
+        return self.end_ms - self.start_ms
+
+
+@dataclass
+class GraphRun:
+    graph: "PipelineGraph"
+    outputs: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, StepTiming] = field(default_factory=dict)
+    skipped: list[str] = field(default_factory=list)
+    resumed: list[str] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    def critical_path(self) -> list[str]:
+        # Walk back from the last step to finish, each time to the dependency
+        # that finished last and so gated the step's start.
+        if not self.timings:
+            return []
+        name = max(self.timings, key=lambda n: self.timings[n].end_ms)
+        path = [name]
+        while True:
+            step = self.graph.steps[name]
+            gates = [n for n in (*step.needs, *step.after) if n in self.timings]
+            if not gates:
+                break
+            name = max(gates, key=lambda n: self.timings[n].end_ms)
+            path.append(name)
+        return path[::-1]
+
+    def timing(self) -> dict:
+        path = self.critical_path()
+        return {
+            "wall_ms": round(self.wall_ms, 2),
+            "busy_ms": round(sum(t.duration_ms for t in self.timings.values()), 2),
+            "critical_path": path,
+            "critical_path_ms": round(sum(self.timings[n].duration_ms for n in path), 2),
+            "steps": {
+                name: {"start_ms": round(t.start_ms, 2), "duration_ms": round(t.duration_ms, 2)}
+                for name, t in self.timings.items()
+            },
+            "skipped": self.skipped,
+            "resumed": self.resumed,
+        }
+
+
+class PipelineGraph:
+    def __init__(self, name: str, steps: list[Step], inputs: tuple[str, ...] = ()):
+        self.name = name
+        self.inputs = inputs
+        self.steps: dict[str, Step] = {}
+        for step in steps:
+            if step.name in self.steps or step.name in inputs:
+                raise ValueError(f"{name}: duplicate step {step.name!r}")
+            self.steps[step.name] = step
+        self._validate()
+
+    def _validate(self) -> None:
+        known = set(self.inputs) | set(self.steps)
+        for step in self.steps.values():
+            missing = [n for n in (*step.needs, *step.after) if n not in known]
+            if missing:
+                raise ValueError(f"{self.name}: step {step.name!r} depends on unknown {missing}")
+
+        settled = set(self.inputs)
+        remaining = dict(self.steps)
+        while remaining:
+            ready = [n for n, s in remaining.items() if settled.issuperset((*s.needs, *s.after))]
+            if not ready:
+                raise ValueError(f"{self.name}: cycle between steps {sorted(remaining)}")
+            for n in ready:
+                settled.add(n)
+                del remaining[n]
+
+    async def run(self, ctx: PipelineContext, **inputs: Any) -> GraphRun:
+        missing = set(self.inputs) - set(inputs)
+        if missing:
+            raise ValueError(f"{self.name}: missing inputs {sorted(missing)}")
+
+        run = GraphRun(graph=self, outputs=dict(inputs))
+        settled = set(inputs)
+        pending = dict(self.steps)
+        running: dict[asyncio.Task, Step] = {}
+        open_agents: set[str] = set()
+        saved = await ctx.checkpoints.load() if ctx.checkpoints else {}
+        began = time.perf_counter()
+
+        try:
+            while pending or running:
+                scheduled = True
+                while scheduled:
+                    scheduled = False
+                    for name, step in list(pending.items()):
+                        if not settled.issuperset((*step.needs, *step.after)):
+                            continue
+                        del pending[name]
+                        scheduled = True
+                        args = {n: run.outputs[n] for n in step.needs if n in run.outputs}
+                        if len(args) < len(step.needs) or (step.when and not step.when(**args)):
+                            run.skipped.append(name)
+                            settled.add(name)
+                            continue
+                        task = asyncio.create_task(self._run_step(ctx, step, args, run, open_agents, began, saved))
+                        running[task] = step
+
+                if not running:
+                    break
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    step = running.pop(task)
+                    run.outputs[step.name] = task.result()
+                    settled.add(step.name)
+                if ctx.checkpoints and not running:
+                    await ctx.checkpoints.commit()
+        except BaseException:
+            for task in running:
+                task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+            raise
+        finally:
+            run.wall_ms = (time.perf_counter() - began) * 1000
+
+        timing = run.timing()
+        logger.info(
+            f"{self.name} pipeline for issue {ctx.issue_id}: {timing['wall_ms']}ms wall, "
+            f"critical path {' -> '.join(timing['critical_path'])} ({timing['critical_path_ms']}ms)"
+        )
+        return run
+
+    async def _run_step(
+        self,
+        ctx: PipelineContext,
+        step: Step,
+        args: dict[str, Any],
+        run: GraphRun,
+        open_agents: set[str],
+        began: float,
+        saved: dict[str, Any],
+    ) -> Any:
+        start_ms = (time.perf_counter() - began) * 1000
+        if step.agent and ctx.tracker and step.agent not in open_agents:
+            open_agents.add(step.agent)
+            await ctx.tracker.start_step(step.agent)
+
+        if step.name in saved:
+            result = saved[step.name]
+            if step.decode:
+                result = await step.decode(ctx, result)
+            run.resumed.append(step.name)
+        else:
+            result = await step.run(ctx, **args)
+            if ctx.checkpoints:
+                await ctx.checkpoints.save(step.name, step.encode(result))
+        run.timings[step.name] = StepTiming(start_ms, (time.perf_counter() - began) * 1000)
+
+        if step.report and step.agent and ctx.tracker:
+            report = step.report(result)
+            open_agents.discard(step.agent)
+            await ctx.tracker.complete_step(step.agent, report.decision, report.reasoning, report.result)
+        return result
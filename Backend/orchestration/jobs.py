@@ -0,0 +1,306 @@
+import asyncio
+import json
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, exists, func, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from Backend.core.config import settings
+from Backend.core.lanes import WeightedLanes, lane_for
+from Backend.core.logging import get_logger
+from Backend.database.connection import get_db_context
+from Backend.database.models import Issue, PipelineJobRecord
+from Backend.orchestration.runner import PipelineRunner
+
+logger = get_logger(__name__)
+
+# Issue states a pipeline leaves behind only if it did not finish.
+STALLED_STATES = ("reported", "validated")
+
+
+def encode_inputs(**inputs) -> str:
+    return json.dumps(inputs, sort_keys=True)
+
+
+def enqueue_pipeline(db: AsyncSession, issue_id: UUID, pipeline: str, priority: int, **inputs) -> PipelineJobRecord:
+    # Added to the caller's session, so the job commits with the issue.
+    job = PipelineJobRecord(
+        issue_id=issue_id,
+        pipeline=pipeline,
+        inputs=encode_inputs(**inputs),
+        lane=lane_for(priority, len(settings.priority_lane_weights)),
+        status="queued",
+    )
+    db.add(job)
+    return job
+
+
+async def latest_job(db: AsyncSession, issue_id: UUID, pipeline: str) -> Optional[PipelineJobRecord]:
+    result = await db.execute(
+        select(PipelineJobRecord)
+        .where(PipelineJobRecord.issue_id == issue_id, PipelineJobRecord.pipeline == pipeline)
+        .order_by(PipelineJobRecord.created_at.desc())
+        .limit(1)
+    )
+    return result.scalar_one_or_none()
+
+
+class PipelineJobQueue:
+    # Jobs are claimed one row at a time with FOR UPDATE SKIP LOCKED, so any
+    # number of workers can poll the same table. A claim is a lease: a job
+    # whose worker stops renewing it is handed to another worker. Claims
+    # take a shared advisory lock so PIPELINE_MAX_IN_FLIGHT holds across
+    # all workers.
+    def __init__(self, worker_id: str, lease_s: Optional[int] = None, max_attempts: Optional[int] = None):
+        self.worker_id = worker_id
+        self.lease_s = lease_s or settings.pipeline_job_lease_s
+        self.max_attempts = max_attempts or settings.pipeline_job_max_attempts
+        self._lanes: WeightedLanes[None] = WeightedLanes()
+
+    async def claim(self) -> Optional[PipelineJobRecord]:
+        now = datetime.utcnow()
+        preferred = self._lanes.pick([True] * self._lanes.lane_count)
+        async with get_db_context() as db:
+            await db.execute(text("SELECT pg_advisory_xact_lock(hashtext('pipeline_jobs_claim'))"))
+            in_flight = (await db.execute(
+                select(func.count()).select_from(PipelineJobRecord)
+                .where(PipelineJobRecord.status == "running", PipelineJobRecord.locked_until >= now)
+            )).scalar() or 0
+            if in_flight >= settings.pipeline_max_in_flight:
+                return None
+            
+            result = await db.execute(
+                select(PipelineJobRecord)
+                .where(or_(
+                    and_(
+                        PipelineJobRecord.status == "queued",
+                        or_(PipelineJobRecord.locked_until.is_(None), PipelineJobRecord.locked_until <= now),
+                    ),
+                    and_(
+                        PipelineJobRecord.status == "running",
+                        PipelineJobRecord.locked_until < now,
+                        PipelineJobRecord.attempts < self.max_attempts,
+                    ),
+                ))
+                .order_by(
+                    (PipelineJobRecord.lane == preferred).desc(),
+                    PipelineJobRecord.lane,
+                    PipelineJobRecord.created_at,
+                )
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )
+            job = result.scalar_one_or_none()
+            if job:
+                job.status = "running"
+                job.attempts += 1
+                job.worker_id = self.worker_id
+                job.locked_until = now + timedelta(seconds=self.lease_s)
+                job.started_at = now
+            return job
+
+    async def renew(self, job_ids: list[UUID]) -> None:
+        if not job_ids:
+            return
+        async with get_db_context() as db:
+            await db.execute(
+                update(PipelineJobRecord)
+                .where(PipelineJobRecord.id.in_(job_ids), PipelineJobRecord.worker_id == self.worker_id)
+                .values(locked_until=datetime.utcnow() + timedelta(seconds=self.lease_s))
+            )
+
+    async def expire(self) -> None:
+        # Jobs whose lease ran out on their last attempt are not reclaimed.
+        async with get_db_context() as db:
+            await db.execute(
+                update(PipelineJobRecord)
+                .where(
+                    PipelineJobRecord.status == "running",
+                    PipelineJobRecord.locked_until < datetime.utcnow(),
+                    PipelineJobRecord.attempts >= self.max_attempts,
+                )
+                .values(status="failed", error="Lease expired", locked_until=None, finished_at=datetime.utcnow())
+            )
+
+    async def sweep(self) -> int:
+        # Failed pipelines whose issue never got past validation are put back
+        # on the queue; their checkpoints let the retry skip finished steps.
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.pipeline_sweep_after_s)
+        newer = aliased(PipelineJobRecord)
+        async with get_db_context() as db:
+            result = await db.execute(
+                update(PipelineJobRecord)
+                .where(
+                    PipelineJobRecord.status == "failed",
+                    PipelineJobRecord.finished_at < cutoff,
+                    PipelineJobRecord.resumes < settings.pipeline_sweep_max_resumes,
+                    PipelineJobRecord.issue_id.in_(
+                        select(Issue.id).where(Issue.state.in_(STALLED_STATES))
+                    ),
+                    ~exists().where(
+                        newer.issue_id == PipelineJobRecord.issue_id,
+                        newer.created_at > PipelineJobRecord.created_at,
+                    ),
+                )
+                .values(
+                    status="queued",
+                    attempts=0,
+                    resumes=PipelineJobRecord.resumes + 1,
+                    worker_id=None,
+                    finished_at=None,
+                )
+                .returning(PipelineJobRecord.issue_id)
+            )
+            resumed = result.scalars().all()
+        if resumed:
+            logger.info(f"Resumed {len(resumed)} stalled pipelines: {', '.join(str(i) for i in resumed)}")
+        return len(resumed)
+
+    async def complete(self, job: PipelineJobRecord, result: Optional[dict] = None) -> None:
+        await self._finish(job, status="done", result=json.dumps(result, default=str) if result is not None else None)
+
+    async def fail(self, job: PipelineJobRecord, error: str) -> None:
+        # A requeued job is held back for a delay that doubles per attempt,
+        # so a failing dependency is not hammered by immediate retries.
+        if job.attempts >= self.max_attempts:
+            await self._finish(job, status="failed", error=error)
+            return
+        delay = settings.pipeline_retry_backoff_s * 2 ** max(job.attempts - 1, 0)
+        await self._finish(job, status="queued", error=error, locked_until=datetime.utcnow() + timedelta(seconds=delay))
+
+    async def release(self, job: PipelineJobRecord) -> None:
+        # Hands an unfinished job back without spending one of its attempts.
+        await self._finish(job, status="queued", attempts=max(job.attempts - 1, 0))
+
+    async def _finish(self, job: PipelineJobRecord, status: str, **values) -> None:
+        values = {
+            "locked_until": None,
+            "finished_at": datetime.utcnow() if status in ("done", "failed") else None,
+            **values,
+        }
+        async with get_db_context() as db:
+            await db.execute(
+                update(PipelineJobRecord)
+                .where(PipelineJobRecord.id == job.id, PipelineJobRecord.worker_id == self.worker_id)
+                .values(status=status, **values)
+            )
+
+
+async def queue_stats(db: AsyncSession) -> dict:
+    result = await db.execute(
+        select(PipelineJobRecord.status, PipelineJobRecord.lane, func.count())
+        .where(PipelineJobRecord.status.in_(("queued", "running")))
+        .group_by(PipelineJobRecord.status, PipelineJobRecord.lane)
+    )
+    stats = {"queued": 0, "running": 0, "lane_depths": [0] * len(settings.priority_lane_weights)}
+    for status, lane, count in result.all():
+        stats[status] += count
+        if status == "queued" and 0 <= lane < len(stats["lane_depths"]):
+            stats["lane_depths"][lane] += count
+    return stats
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class PipelineWorker:
+    def __init__(self, concurrency: Optional[int] = None, worker_id: Optional[str] = None):
+        self.queue = PipelineJobQueue(worker_id or default_worker_id())
+        self.runner = PipelineRunner(concurrency=concurrency)
+        self._jobs: dict[UUID, PipelineJobRecord] = {}
+        self._stopping = asyncio.Event()
+
+    @property
+    def worker_id(self) -> str:
+        return self.queue.worker_id
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def run(self) -> None:
+        logger.info(f"Pipeline worker {self.worker_id} started with concurrency {self.runner.concurrency}")
+        renewer = asyncio.create_task(self._renew_loop())
+        sweeper = asyncio.create_task(self._sweep_loop())
+        try:
+            while not self._stopping.is_set():
+                claimed = False
+                while len(self._jobs) < self.runner.concurrency and not self._stopping.is_set():
+                    try:
+                        job = await self.queue.claim()
+                    except Exception as e:
+                        logger.error(f"Failed to claim pipeline job: {e}")
+                        break
+                    if not job:
+                        break
+                    claimed = True
+                    self._start(job)
+                if not claimed:
+                    try:
+                        await asyncio.wait_for(self._stopping.wait(), timeout=settings.pipeline_worker_poll_s)
+                    except asyncio.TimeoutError:
+                        pass
+        finally:
+            await self._drain()
+            renewer.cancel()
+            sweeper.cancel()
+            await asyncio.gather(renewer, sweeper, return_exceptions=True)
+            logger.info(f"Pipeline worker {self.worker_id} stopped")
+
+    def _start(self, job: PipelineJobRecord) -> None:
+        self._jobs[job.id] = job
+        self.runner.submit(job.issue_id, job.lane + 1, lambda: self._execute(job))
+
+    async def _execute(self, job: PipelineJobRecord) -> None:
+        from Backend.orchestration.pipelines import PIPELINES, run_tracked
+
+        try:
+            graph = PIPELINES[job.pipeline]
+            async with get_db_context() as db:
+                result = await run_tracked(graph, db, job.issue_id, **json.loads(job.inputs))
+        except asyncio.CancelledError:
+            await self.queue.release(job)
+            raise
+        except Exception as e:
+            await self.queue.fail(job, str(e))
+            raise
+        else:
+            await self.queue.complete(job, result)
+        finally:
+            self._jobs.pop(job.id, None)
+
+    async def _renew_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.queue.lease_s / 3)
+            try:
+                await self.queue.renew(list(self._jobs))
+                await self.queue.expire()
+            except Exception as e:
+                logger.error(f"Failed to renew pipeline job leases: {e}")
+
+    async def _sweep_loop(self) -> None:
+        from Backend.orchestration.reevaluation import reevaluate_degraded
+
+        while True:
+            await asyncio.sleep(settings.pipeline_sweep_interval_s)
+            try:
+                await self.queue.sweep()
+            except Exception as e:
+                logger.error(f"Failed to sweep stalled pipelines: {e}")
+            try:
+                await reevaluate_degraded()
+            except Exception as e:
+                logger.error(f"Failed to re-evaluate degraded decisions: {e}")
+
+    async def _drain(self) -> None:
+        # In-flight pipelines get a grace period; whatever is still running
+        # after it is cancelled and handed back to the queue.
+        if self._jobs:
+            logger.info(f"Waiting for {len(self._jobs)} pipeline jobs to finish")
+        if not await self.runner.drain(settings.pipeline_worker_grace_s):
+            await self.runner.cancel()
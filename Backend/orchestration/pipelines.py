@@ -0,0 +1,230 @@
+from typing import Optional
+from uuid import UUID
+
+from Backend.agents import (
+    VisionAgent,
+    GeoDeduplicateAgent,
+    PriorityAgent,
+    RoutingAgent,
+    NotificationAgent,
+)
+from Backend.core.flow_store import flow_store
+from Backend.core.flow_tracker import create_flow_tracker, remove_flow_tracker
+from Backend.core.schemas import ClassificationResult
+from Backend.database.models import Department, Issue
+from Backend.orchestration.checkpoints import PipelineCheckpoints
+from Backend.orchestration.graph import PipelineContext, PipelineGraph, SharedSession, Step, StepReport
+
+
+async def run_vision(ctx: PipelineContext, image_paths: list[str], description: Optional[str]):
+    return await VisionAgent(ctx.db).process_issue(ctx.issue_id, image_paths, description)
+
+
+def encode_vision(vision: ClassificationResult) -> dict:
+    return vision.model_dump(mode='json')
+
+
+async def decode_vision(ctx: PipelineContext, data: dict) -> ClassificationResult:
+    return ClassificationResult.model_validate(data)
+
+
+def report_vision(vision) -> StepReport:
+    if not vision.detections:
+        return StepReport(
+            decision="No issues detected",
+            reasoning="0 detections - requires manual confirmation",
+            result={
+                "detections": 0,
+                "needs_confirmation": True,
+                "annotated_urls": vision.annotated_urls,
+            },
+        )
+    return StepReport(
+        decision=f"Detected: {vision.primary_category.value if vision.primary_category else 'Unknown'}",
+        reasoning=f"Confidence: {vision.primary_confidence:.2%}, {len(vision.detections)} detections",
+        result=vision.model_dump(mode='json'),
+    )
+
+
+async def await_confirmation(ctx: PipelineContext, vision) -> dict:
+    issue = await ctx.db.get(Issue, ctx.issue_id)
+    if issue:
+        issue.state = "pending_confirmation"
+        issue.validation_source = "pending_manual"
+        issue.validation_reason = "No issues detected by AI - awaiting user confirmation"
+        await ctx.db.flush()
+
+    return {
+        "issue_id": str(ctx.issue_id),
+        "state": "pending_confirmation",
+        "needs_confirmation": True,
+        "detections": 0,
+        "message": "No issues detected. Please confirm if you want to submit for manual review.",
+    }
+
+
+async def run_geo(ctx: PipelineContext, **_) -> dict:
+    return await GeoDeduplicateAgent(ctx.db).process_issue(ctx.issue_id)
+
+
+def report_geo(geo: dict) -> StepReport:
+    if geo.get("is_duplicate"):
+        return StepReport(
+            decision="Marked as duplicate",
+            reasoning=f"Linked to parent: {geo.get('parent_issue_id')}",
+            result=geo,
+        )
+    return StepReport(
+        decision=f"Status: {geo.get('geo_status', 'unknown')}",
+        reasoning=f"Nearby issues: {geo.get('nearby_count', 0)}",
+        result=geo,
+    )
+
+
+def is_unique(geo: dict, **_) -> bool:
+    return not geo.get("is_duplicate")
+
+
+async def run_priority(ctx: PipelineContext, geo: dict) -> dict:
+    return await PriorityAgent(ctx.db).process_issue(ctx.issue_id)
+
+
+def report_priority(priority: dict) -> StepReport:
+    return StepReport(
+        decision=f"Priority: {priority.get('priority', 'N/A')}",
+        reasoning=priority.get("reasoning", ""),
+        result=priority,
+    )
+
+
+async def find_department(ctx: PipelineContext, vision, geo: dict, description: Optional[str]):
+    category = vision.primary_category.value if vision.primary_category else None
+    return await RoutingAgent(ctx.db).find_department(category, description, issue_id=ctx.issue_id)
+
+
+def encode_department(department: Optional[Department]) -> Optional[str]:
+    return str(department.id) if department else None
+
+
+async def decode_department(ctx: PipelineContext, department_id: Optional[str]) -> Optional[Department]:
+    return await ctx.db.get(Department, UUID(department_id)) if department_id else None
+
+
+async def run_routing(ctx: PipelineContext, department, priority: dict) -> dict:
+    return await RoutingAgent(ctx.db).assign(ctx.issue_id, department)
+
+
+def report_routing(routing: dict) -> StepReport:
+    return StepReport(
+        decision=f"Routed to: {routing.get('department', 'N/A')}",
+        reasoning=f"Assigned: {routing.get('member', 'N/A')}, SLA: {routing.get('sla_hours', 0)}h",
+        result=routing,
+    )
+
+
+async def manual_triage(ctx: PipelineContext, priority: dict) -> dict:
+    return {"skipped": True, "queue": "manual_triage"}
+
+
+def report_manual_triage(result: dict) -> StepReport:
+    return StepReport(
+        decision="Manual Review Requested",
+        reasoning="Skipped automatic routing due to 0 detections/manual confirmation. Sent to triage queue.",
+        result=result,
+    )
+
+
+async def run_notification(ctx: PipelineContext, routing: dict) -> dict:
+    await NotificationAgent(ctx.db).notify_assignment(ctx.issue_id)
+    return {"queued": True}
+
+
+def report_notification(result: dict) -> StepReport:
+    return StepReport(
+        decision="Notifications queued",
+        reasoning="Assignment notification sent to assigned member",
+        result=result,
+    )
+
+
+async def persist(ctx: PipelineContext, geo: dict) -> dict:
+    # Reports the routed issue. The graph commits it at the join after this
+    # step and notification, since a commit here would also take in
+    # whatever notification had written by then.
+    issue = await ctx.db.get(Issue, ctx.issue_id)
+    return {
+        "issue_id": str(ctx.issue_id),
+        "state": issue.state if issue else "unknown",
+        "priority": issue.priority if issue else None,
+        "is_duplicate": issue.is_duplicate if issue else False,
+    }
+
+
+# Vision → GeoDeduplicate → (Priority ∥ department lookup) → Routing →
+# (Notification ∥ persist). An image set with no detections stops after
+# Vision and waits for the reporter to confirm.
+ISSUE_PIPELINE = PipelineGraph(
+    "issue",
+    inputs=("image_paths", "description"),
+    steps=[
+        Step("vision", run_vision, needs=("image_paths", "description"), agent="VisionAgent", report=report_vision,
+             encode=encode_vision, decode=decode_vision),
+        Step("await_confirmation", await_confirmation, needs=("vision",), when=lambda vision: not vision.detections),
+        Step("geo", run_geo, needs=("vision",), when=lambda vision: bool(vision.detections),
+             agent="GeoDeduplicateAgent", report=report_geo),
+        Step("priority", run_priority, needs=("geo",), when=is_unique, agent="PriorityAgent", report=report_priority),
+        Step("department", find_department, needs=("vision", "geo", "description"), when=is_unique, agent="RoutingAgent",
+             encode=encode_department, decode=decode_department),
+        Step("routing", run_routing, needs=("department", "priority"), agent="RoutingAgent", report=report_routing),
+        Step("notification", run_notification, needs=("routing",), agent="NotificationAgent", report=report_notification),
+        Step("persist", persist, needs=("geo",), after=("routing",)),
+    ],
+)
+
+# The tail of ISSUE_PIPELINE for issues the reporter confirmed after Vision
+# found nothing; they go to manual triage instead of automatic routing.
+CONFIRMED_PIPELINE = PipelineGraph(
+    "confirmed",
+    steps=[
+        Step("geo", run_geo, agent="GeoDeduplicateAgent", report=report_geo),
+        Step("priority", run_priority, needs=("geo",), when=is_unique, agent="PriorityAgent", report=report_priority),
+        Step("routing", manual_triage, needs=("priority",), agent="RoutingAgent", report=report_manual_triage),
+        Step("persist", persist, needs=("geo",), after=("routing",)),
+    ],
+)
+
+
+def final_result(run) -> dict:
+    result = run.outputs.get("persist") or run.outputs["await_confirmation"]
+    return {**result, "timing": run.timing()}
+
+
+PIPELINES = {graph.name: graph for graph in (ISSUE_PIPELINE, CONFIRMED_PIPELINE)}
+
+
+async def run_tracked(graph: PipelineGraph, db, issue_id: UUID, **inputs) -> dict:
+    # Steps checkpointed by an earlier, failed run of the same pipeline are
+    # restored instead of re-run.
+    issue = await db.get(Issue, issue_id)
+    tracker = await create_flow_tracker(issue_id, city=issue.city if issue else None)
+    
+    try:
+        shared = SharedSession(db)
+        ctx = PipelineContext(
+            issue_id=issue_id,
+            db=shared,
+            tracker=tracker,
+            checkpoints=PipelineCheckpoints(shared, issue_id, graph.name),
+        )
+        run = await graph.run(ctx, **inputs)
+        result = final_result(run)
+        await tracker.complete_flow(result)
+        return result
+        
+    except Exception as e:
+        await tracker.error_flow(str(e))
+        raise
+    finally:
+        remove_flow_tracker(issue_id)
+        # A retry, possibly in another worker, continues from our last seq.
+        await flow_store.flush()
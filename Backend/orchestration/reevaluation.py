@@ -0,0 +1,82 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from Backend.agents import GeoDeduplicateAgent, PriorityAgent, RoutingAgent
+from Backend.core.config import settings
+from Backend.core.degraded import degraded_mode
+from Backend.core.logging import get_logger
+from Backend.database.connection import get_db_context
+from Backend.database.models import DegradedDecision
+
+logger = get_logger(__name__)
+
+
+async def reevaluate_priority(db, issue_id) -> str:
+    result = await PriorityAgent(db).process_issue(issue_id)
+    if "priority" not in result:
+        return f"skipped: {result.get('reason') or result.get('error')}"
+    return f"priority {result['priority']}"
+
+
+async def reevaluate_routing(db, issue_id) -> str:
+    return await RoutingAgent(db).reroute(issue_id)
+
+
+async def reevaluate_geo(db, issue_id) -> str:
+    return await GeoDeduplicateAgent(db).reevaluate(issue_id)
+
+
+REEVALUATORS = {
+    "PriorityAgent": reevaluate_priority,
+    "RoutingAgent": reevaluate_routing,
+    "GeoDeduplicateAgent": reevaluate_geo,
+}
+
+
+async def reevaluate_degraded(limit: int = 0) -> int:
+    # Replays decisions made with a fallback through the LLM once degraded
+    # mode is over, oldest first. Each decision is settled in its own
+    # transaction, claimed with SKIP LOCKED so workers share the backlog.
+    if await degraded_mode.is_active():
+        return 0
+
+    settled = 0
+    for _ in range(limit or settings.degraded_reevaluate_batch):
+        async with get_db_context() as db:
+            decision = (await db.execute(
+                select(DegradedDecision)
+                .where(DegradedDecision.reevaluated_at.is_(None))
+                .order_by(DegradedDecision.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            )).scalar_one_or_none()
+            if decision is None:
+                break
+
+            decision_id, agent_name, issue_id = decision.id, decision.agent_name, decision.issue_id
+            reevaluate = REEVALUATORS.get(agent_name)
+            try:
+                outcome = await reevaluate(db, issue_id) if reevaluate else "skipped: no re-evaluation"
+            except Exception as e:
+                logger.error(f"Re-evaluation of {agent_name} for issue {issue_id} failed: {e}")
+                # The rollback released our lock; if another worker has
+                # claimed the decision since, the failure is left to it.
+                await db.rollback()
+                decision = (await db.execute(
+                    select(DegradedDecision)
+                    .where(DegradedDecision.id == decision_id, DegradedDecision.reevaluated_at.is_(None))
+                    .with_for_update(skip_locked=True)
+                )).scalar_one_or_none()
+                outcome = f"failed: {e}"
+            if decision:
+                decision.outcome = outcome
+                decision.reevaluated_at = datetime.utcnow()
+                settled += 1
+
+        if await degraded_mode.is_active():
+            break
+
+    if settled:
+        logger.info(f"Re-evaluated {settled} degraded decisions")
+    return settled
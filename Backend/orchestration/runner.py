@@ -0,0 +1,81 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Callable, Coroutine, Optional
+from uuid import UUID
+
+from Backend.core.config import settings
+from Backend.core.lanes import WeightedLanes, lane_for
+from Backend.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+PipelineFactory = Callable[[], Coroutine[Any, Any, None]]
+
+
+@dataclass
+class PipelineJob:
+    issue_id: UUID
+    lane: int
+    factory: PipelineFactory = field(repr=False)
+
+
+class PipelineRunner:
+    def __init__(self, concurrency: Optional[int] = None, lane_weights: Optional[list[int]] = None):
+        self.concurrency = max(1, concurrency or settings.pipeline_concurrency)
+        self._waiting: WeightedLanes[PipelineJob] = WeightedLanes(lane_weights or settings.priority_lane_weights)
+        self._running: set[asyncio.Task] = set()
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._running)
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    def submit(self, issue_id: UUID, priority: int, factory: PipelineFactory) -> PipelineJob:
+        job = PipelineJob(issue_id=issue_id, lane=lane_for(priority, self._waiting.lane_count), factory=factory)
+        self._waiting.push(job.lane, job)
+        self._pump()
+        return job
+
+    async def drain(self, timeout: float) -> bool:
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=timeout)
+        return not self._running
+
+    async def cancel(self) -> None:
+        for task in self._running:
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "lane_depths": self._waiting.sizes(),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def _pump(self) -> None:
+        while self._waiting and len(self._running) < self.concurrency:
+            job = self._waiting.pop()
+            task = asyncio.create_task(self._run(job))
+            self._running.add(task)
+            task.add_done_callback(self._finished)
+
+    async def _run(self, job: PipelineJob) -> None:
+        try:
+            await job.factory()
+            self.completed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Pipeline for issue {job.issue_id} failed: {e}")
+
+    def _finished(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        self._pump()
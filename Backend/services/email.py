@@ -1,3 +1,5 @@
+import asyncio
+
 import resend
 from typing import List
 from Backend.core.config import settings
@@ -40,7 +42,7 @@ class EmailService:
                     else:
                         params["text"] = body
                     
-                    resend.Emails.send(params)
+                    await asyncio.to_thread(resend.Emails.send, params)
                     logger.info(f"Email sent successfully to {recipient}")
                 except Exception as e:
                     logger.error(f"Failed to send email to {recipient}: {e}")
@@ -7,6 +7,7 @@ from Backend.core.logging import get_logger
 from Backend.core.schemas import IssueCreate, IssueState
 from Backend.database.models import Issue, IssueImage
 from Backend.services.geocoding import geocoding_service
+from Backend.utils.fuzzy_match import keyword_priority
 from Backend.utils.storage import save_upload, get_upload_url, validate_file_extension, validate_file_size
 
 logger = get_logger(__name__)
@@ -20,7 +21,8 @@ class IngestionService:
         self,
         data: IssueCreate,
         images: list[UploadFile],
-        user_id: str | None = None
+        user_id: str | None = None,
+        priority: int | None = None,
     ) -> tuple[Issue, list[str]]:
         if not images:
             raise ValueError("At least one image is required")
@@ -74,6 +76,7 @@ class IngestionService:
             latitude=issue.latitude,
             longitude=issue.longitude,
             description=issue.description,
+            metadata={"priority": int(priority or keyword_priority(issue.description))},
         )
         await event_bus.publish(event)
         
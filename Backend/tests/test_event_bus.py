@@ -0,0 +1,235 @@
+import asyncio
+import random
+import uuid
+
+import pytest
+
+from Backend.core.event_log import EventLog
+from Backend.core.events import Event, EventBus, EventBusFull, IssueClassified, IssuePrioritized
+
+
+def classified(issue_id: uuid.UUID, category: str, priority: int = 3) -> IssueClassified:
+    return IssueClassified(
+        issue_id=issue_id,
+        category=category,
+        confidence=0.9,
+        detections_count=1,
+        metadata={"priority": priority},
+    )
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_events_for_one_issue_are_handled_in_order():
+    async def main():
+        bus = EventBus.create(shards=2, lane_weights=[8, 4, 2, 1])
+        seen: dict[uuid.UUID, list[str]] = {}
+        
+        async def handle(event):
+            await asyncio.sleep(random.random() / 1000)
+            seen.setdefault(event.issue_id, []).append(event.category)
+        bus.subscribe(IssueClassified, handle, max_concurrency=4)
+        
+        issues = [uuid.uuid4() for _ in range(6)]
+        await bus.start()
+        try:
+            for n in range(20):
+                for issue_id in issues:
+                    # A later, more urgent event must not overtake earlier ones.
+                    await bus.publish(classified(issue_id, str(n), priority=1 if n % 3 == 0 else 4))
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert seen == {issue_id: [str(n) for n in range(20)] for issue_id in issues}
+    
+    run(main())
+
+
+def test_retried_event_holds_back_later_events_for_its_issue():
+    async def main():
+        bus = EventBus.create(shards=1)
+        seen = []
+        failures = {"left": 2}
+        
+        async def handle(event):
+            if event.category == "first" and failures["left"]:
+                failures["left"] -= 1
+                raise RuntimeError("flaky")
+            seen.append((event.issue_id, event.category))
+        bus.subscribe(IssueClassified, handle, retries=3, backoff_ms=20)
+        
+        slow, other = uuid.uuid4(), uuid.uuid4()
+        await bus.start()
+        try:
+            await bus.publish(classified(slow, "first"))
+            await bus.publish(classified(slow, "second"))
+            await bus.publish(classified(other, "unrelated"))
+            await asyncio.sleep(0.01)
+            assert seen == [(other, "unrelated")]
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert seen == [(other, "unrelated"), (slow, "first"), (slow, "second")]
+    
+    run(main())
+
+
+def test_handler_that_keeps_failing_is_dead_lettered():
+    async def main():
+        bus = EventBus.create(shards=1)
+        
+        async def broken(event):
+            raise ValueError("nope")
+        
+        async def slow(event):
+            await asyncio.sleep(1)
+        bus.subscribe(IssueClassified, broken, retries=2, backoff_ms=1)
+        bus.subscribe(IssueClassified, slow, timeout=0.01, retries=0)
+        await bus.start()
+        try:
+            await bus.publish(classified(uuid.uuid4(), "x"))
+            await bus.join()
+        finally:
+            await bus.stop()
+        
+        entries = {entry.handler.rsplit(".", 1)[-1]: entry for entry in bus.dead_letters.list()}
+        assert entries["broken"].attempts == 3
+        assert entries["broken"].error == "ValueError: nope"
+        assert entries["slow"].error.startswith("TimeoutError")
+    
+    run(main())
+
+
+def test_batch_subscription_groups_events():
+    async def main():
+        bus = EventBus.create(shards=1)
+        batches = []
+        
+        async def handle(events):
+            batches.append([event.category for event in events])
+        bus.subscribe_batch(IssueClassified, handle, max_size=3, max_wait_ms=50)
+        await bus.start()
+        try:
+            for n in range(7):
+                await bus.publish(classified(uuid.uuid4(), str(n)))
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert [len(batch) for batch in batches] == [3, 3, 1]
+        assert sum(batches, []) == [str(n) for n in range(7)]
+    
+    run(main())
+
+
+def test_reject_overflow_raises_when_full():
+    async def main():
+        bus = EventBus.create(shards=1, capacity=2, overflow="reject")
+        
+        async def handle(event):
+            pass
+        bus.subscribe(IssueClassified, handle)
+        bus.publish_sync(classified(uuid.uuid4(), "a"))
+        bus.publish_sync(classified(uuid.uuid4(), "b"))
+        with pytest.raises(EventBusFull):
+            bus.publish_sync(classified(uuid.uuid4(), "c"))
+        assert bus.stats()["rejected"] == 1
+        assert bus.depth == 2
+    
+    run(main())
+
+
+def test_drop_overflow_evicts_the_least_urgent_event():
+    async def main():
+        bus = EventBus.create(shards=1, capacity=2, overflow="drop", lane_weights=[8, 4, 2, 1])
+        seen = []
+        
+        async def handle(event):
+            seen.append(event.category)
+        bus.subscribe(IssueClassified, handle)
+        await bus.publish(classified(uuid.uuid4(), "low", priority=4))
+        await bus.publish(classified(uuid.uuid4(), "high", priority=1))
+        await bus.publish(classified(uuid.uuid4(), "urgent", priority=1))
+        await bus.publish(classified(uuid.uuid4(), "lower", priority=4))
+        assert bus.depth == 2
+        assert bus.stats()["dropped"] == 2
+        
+        await bus.start()
+        try:
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert sorted(seen) == ["high", "urgent"]
+    
+    run(main())
+
+
+def test_block_overflow_waits_for_space():
+    async def main():
+        bus = EventBus.create(shards=1, capacity=1, overflow="block")
+        seen = []
+        
+        async def handle(event):
+            seen.append(event.category)
+        bus.subscribe(IssueClassified, handle)
+        await bus.publish(classified(uuid.uuid4(), "a"))
+        blocked = asyncio.create_task(bus.publish(classified(uuid.uuid4(), "b")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        
+        await bus.start()
+        try:
+            await asyncio.wait_for(blocked, timeout=1)
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert seen == ["a", "b"]
+    
+    run(main())
+
+
+def test_unacknowledged_events_are_replayed_after_restart(tmp_path):
+    issue_id = uuid.uuid4()
+    
+    async def interrupted():
+        bus = EventBus.create(shards=1, log=EventLog(tmp_path))
+        started = asyncio.Event()
+        
+        async def stuck(event):
+            started.set()
+            await asyncio.Event().wait()
+        bus.subscribe(IssueClassified, stuck)
+        await bus.start()
+        for n in range(3):
+            await bus.publish(classified(issue_id, str(n)))
+        # Events nobody subscribes to are not logged.
+        await bus.publish(IssuePrioritized(issue_id=issue_id, priority=1, reasoning="unlogged"))
+        await started.wait()
+        await bus.stop()
+    
+    async def restarted() -> list[str]:
+        bus = EventBus.create(shards=1, log=EventLog(tmp_path))
+        seen = []
+        
+        async def handle(event):
+            seen.append(event.category)
+        bus.subscribe(IssueClassified, handle)
+        await bus.start()
+        try:
+            await bus.join()
+        finally:
+            await bus.stop()
+        return seen
+    
+    run(interrupted())
+    assert run(restarted()) == ["0", "1", "2"]
+    assert run(restarted()) == []
+
+
+def test_event_codecs_round_trip():
+    event = classified(uuid.uuid4(), "pothole", priority=2)
+    for decoded in (Event.decode(event.encode()), Event.from_bytes(event.to_bytes())):
+        assert type(decoded) is IssueClassified
+        assert decoded == event
+        assert decoded.urgency == 2
@@ -0,0 +1,130 @@
+import asyncio
+import sys
+import uuid
+
+import pytest
+
+from Backend.core.event_transport import PG_NOTIFY_MAX_BYTES, EventBroker, PostgresTransport, UnixSocketTransport
+from Backend.core.events import REMOTE_ORIGIN, EventBus, IssueClassified
+
+unix_only = pytest.mark.skipif(sys.platform == "win32", reason="needs unix sockets")
+
+
+def classified(issue_id: uuid.UUID) -> IssueClassified:
+    return IssueClassified(issue_id=issue_id, category="pothole", confidence=0.9, detections_count=1)
+
+
+async def until(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+async def connected(path) -> tuple[UnixSocketTransport, list[str]]:
+    transport = UnixSocketTransport(path, host_broker=False)
+    received: list[str] = []
+    
+    async def deliver(message: str) -> None:
+        received.append(message)
+    await transport.start(deliver)
+    await until(lambda: transport._writer is not None)
+    return transport, received
+
+
+@unix_only
+def test_broker_forwards_to_other_clients_only(tmp_path):
+    async def main():
+        broker = EventBroker(tmp_path / "events.sock")
+        await broker.start()
+        (a, a_received), (b, b_received) = await connected(broker.path), await connected(broker.path)
+        try:
+            a.send("hello")
+            await until(lambda: b_received == ["hello"])
+            await asyncio.sleep(0.05)
+            assert a_received == []
+            assert a.sent == 1
+        finally:
+            await a.stop()
+            await b.stop()
+            await broker.stop()
+    
+    asyncio.run(main())
+
+
+@unix_only
+def test_remote_events_reach_only_broadcast_subscriptions(tmp_path):
+    async def main():
+        broker = EventBroker(tmp_path / "events.sock")
+        await broker.start()
+        publisher = EventBus.create(shards=1, transport=UnixSocketTransport(broker.path, host_broker=False))
+        receiver = EventBus.create(shards=1, transport=UnixSocketTransport(broker.path, host_broker=False))
+        calls = {"publisher": [], "receiver": [], "receiver_broadcast": []}
+        
+        def recorder(name):
+            async def handle(event):
+                calls[name].append(event)
+            return handle
+        publisher.subscribe(IssueClassified, recorder("publisher"))
+        receiver.subscribe(IssueClassified, recorder("receiver"))
+        receiver.subscribe(IssueClassified, recorder("receiver_broadcast"), broadcast=True)
+        
+        await publisher.start()
+        await receiver.start()
+        try:
+            await until(lambda: publisher._transport._writer is not None and receiver._transport._writer is not None)
+            event = classified(uuid.uuid4())
+            await publisher.publish(event)
+            await until(lambda: len(calls["receiver_broadcast"]) == 1)
+            await publisher.join()
+            await receiver.join()
+            
+            assert [e.event_id for e in calls["publisher"]] == [event.event_id]
+            assert calls["receiver"] == []
+            remote = calls["receiver_broadcast"][0]
+            assert remote.event_id == event.event_id
+            assert remote.metadata[REMOTE_ORIGIN] == publisher._node_id
+        finally:
+            await publisher.stop()
+            await receiver.stop()
+            await broker.stop()
+    
+    asyncio.run(main())
+
+
+def test_bus_ignores_its_own_events_echoed_back():
+    async def main():
+        bus = EventBus.create(shards=1)
+        seen = []
+        
+        async def handle(event):
+            seen.append(event)
+        bus.subscribe(IssueClassified, handle, broadcast=True)
+        await bus.start()
+        try:
+            event = classified(uuid.uuid4())
+            await bus._receive(f"{bus._node_id}\t{event.encode()}")
+            await bus._receive(f"{uuid.uuid4().hex}\t{event.encode()}")
+            await bus.join()
+        finally:
+            await bus.stop()
+        assert len(seen) == 1
+        assert seen[0].metadata[REMOTE_ORIGIN] != bus._node_id
+    
+    asyncio.run(main())
+
+
+def test_postgres_transport_drops_events_too_large_for_notify():
+    async def main():
+        transport = PostgresTransport("postgresql+asyncpg://localhost/urbanlens")
+        # Never connected: an oversized event must be refused before NOTIFY.
+        assert await transport._send("x" * (PG_NOTIFY_MAX_BYTES + 1)) is False
+        
+        transport.send("é" * (PG_NOTIFY_MAX_BYTES // 2 + 1))
+        sender = asyncio.create_task(transport._send_loop())
+        await until(lambda: transport.dropped == 1)
+        sender.cancel()
+        await asyncio.gather(sender, return_exceptions=True)
+        assert transport.sent == 0
+    
+    asyncio.run(main())
@@ -0,0 +1,127 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+# These tests empty the pipeline_jobs table, so they only run against the
+# scratch database named by TEST_DATABASE_URL.
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("TEST_DATABASE_URL") or os.environ["TEST_DATABASE_URL"] != os.environ.get("DATABASE_URL"),
+    reason="TEST_DATABASE_URL is not set (or DATABASE_URL points elsewhere)",
+)
+
+from sqlalchemy import delete, select, update
+
+from Backend.core.config import settings
+from Backend.database.connection import close_db, get_db_context, init_db
+from Backend.database.models import Issue, PipelineJobRecord
+from Backend.orchestration.jobs import PipelineJobQueue, enqueue_pipeline
+
+
+def run(coro):
+    async def main():
+        try:
+            await init_db()
+            async with get_db_context() as db:
+                await db.execute(delete(PipelineJobRecord))
+            return await coro
+        finally:
+            await close_db()
+    return asyncio.run(main())
+
+
+async def new_job(state: str = "reported", priority: int = 3) -> PipelineJobRecord:
+    async with get_db_context() as db:
+        issue = Issue(latitude=0.0, longitude=0.0, platform="test", state=state)
+        db.add(issue)
+        await db.flush()
+        job = enqueue_pipeline(db, issue.id, "submit", priority, image_paths=[])
+    return job
+
+
+async def load(job: PipelineJobRecord) -> PipelineJobRecord:
+    async with get_db_context() as db:
+        return (await db.execute(select(PipelineJobRecord).where(PipelineJobRecord.id == job.id))).scalar_one()
+
+
+def test_claim_leases_a_job_to_one_worker():
+    async def main():
+        job = await new_job()
+        first, second = PipelineJobQueue("a", lease_s=60), PipelineJobQueue("b", lease_s=60)
+        claimed = await first.claim()
+        assert claimed.id == job.id
+        assert claimed.attempts == 1
+        assert await second.claim() is None
+        
+        # Once the lease runs out another worker picks the job up.
+        async with get_db_context() as db:
+            await db.execute(
+                update(PipelineJobRecord).where(PipelineJobRecord.id == job.id)
+                .values(locked_until=datetime.utcnow() - timedelta(seconds=1))
+            )
+        reclaimed = await second.claim()
+        assert reclaimed.id == job.id
+        assert reclaimed.worker_id == "b"
+        assert reclaimed.attempts == 2
+    
+    run(main())
+
+
+def test_failed_job_is_held_back_with_growing_delay(monkeypatch):
+    monkeypatch.setattr(settings, "pipeline_retry_backoff_s", 30.0)
+    
+    async def main():
+        job = await new_job()
+        queue = PipelineJobQueue("a", max_attempts=3)
+        delays = []
+        for _ in range(2):
+            claimed = await queue.claim()
+            await queue.fail(claimed, "boom")
+            failed = await load(job)
+            assert failed.status == "queued"
+            assert failed.error == "boom"
+            delays.append((failed.locked_until - datetime.utcnow()).total_seconds())
+            # Still backing off, so nothing is claimable.
+            assert await queue.claim() is None
+            async with get_db_context() as db:
+                await db.execute(
+                    update(PipelineJobRecord).where(PipelineJobRecord.id == job.id)
+                    .values(locked_until=datetime.utcnow() - timedelta(seconds=1))
+                )
+        assert 25 < delays[0] <= 30
+        assert 55 < delays[1] <= 60
+        
+        # The last attempt fails for good.
+        claimed = await queue.claim()
+        assert claimed.attempts == 3
+        await queue.fail(claimed, "boom")
+        failed = await load(job)
+        assert failed.status == "failed"
+        assert failed.finished_at is not None
+    
+    run(main())
+
+
+def test_sweep_requeues_only_stalled_pipelines():
+    async def main():
+        stalled, finished = await new_job(state="validated"), await new_job(state="assigned")
+        queue = PipelineJobQueue("a", max_attempts=1)
+        for _ in range(2):
+            await queue.fail(await queue.claim(), "boom")
+        
+        # Too recent to sweep yet.
+        assert await queue.sweep() == 0
+        async with get_db_context() as db:
+            await db.execute(
+                update(PipelineJobRecord)
+                .values(finished_at=datetime.utcnow() - timedelta(seconds=settings.pipeline_sweep_after_s + 1))
+            )
+        assert await queue.sweep() == 1
+        
+        resumed = await load(stalled)
+        assert (resumed.status, resumed.attempts, resumed.resumes) == ("queued", 0, 1)
+        assert (await load(finished)).status == "failed"
+        assert (await queue.claim()).id == stalled.id
+    
+    run(main())
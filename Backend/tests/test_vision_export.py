@@ -0,0 +1,93 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from Backend.agents.vision.agent import VisionAgent
+from Backend.agents.vision.export import compare, export_model, match_boxes
+from Backend.agents.vision.inference import analyse_images, decode_image, load_yolo
+from Backend.core.config import settings
+from Backend.core.schemas import DetectionBox
+
+SAMPLE_IMAGES = sorted((Path(__file__).resolve().parents[2] / "Model" / "webtest" / "static" / "uploads").glob("*.jpg"))
+
+
+def test_match_boxes_pairs_most_confident_first():
+    reference = [
+        [0, 0, 10, 10, 0.6, 1],
+        [0, 0, 10, 10, 0.9, 1],
+        [50, 50, 60, 60, 0.8, 2],
+    ]
+    candidate = [
+        [1, 1, 10, 10, 0.85, 1],
+        [50, 50, 60, 60, 0.8, 3],
+        [100, 100, 110, 110, 0.7, 1],
+    ]
+    
+    pairs = match_boxes(reference, candidate, min_iou=0.5)
+    
+    # The one overlapping class-1 box goes to the 0.9 reference; the class-2
+    # reference has no same-class candidate and the far box overlaps nothing.
+    assert pairs == [(reference[1], candidate[0])]
+
+
+def test_match_boxes_respects_min_iou():
+    reference = [[0, 0, 10, 10, 0.9, 0]]
+    candidate = [[5, 0, 15, 10, 0.9, 0]]
+    
+    assert match_boxes(reference, candidate, min_iou=0.5) == []
+    assert match_boxes(reference, candidate, min_iou=0.3) == [(reference[0], candidate[0])]
+
+
+# Backends the exported model must agree with PyTorch on, and the runtime
+# each one needs besides ultralytics.
+EXPORTS = {"onnx": "onnxruntime", "openvino": "openvino"}
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    pytest.importorskip("ultralytics")
+    if not settings.model_path.exists():
+        pytest.skip(f"no model at {settings.model_path}")
+    path = tmp_path_factory.mktemp("vision") / settings.model_path.name
+    shutil.copy(settings.model_path, path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def sample_images():
+    if not SAMPLE_IMAGES:
+        pytest.skip("no sample images")
+    return [path.read_bytes() for path in SAMPLE_IMAGES[:4]]
+
+
+def detections(model, images: list[bytes]) -> list[list[DetectionBox]]:
+    decoded = [decode_image(data, settings.model_input_size) for data in images]
+    outputs = analyse_images(model, decoded, settings.model_confidence_threshold, settings.model_input_size)
+    agent = VisionAgent()
+    return [agent.extract_detections(output.boxes) for output in outputs]
+
+
+def rows(boxes: list[DetectionBox]) -> list[list[float]]:
+    return [[*box.bbox, box.confidence, box.class_id] for box in boxes]
+
+
+@pytest.mark.parametrize("backend", list(EXPORTS))
+def test_exported_backend_agrees_with_torch(backend, model_dir, sample_images):
+    pytest.importorskip(EXPORTS[backend])
+    export_model(model_dir, backend, settings.model_input_size)
+    exported, reference = load_yolo(model_dir, backend), load_yolo(model_dir, "torch")
+    
+    report = compare(exported, reference, sample_images)
+    assert report["images"] == len(sample_images)
+    assert report["agreement"] >= 0.95
+    
+    # The agent sees the same DetectionBoxes whichever backend ran.
+    matched = total = 0
+    for ours, theirs in zip(detections(exported, sample_images), detections(reference, sample_images)):
+        pairs = match_boxes(rows(theirs), rows(ours), min_iou=0.5)
+        matched += len(pairs)
+        total += len(ours) + len(theirs)
+        for ref, box in pairs:
+            assert abs(ref[4] - box[4]) < 0.05
+    assert total == 0 or 2 * matched / total >= 0.95
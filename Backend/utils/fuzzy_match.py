@@ -1,6 +1,8 @@
 from difflib import SequenceMatcher
 from typing import Optional
 
+from Backend.core.schemas import CATEGORY_PRIORITY, IssueCategory, PriorityLevel
+
 CATEGORY_KEYWORDS: dict[str, list[str]] = {
     "Damaged Road Issues": [
         "road", "damage", "damaged", "broken", "crack", "cracked", "pavement",
@@ -111,3 +113,21 @@ def auto_validate_issue(
             return True, f"Auto-validated: '{category}' matched with keywords: {matched_words}"
     
     return False, f"Manual verification required: no match between description and detected categories {detected_categories}"
+
+
+def infer_category(description: Optional[str]) -> Optional[str]:
+    best_category = None
+    best_score = 0.0
+    for category in CATEGORY_KEYWORDS:
+        is_match, score, _ = match_description_to_category(description, category)
+        if is_match and score > best_score:
+            best_category = category
+            best_score = score
+    return best_category
+
+
+def keyword_priority(description: Optional[str]) -> PriorityLevel:
+    category = infer_category(description)
+    if not category:
+        return PriorityLevel.MEDIUM
+    return CATEGORY_PRIORITY[IssueCategory(category)]
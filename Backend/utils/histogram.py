@@ -0,0 +1,85 @@
+import math
+from typing import Optional
+
+GROWTH = 1.05
+_LOG_GROWTH = math.log(GROWTH)
+
+
+def bucket_for(value_ms: float) -> int:
+    if value_ms <= 1.0:
+        return 0
+    return int(math.log(value_ms) / _LOG_GROWTH) + 1
+
+
+def bucket_upper(bucket: int) -> float:
+    return GROWTH ** bucket
+
+
+# Log-bucketed latency histogram: each bucket spans 5% of its lower bound, so
+# percentiles are within ~5% of the exact value while a histogram stays a few
+# hundred counters however many samples it absorbs, and merges by addition.
+class LatencyHistogram:
+    __slots__ = ("buckets", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        bucket = bucket_for(value_ms)
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        return self
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(bucket_upper(bucket), self.max_ms)
+        return self.max_ms
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 2) if self.count else None,
+            "p50_ms": _round(self.percentile(50)),
+            "p95_ms": _round(self.percentile(95)),
+            "p99_ms": _round(self.percentile(99)),
+            "max_ms": round(self.max_ms, 2),
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "buckets": {str(bucket): count for bucket, count in self.buckets.items()},
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "LatencyHistogram":
+        histogram = cls()
+        histogram.buckets = {int(bucket): count for bucket, count in data.get("buckets", {}).items()}
+        histogram.count = data.get("count", 0)
+        histogram.total_ms = data.get("total_ms", 0.0)
+        histogram.max_ms = data.get("max_ms", 0.0)
+        return histogram
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
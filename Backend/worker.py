@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import signal
+from typing import Optional
+
+from Backend.core.config import settings
+from Backend.core.events import event_bus
+from Backend.core.flow_archive import flow_archive
+from Backend.core.flow_store import flow_store
+from Backend.core.flow_tracker import on_flow_changed
+from Backend.core.logging import setup_logging, get_logger
+from Backend.database.connection import init_db, close_db
+from Backend.orchestration.jobs import PipelineWorker
+
+logger = get_logger(__name__)
+
+
+async def run_worker(concurrency: Optional[int] = None, worker_id: Optional[str] = None) -> None:
+    setup_logging(debug=settings.debug)
+
+    await init_db()
+    await event_bus.start()
+    await flow_store.start(on_flow_changed)
+    await flow_archive.start()
+
+    from Backend.agents.vision import VisionAgent
+    try:
+        await VisionAgent.start_inference()
+        logger.info("Vision model loaded")
+    except Exception as e:
+        logger.warning(f"Vision model failed to load: {e}. Running in mock mode.")
+
+    worker = PipelineWorker(concurrency=concurrency, worker_id=worker_id)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Windows event loops have no signal handlers.
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(worker.stop))
+
+    try:
+        await worker.run()
+    finally:
+        await VisionAgent.stop_inference()
+        await flow_archive.stop()
+        await flow_store.stop()
+        await event_bus.stop()
+        await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run agent pipelines from the pipeline_jobs queue.")
+    parser.add_argument("--concurrency", type=int, default=None, help="pipelines run at once (default: PIPELINE_CONCURRENCY)")
+    parser.add_argument("--worker-id", default=None, help="name recorded on claimed jobs (default: host:pid)")
+    args = parser.parse_args()
+    asyncio.run(run_worker(args.concurrency, args.worker_id))
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ import {
 } from "react-native";
 import { useRoute, useNavigation, RouteProp } from "@react-navigation/native";
 import { LinearGradient } from "expo-linear-gradient";
+import * as Crypto from "expo-crypto";
 import { Ionicons, MaterialCommunityIcons } from "@expo/vector-icons";
 import { Button } from "../../components/ui/Button";
 import { Card } from "../../components/ui/Card";
@@ -96,6 +97,9 @@ export function ProcessingScreen() {
   const [issueId, setIssueId] = useState<string | null>(null);
   const [error, setError] = useState<string | null>(null);
   const [isComplete, setIsComplete] = useState(false);
+  // One key per capture, reused by "Retry Upload", so a retry after a lost
+  // response returns the issue the server already created.
+  const idempotencyKey = useRef(Crypto.randomUUID()).current;
 
   const progressAnim = useRef(new Animated.Value(0)).current;
   const scanLineAnim = useRef(new Animated.Value(0)).current;
@@ -268,6 +272,7 @@ export function ProcessingScreen() {
         location,
         description,
         session?.access_token,
+        idempotencyKey,
       );
 
       setIssueId(result.issue_id);
@@ -15,6 +15,7 @@ class IssueService {
     location: LocationData,
     description?: string,
     accessToken?: string,
+    idempotencyKey?: string,
   ): Promise<{ issue_id: string; stream_url: string }> {
     const formData = new FormData();
 
@@ -46,6 +47,10 @@ class IssueService {
       "Content-Type": "multipart/form-data",
     };
 
+    if (idempotencyKey) {
+      headers["Idempotency-Key"] = idempotencyKey;
+    }
+
     const response = await fetch(`${this.baseUrl}/issues/stream`, {
       method: "POST",
       headers,
@@ -41,6 +41,8 @@ const commands = [
   { command: `cd "${cloudflaredDir}" && docker compose up --force-recreate` },
   // Backend - No CD needed as we are in root
   { command: `call .venv\\Scripts\\activate && python -m Backend.main` },
+  // Pipeline worker
+  { command: `call .venv\\Scripts\\activate && python -m Backend.worker` },
   // Frontend
   { command: `cd "${frontendDir}" && npm run build && npm run start` },
 ];
@@ -48,8 +50,8 @@ const commands = [
 // Provide raw commands strings to concurrently
 const concurrentArgs = commands.map((c) => c.command);
 
-const names = "INFRA,BACKEND,FRONTEND";
-const colors = "yellow,blue,magenta";
+const names = "INFRA,BACKEND,WORKER,FRONTEND";
+const colors = "yellow,blue,cyan,magenta";
 
 // --- 3. Run Concurrently ---
 const npx = process.platform === "win32" ? "npx.cmd" : "npx";